@@ -0,0 +1,76 @@
+# benchmarks/bench_contact_store.py
+"""Benchmark: list-of-dicts contacts vs. the columnar ContactStore.
+
+Measures memory per contact (tracemalloc) and add_column time.
+Run from the project root:
+    python -m benchmarks.bench_contact_store [rows]
+"""
+import sys
+import time
+import tracemalloc
+
+from core.contact_store import ContactStore
+
+DEFAULT_ROWS = 500_000
+COLUMNS = ['phone', 'name', 'company', 'order_id', 'city',
+           'street', 'zip', 'email', 'segment', 'notes']
+
+
+def make_row(i):
+    # Fresh strings per row, as a CSV reader would produce them
+    return [f"+2010{i:08d}", f"Contact {i}", f"Company {i % 500}", f"ORD-{i:06d}",
+            "Cairo" if i % 3 else "", f"Street {i}", f"{i % 99999:05d}",
+            f"user{i}@example.com", "", ""]
+
+
+def measure(build, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build(rows)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return container, current, elapsed
+
+
+def build_dicts(rows):
+    return [dict(zip(COLUMNS, make_row(i))) for i in range(rows)]
+
+
+def build_store(rows):
+    store = ContactStore(COLUMNS)
+    store.extend_rows(make_row(i) for i in range(rows))
+    return store
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    # Memory of the cell values themselves is the same for both layouts,
+    # so report it separately from the container overhead
+    _, values_bytes, _ = measure(lambda n: [make_row(i) for i in range(n)], rows)
+
+    dicts, dict_bytes, dict_time = measure(build_dicts, rows)
+    start = time.perf_counter()
+    for contact in dicts:
+        contact['new_column'] = ""
+    dict_add = time.perf_counter() - start
+    del dicts
+
+    store, store_bytes, store_time = measure(build_store, rows)
+    start = time.perf_counter()
+    store.add_column('new_column')
+    store_add = time.perf_counter() - start
+
+    # Each make_row list costs a list object that neither layout keeps
+    row_list_overhead = sys.getsizeof(make_row(0)) * rows
+    values_only = values_bytes - row_list_overhead
+    print(f"rows={rows} columns={len(COLUMNS)}")
+    print(f"{'layout':14s}{'total MB':>10s}{'B/contact':>11s}{'overhead B/contact':>20s}{'build s':>9s}{'add_column s':>14s}")
+    for label, total, build_time, add_time in (("list of dicts", dict_bytes, dict_time, dict_add),
+                                               ("ContactStore", store_bytes, store_time, store_add)):
+        print(f"{label:14s}{total / 1e6:10.1f}{total / rows:11.0f}{(total - values_only) / rows:20.0f}"
+              f"{build_time:9.2f}{add_time:14.6f}")
+
+
+if __name__ == "__main__":
+    main()
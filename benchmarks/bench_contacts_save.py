@@ -0,0 +1,57 @@
+# benchmarks/bench_contacts_save.py
+"""Benchmark: saving contacts with a full CSV rewrite vs. an autosave delta.
+
+Times an atomic full save of every row, a delta save after editing a few
+rows, and loading the CSV with its delta replayed.
+Run from the project root:
+    python -m benchmarks.bench_contacts_save [rows] [edited]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from core.contact_autosave import ContactAutosave
+from core.contact_manager import ContactManager
+
+DEFAULT_ROWS = 500_000
+DEFAULT_EDITED = 100
+COLUMNS = ['phone', 'name', 'company', 'city']
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:32s} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    edited = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_EDITED
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'contacts.csv')
+        manager = ContactManager()
+        for column in COLUMNS[1:]:
+            manager.add_column(column)
+        manager.store.extend_rows([f"+2010{i:08d}", f"Contact {i}", f"Company {i % 97}", "Cairo, Egypt"]
+                                  for i in range(rows))
+        print(f"{rows} contacts, {edited} edited")
+
+        timed("save_to_csv (full, atomic)", lambda: manager.save_to_csv(path))
+
+        autosave = ContactAutosave(manager, path)
+        timed("autosave first save (full)", lambda: (autosave.save(), autosave.flush()))
+        for i in range(edited):
+            manager.update_contact(i * (rows // edited), 'name', f"Edited {i}")
+        timed("autosave save() call (delta)", autosave.save)
+        timed("autosave delta on disk", autosave.flush)
+        print(f"{'delta file size':32s} {os.path.getsize(autosave.delta_path):8d} bytes")
+
+        reloaded = ContactManager()
+        timed("load + replay delta", ContactAutosave(reloaded, path).load)
+        assert reloaded.store.get(0, 'name') == "Edited 0"
+
+
+if __name__ == "__main__":
+    main()
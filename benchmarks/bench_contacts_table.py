@@ -0,0 +1,97 @@
+# benchmarks/bench_contacts_table.py
+"""Benchmark: time to first paint of the Contacts tab grid.
+
+Compares the old QTableWidget fill (one QTableWidgetItem per cell) with
+the ContactsTableModel view at 10k, 100k and 1M contacts.  Uses Qt's
+offscreen platform, so it runs without a display.  Run from the project root:
+    python -m benchmarks.bench_contacts_table
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+
+from core.contact_manager import ContactManager
+from core.contact_store import ContactStore
+from gui.contacts_tab import ContactsTab
+
+ROW_COUNTS = (10_000, 100_000, 1_000_000)
+# The per-cell widget fill takes minutes beyond this
+LEGACY_MAX_ROWS = 100_000
+COLUMNS = ['phone', 'name', 'company', 'order_id', 'city', 'street', 'zip', 'email', 'segment', 'notes']
+
+
+class FirstPaint(QObject):
+    def __init__(self):
+        super().__init__()
+        self.painted = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.painted = True
+        return False
+
+
+def make_manager(rows):
+    manager = ContactManager()
+    manager.store = ContactStore(COLUMNS)
+    manager.store.extend_rows([f"+2010{i:08d}", f"Contact {i}", f"Company {i % 500}", f"ORD-{i}",
+                               "Cairo", f"Street {i}", "12345", f"user{i}@example.com", "", ""]
+                              for i in range(rows))
+    return manager
+
+
+def wait_for_paint(app, viewport, widget):
+    watcher = FirstPaint()
+    viewport.installEventFilter(watcher)
+    widget.resize(1000, 700)
+    widget.show()
+    while not watcher.painted:
+        app.processEvents()
+    viewport.removeEventFilter(watcher)
+
+
+def legacy_first_paint(app, manager):
+    start = time.perf_counter()
+    table = QTableWidget()
+    columns = manager.get_columns()
+    table.setRowCount(len(manager.store))
+    table.setColumnCount(len(columns))
+    table.setHorizontalHeaderLabels(columns)
+    for row, contact in enumerate(manager.get_contacts()):
+        for col, column_name in enumerate(columns):
+            table.setItem(row, col, QTableWidgetItem(str(contact.get(column_name, ""))))
+    wait_for_paint(app, table.viewport(), table)
+    elapsed = time.perf_counter() - start
+    table.close()
+    table.deleteLater()
+    return elapsed
+
+
+def model_first_paint(app, manager):
+    start = time.perf_counter()
+    tab = ContactsTab(manager)
+    wait_for_paint(app, tab.contacts_table.viewport(), tab)
+    elapsed = time.perf_counter() - start
+    tab.close()
+    tab.deleteLater()
+    return elapsed
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'rows':>10s}{'QTableWidget s':>16s}{'model/view s':>14s}")
+    for rows in ROW_COUNTS:
+        manager = make_manager(rows)
+        legacy = legacy_first_paint(app, manager) if rows <= LEGACY_MAX_ROWS else None
+        model = model_first_paint(app, manager)
+        legacy_text = f"{legacy:16.3f}" if legacy is not None else f"{'skipped':>16s}"
+        print(f"{rows:10d}{legacy_text}{model:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
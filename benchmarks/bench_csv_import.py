@@ -0,0 +1,77 @@
+# benchmarks/bench_csv_import.py
+"""Benchmark: whole-file pandas import vs. the streaming ContactManager loader.
+
+Each loader runs in its own subprocess so peak RSS is measured independently.
+Run from the project root:
+    python -m benchmarks.bench_csv_import [rows]
+"""
+import csv
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_ROWS = 300_000
+COLUMNS = ['phone', 'name', 'company', 'order_id', 'city', 'notes']
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            writer.writerow([f"+2010{i:08d}", f"Contact {i}", f"Company {i % 500}",
+                             f"ORD-{i:06d}", "Cairo" if i % 3 else "", f"note {i}"])
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_legacy(path):
+    import pandas as pd
+    df = pd.read_csv(path)
+    contacts = df.to_dict('records')
+    return len(contacts)
+
+
+def run_streaming(path):
+    from core.contact_manager import ContactManager
+    manager = ContactManager()
+    manager.load_from_csv(path)
+    return len(manager.get_contacts())
+
+
+def child(mode, path):
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    count = run_legacy(path) if mode == 'legacy' else run_streaming(path)
+    elapsed = time.perf_counter() - start
+    print(f"{mode:10s} rows={count} time={elapsed:7.3f}s peak_rss={peak_rss_mb():8.1f}MB "
+          f"(+{peak_rss_mb() - baseline:.1f}MB over interpreter startup)")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'contacts.csv')
+        write_csv(path, rows)
+        print(f"file={os.path.getsize(path) / 1e6:.1f}MB rows={rows}")
+        for mode in ('legacy', 'streaming'):
+            result = subprocess.run([sys.executable, '-m', 'benchmarks.bench_csv_import', '--child', mode, path],
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{mode:10s} skipped: {result.stderr.strip().splitlines()[-1]}")
+            else:
+                print(result.stdout.strip())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_navigation.py
+"""Benchmark: full page load per contact vs. in-app chat switching.
+
+Runs WhatsAppSender in both navigation modes against the local fake
+WhatsApp Web page in headless Chrome (needs selenium and Chrome).
+Run from the project root:
+    python -m benchmarks.bench_navigation [messages]
+"""
+import sys
+import time
+
+from benchmarks.fake_whatsapp import FakeWhatsAppServer, headless_driver
+from core.adaptive_timing import AdaptiveTiming
+from core.personalized_sender import WhatsAppSender, NAVIGATION_FULL, NAVIGATION_IN_APP
+
+DEFAULT_MESSAGES = 50
+
+
+def process_cpu_seconds(driver):
+    """CPU time used by Chrome's processes so far, when psutil is available"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    root = psutil.Process(driver.service.process.pid)
+    total = 0.0
+    for proc in [root] + root.children(recursive=True):
+        try:
+            times = proc.cpu_times()
+            total += times.user + times.system
+        except psutil.Error:
+            pass
+    return total
+
+
+def run(fake, navigation, count):
+    driver = headless_driver()
+    try:
+        driver.get(fake.url + "/")
+        sender = WhatsAppSender(base_url=fake.url, timing=AdaptiveTiming(min_send_interval=0),
+                                navigation=navigation)
+        sender.driver = driver
+        sender.is_initialized = True
+        loads_before = fake.requests
+        cpu_before = process_cpu_seconds(driver)
+        start = time.perf_counter()
+        ok = sum(1 for i in range(count) if sender.send_single_message(f"+2010{i:08d}", f"Hello {i}\nLine two"))
+        elapsed = time.perf_counter() - start
+        cpu_after = process_cpu_seconds(driver)
+        cpu = f"{cpu_after - cpu_before:6.1f}s" if cpu_before is not None else "   n/a"
+        print(f"{navigation:7s} sent={ok}/{count} per_message={elapsed / count * 1000:7.1f}ms "
+              f"page_loads={fake.requests - loads_before} browser_cpu={cpu}")
+    finally:
+        driver.quit()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESSAGES
+    with FakeWhatsAppServer() as fake:
+        for navigation in (NAVIGATION_FULL, NAVIGATION_IN_APP):
+            run(fake, navigation, count)
+
+
+if __name__ == "__main__":
+    main()
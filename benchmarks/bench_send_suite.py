@@ -0,0 +1,174 @@
+# benchmarks/bench_send_suite.py
+"""End-to-end send benchmark: WhatsAppSender.send_bulk_messages against the fake WhatsApp Web.
+
+For each campaign size it logs a headless Chrome into the fake app and
+sends one message per contact, then reports latency percentiles of each
+send stage (send.total is the whole message; estimated from the stage
+histograms), throughput, results by failure class, delivery receipts
+(sent / delivered / read ticks), page loads and the browser's resident
+memory (start, peak, end; needs psutil).  Needs selenium and Chrome.
+
+Run from the project root:
+    python -m benchmarks.bench_send_suite [--sizes 100,1000,10000] [--popup-rate 0.02] [--pipeline-depth 1] ...
+"""
+import argparse
+import collections
+import threading
+import time
+
+from benchmarks.fake_whatsapp import FakeWhatsAppServer, headless_driver
+from core.adaptive_timing import AdaptiveTiming
+from core.personalized_sender import WhatsAppSender, NAVIGATION_IN_APP, NAVIGATION_FULL, PIPELINE_DEPTH
+from core.retry_queue import RetryPolicy, RetryQueue, FAILURE_TIMEOUT, FAILURE_POPUP, FAILURE_UNKNOWN
+from core.send_metrics import SendMetrics, summarize
+
+DEFAULT_SIZES = (100, 1000, 10000)
+MEMORY_SAMPLE_INTERVAL = 1.0
+
+
+def browser_rss(driver):
+    """Resident memory of chromedriver and every Chrome process under it, in bytes"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    root = psutil.Process(driver.service.process.pid)
+    total = 0
+    for proc in [root] + root.children(recursive=True):
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+class MemorySampler:
+    """Samples browser memory on a background thread"""
+
+    def __init__(self, driver, interval=MEMORY_SAMPLE_INTERVAL):
+        self.driver = driver
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            rss = browser_rss(self.driver)
+            if rss is not None:
+                self.samples.append(rss)
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def megabytes(value):
+    return f"{value / 1024 / 1024:7.0f}MB" if value is not None else "    n/a"
+
+
+def run_campaign(fake, size, navigation, pipeline_depth, retry_delay, receipt_wait):
+    driver = headless_driver()
+    try:
+        # Stage histograms of this campaign only, not written to disk
+        metrics = SendMetrics(jsonl_path=None, prometheus_path=None, enabled=True)
+        sender = WhatsAppSender(base_url=fake.url, timing=AdaptiveTiming(min_send_interval=0, jitter=0),
+                                navigation=navigation, metrics=metrics, pipeline_depth=pipeline_depth)
+        sender.driver = driver
+        driver.get(fake.url + "/")
+        # Wait out the fake login screen, if there is one
+        deadline = time.monotonic() + (fake.login_delay or 0) + 10
+        while not sender.check_whatsapp_ready() and time.monotonic() < deadline:
+            time.sleep(0.2)
+        sender.is_initialized = sender.check_whatsapp_ready()
+        if not sender.is_initialized:
+            print(f"{size:6d} contacts: fake WhatsApp never logged in")
+            return
+
+        contacts = [(f"+2010{i:08d}", f"Hello contact {i}\nThis is message {i}.", f"Contact {i}")
+                    for i in range(size)]
+        results = collections.Counter()
+        receipts = {}  # Phone -> latest tick state
+        sender.set_receipt_callback(lambda phone, state: receipts.__setitem__(phone, state))
+        # Unpaced sends push chats out of the 50 listed much faster than real campaigns do
+        sender.receipts.sweep_interval = 1.0
+
+        def on_result(phone, success, reason):
+            results['sent' if success else (sender.last_failure or 'failed')] += 1
+
+        # Short retry delays so failures don't turn the benchmark into a wait
+        retry_queue = RetryQueue({kind: RetryPolicy(1, base_delay=retry_delay)
+                                  for kind in (FAILURE_TIMEOUT, FAILURE_POPUP, FAILURE_UNKNOWN)})
+        loads_before = fake.requests
+        with MemorySampler(driver) as memory:
+            start = time.perf_counter()
+            success, total = sender.send_bulk_messages(contacts, result_callback=on_result,
+                                                       retry_queue=retry_queue)
+            elapsed = time.perf_counter() - start
+        # Let the last messages' ticks arrive, then read them once more
+        time.sleep(receipt_wait)
+        sender.sweep_receipts(force=True)
+
+        rss = memory.samples
+        stages = summarize(metrics.snapshot())
+        attempts = stages.get('send.total', {}).get('count', 0)
+        print(f"{size:6d} contacts: sent={success}/{total} {total / elapsed * 60:8.1f} msgs/min "
+              f"attempts={attempts} page_loads={fake.requests - loads_before}")
+        for stage, summary in sorted(stages.items()):
+            print(f"{'':16s}{stage:20s} n={summary['count']:6d} mean={summary['mean'] * 1000:8.1f}ms "
+                  f"p50={summary['p50'] * 1000:8.1f}ms p90={summary['p90'] * 1000:8.1f}ms "
+                  f"p99={summary['p99'] * 1000:8.1f}ms")
+        print(f"{'':16s}browser memory start={megabytes(rss[0] if rss else None)} "
+              f"peak={megabytes(max(rss) if rss else None)} end={megabytes(rss[-1] if rss else None)}")
+        print(f"{'':16s}results: " + ", ".join(f"{kind}={count}" for kind, count in sorted(results.items())))
+        ticks = collections.Counter(receipts.values())
+        print(f"{'':16s}receipts: " + (", ".join(f"{state}={count}" for state, count in sorted(ticks.items()))
+                                       or "none"))
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated campaign sizes (default: 100,1000,10000)")
+    parser.add_argument('--navigation', choices=(NAVIGATION_IN_APP, NAVIGATION_FULL), default=NAVIGATION_FULL)
+    parser.add_argument('--pipeline-depth', type=int, default=PIPELINE_DEPTH,
+                        help=f"messages awaiting confirmation at once, 1 = none (default: {PIPELINE_DEPTH})")
+    parser.add_argument('--server-latency', type=float, default=0.05)
+    parser.add_argument('--render-latency', type=float, default=0.3)
+    parser.add_argument('--switch-latency', type=float, default=0.05)
+    parser.add_argument('--confirm-latency', type=float, default=0.2)
+    parser.add_argument('--delivery-latency', type=float, default=0.5)
+    parser.add_argument('--read-latency', type=float, help="messages are never read if not given")
+    parser.add_argument('--popup-rate', type=float, default=0.0)
+    parser.add_argument('--invalid-rate', type=float, default=0.0)
+    parser.add_argument('--drop-rate', type=float, default=0.0)
+    parser.add_argument('--logged-out', action='store_true', help="start at the QR login screen")
+    parser.add_argument('--login-delay', type=float, default=2.0)
+    parser.add_argument('--retry-delay', type=float, default=0.5, help="base delay of deferred retries")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeWhatsAppServer(server_latency=args.server_latency, render_latency=args.render_latency,
+                              confirm_latency=args.confirm_latency, switch_latency=args.switch_latency,
+                              popup_rate=args.popup_rate, invalid_rate=args.invalid_rate,
+                              drop_rate=args.drop_rate, logged_in=not args.logged_out,
+                              login_delay=args.login_delay, seed=args.seed,
+                              delivery_latency=args.delivery_latency, read_latency=args.read_latency)
+    with fake:
+        print(f"navigation={args.navigation} pipeline_depth={args.pipeline_depth} popups={args.popup_rate:.0%} invalid={args.invalid_rate:.0%} "
+              f"dropped={args.drop_rate:.0%}")
+        for size in (int(value) for value in args.sizes.split(',') if value.strip()):
+            receipt_wait = args.confirm_latency + args.delivery_latency + (args.read_latency or 0) + 0.5
+            run_campaign(fake, size, args.navigation, args.pipeline_depth, args.retry_delay, receipt_wait)
+
+
+if __name__ == "__main__":
+    main()
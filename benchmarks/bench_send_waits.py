@@ -0,0 +1,63 @@
+# benchmarks/bench_send_waits.py
+"""Benchmark: fixed sleeps vs. condition-based waits in send_single_message.
+
+Runs both send paths against the local fake WhatsApp Web page in headless
+Chrome (needs selenium and Chrome installed).  Run from the project root:
+    python -m benchmarks.bench_send_waits [messages]
+"""
+import sys
+import time
+import urllib.parse
+
+from benchmarks.fake_whatsapp import FakeWhatsAppServer, headless_driver
+from core.adaptive_timing import AdaptiveTiming
+from core.personalized_sender import WhatsAppSender, MESSAGE_BOX_XPATH, OUTGOING_MESSAGE_XPATH
+
+DEFAULT_MESSAGES = 20
+
+
+def legacy_send(driver, base_url, phone, message):
+    """The pre-change send path with its fixed sleeps"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver.get(f"{base_url}/send?phone={phone}&text={urllib.parse.quote(message)}")
+    time.sleep(3)
+    msg_box = WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.XPATH, MESSAGE_BOX_XPATH)))
+    driver.execute_script("arguments[0].focus();", msg_box)
+    time.sleep(0.5)
+    msg_box.send_keys(Keys.ENTER)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, OUTGOING_MESSAGE_XPATH)))
+    time.sleep(2)
+    return True
+
+
+def run(label, send, count):
+    start = time.perf_counter()
+    ok = sum(1 for i in range(count) if send(f"+2010{i:08d}", f"Hello contact {i}"))
+    elapsed = time.perf_counter() - start
+    print(f"{label:22s} sent={ok}/{count} total={elapsed:7.2f}s per_message={elapsed / count:6.2f}s")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESSAGES
+    with FakeWhatsAppServer() as fake:
+        driver = headless_driver()
+        try:
+            driver.get(fake.url + "/")
+            legacy = run("fixed sleeps", lambda p, m: legacy_send(driver, fake.url, p.lstrip('+'), m), count)
+
+            sender = WhatsAppSender(base_url=fake.url, timing=AdaptiveTiming(min_send_interval=0))
+            sender.driver = driver
+            sender.is_initialized = True
+            adaptive = run("condition-based waits", sender.send_single_message, count)
+            print(f"speedup: {legacy / adaptive:.1f}x  learned stage means: {sender.timing.stats()}")
+        finally:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_startup.py
+"""Startup budget: import time of the entry modules and time to first window.
+
+Each measurement runs in a fresh interpreter so module caches don't hide
+the cost.  Also lists which heavy packages an import drags in; none of
+them should load before the window is shown.
+
+Run from the project root:
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import subprocess
+import sys
+
+RUNS = 5
+HEAVY_PACKAGES = ('pandas', 'selenium', 'webdriver_manager', 'requests')
+IMPORT_TARGETS = ('core.contact_manager', 'core.message_sender', 'cli', 'gui.main_window')
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted(set(name.split('.')[0] for name in sys.modules) & set({heavy!r}))
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+WINDOW_PROBE = """
+import json, time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+from gui.main_window import WhatsAppBroadcastApp
+app = QApplication([])
+window = WhatsAppBroadcastApp()
+window.show()
+app.processEvents()
+print(json.dumps({'seconds': time.perf_counter() - start}))
+"""
+
+
+def run_probe(code, env=None):
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        last_line = (result.stderr.strip().splitlines() or ["failed"])[-1]
+        return None, last_line
+    return json.loads(result.stdout.strip().splitlines()[-1]), None
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    print(f"python {sys.version.split()[0]}, median of {RUNS} fresh interpreters")
+    for module in IMPORT_TARGETS:
+        times = []
+        heavy = []
+        error = None
+        for _ in range(RUNS):
+            sample, error = run_probe(IMPORT_PROBE.format(module=module, heavy=HEAVY_PACKAGES))
+            if sample is None:
+                break
+            times.append(sample['seconds'])
+            heavy = sample['heavy']
+        if error:
+            print(f"import {module:22s}: skipped ({error})")
+        else:
+            print(f"import {module:22s}: {median(times) * 1000:8.1f} ms  heavy: {', '.join(heavy) or 'none'}")
+
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    times = []
+    error = None
+    for _ in range(RUNS):
+        sample, error = run_probe(WINDOW_PROBE, env)
+        if sample is None:
+            break
+        times.append(sample['seconds'])
+    if error:
+        print(f"time to window              : skipped ({error})")
+    else:
+        print(f"time to window              : {median(times) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
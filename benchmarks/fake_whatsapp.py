@@ -0,0 +1,287 @@
+# benchmarks/fake_whatsapp.py
+"""A local stand-in for WhatsApp Web used by the send benchmarks.
+
+It serves pages with the elements WhatsAppSender waits for: the
+#pane-side chat list, the footer contenteditable composer (pre-filled from
+the ?text= parameter) and a div.message-out bubble appended when Enter is
+pressed (only if that chat is still open by then).  Clicking a "send?phone=" link opens that chat without a reload,
+like WhatsApp Web's in-app routing.  The chat list shows the most recent
+chats with the ticks of their last message (clock, sent, delivered, read).
+Point a WhatsAppSender at it with base_url=server.url.
+
+Trouble can be switched on per server: a login (QR code) screen, popups in
+front of the chat, numbers rejected as invalid, and messages that never get
+their bubble.  Which phones are hit is derived from the phone number and a
+seed, so a run is reproducible.
+"""
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Fake WhatsApp</title></head>
+<body>
+<div id="app"></div>
+<script>
+const CONFIG = %(config)s;
+const LOGIN_KEY = 'fake-whatsapp-login';
+const CHATS_KEY = 'fake-whatsapp-chats';
+const MAX_LISTED_CHATS = 50;
+// Deterministic "random" number in [0, 1) for a phone and a kind of trouble
+function roll(phone, salt) {
+  let hash = 2166136261 ^ CONFIG.seed;
+  const key = salt + ':' + phone;
+  for (let i = 0; i < key.length; i++) {
+    hash ^= key.charCodeAt(i);
+    hash = Math.imul(hash, 16777619);
+  }
+  // Final mix so neighbouring phone numbers don't land close together
+  hash ^= hash >>> 16;
+  hash = Math.imul(hash, 0x85ebca6b);
+  hash ^= hash >>> 13;
+  hash = Math.imul(hash, 0xc2b2ae35);
+  hash ^= hash >>> 16;
+  return (hash >>> 0) / 4294967296;
+}
+function showDialog(text, buttonText, onClose) {
+  const dialog = document.createElement('div');
+  dialog.setAttribute('role', 'dialog');
+  dialog.innerHTML = '<div></div><button></button>';
+  dialog.querySelector('div').textContent = text;
+  const button = dialog.querySelector('button');
+  button.textContent = buttonText;
+  button.addEventListener('click', function () {
+    dialog.remove();
+    if (onClose) onClose();
+  });
+  document.getElementById('app').appendChild(dialog);
+}
+function openChat(phone, text) {
+  const previous = document.getElementById('main');
+  if (previous) previous.remove();
+  document.querySelectorAll('[role="dialog"]').forEach(function (dialog) { dialog.remove(); });
+  if (roll(phone, 'invalid') < CONFIG.invalid_rate) {
+    showDialog('Phone number shared via url is invalid.', 'OK', null);
+    return;
+  }
+  if (roll(phone, 'popup') < CONFIG.popup_rate) {
+    showDialog('WhatsApp Web has been updated.', 'Continue', function () { buildChat(phone, text); });
+    return;
+  }
+  buildChat(phone, text);
+}
+function buildChat(phone, text) {
+  const app = document.getElementById('app');
+  const main = document.createElement('div');
+  main.id = 'main';
+  main.innerHTML = '<div class="messages"></div><footer><div contenteditable="true" data-tab="10"></div></footer>';
+  app.appendChild(main);
+  const box = main.querySelector('footer div');
+  box.textContent = text;
+  box.addEventListener('keydown', function (event) {
+    if (event.key !== 'Enter' || event.shiftKey) return;
+    event.preventDefault();
+    const sent = box.innerText;
+    box.textContent = '';
+    const dropped = roll(phone, 'drop') < CONFIG.drop_rate;
+    recordSent(phone, sent, dropped);
+    if (dropped) return;  // Never confirmed
+    setTimeout(function () {
+      // Like WhatsApp Web, a chat that was closed meanwhile shows nothing
+      if (!main.isConnected) return;
+      const bubble = document.createElement('div');
+      bubble.className = 'message-out';
+      bubble.textContent = sent;
+      main.querySelector('.messages').appendChild(bubble);
+    }, CONFIG.confirm_ms);
+  });
+}
+// Recent chats, newest first; kept in sessionStorage so they survive page loads
+function loadChats() {
+  try { return JSON.parse(sessionStorage.getItem(CHATS_KEY)) || []; } catch (e) { return []; }
+}
+function recordSent(phone, text, dropped) {
+  const chats = loadChats().filter(function (chat) { return chat.phone !== phone; });
+  chats.unshift({phone: phone, text: text, at: Date.now(), dropped: dropped});
+  sessionStorage.setItem(CHATS_KEY, JSON.stringify(chats.slice(0, MAX_LISTED_CHATS)));
+  renderChats();
+}
+function tickFor(chat) {
+  const elapsed = Date.now() - chat.at;
+  if (chat.dropped || elapsed < CONFIG.confirm_ms) return ['status-time', ' Pending '];
+  if (elapsed < CONFIG.confirm_ms + CONFIG.deliver_ms) return ['status-check', ' Sent '];
+  if (CONFIG.read_ms < 0 || elapsed < CONFIG.confirm_ms + CONFIG.deliver_ms + CONFIG.read_ms) {
+    return ['status-dblcheck', ' Delivered '];
+  }
+  return ['status-dblcheck', ' Read '];
+}
+function renderChats() {
+  const list = document.getElementById('chat-list');
+  if (!list) return;
+  list.textContent = '';
+  loadChats().forEach(function (chat) {
+    const row = document.createElement('div');
+    row.setAttribute('role', 'listitem');
+    row.innerHTML = '<span class="title"></span><span class="tick"></span><span class="preview"></span>';
+    row.querySelector('.title').setAttribute('title', '+' + chat.phone);
+    const tick = tickFor(chat);
+    row.querySelector('.tick').setAttribute('data-icon', tick[0]);
+    row.querySelector('.tick').setAttribute('aria-label', tick[1]);
+    row.querySelector('.preview').setAttribute('title', chat.text);
+    list.appendChild(row);
+  });
+}
+setInterval(renderChats, 250);
+function showLogin() {
+  const app = document.getElementById('app');
+  app.innerHTML = '<div class="landing-wrapper"><canvas aria-label="Scan me!"></canvas></div>';
+  if (CONFIG.login_ms >= 0) {
+    // Simulates the QR code being scanned; the login survives reloads like a real profile
+    setTimeout(function () { localStorage.setItem(LOGIN_KEY, '1'); render(); }, CONFIG.login_ms);
+  }
+}
+function render() {
+  if (!CONFIG.logged_in && !localStorage.getItem(LOGIN_KEY)) {
+    showLogin();
+    return;
+  }
+  const app = document.getElementById('app');
+  app.innerHTML = '<div id="pane-side"><div>Chats</div><div id="chat-list"></div></div>';
+  renderChats();
+  if (CONFIG.phone !== null) openChat(CONFIG.phone, CONFIG.text);
+}
+// In-app routing: chat links open the chat without reloading the page
+document.addEventListener('click', function (event) {
+  const link = event.target.closest('a');
+  if (!link || link.href.indexOf('send?phone=') === -1) return;
+  event.preventDefault();
+  const phone = new URL(link.href).searchParams.get('phone');
+  setTimeout(function () { openChat(phone, ''); }, CONFIG.switch_ms);
+});
+setTimeout(render, CONFIG.render_ms);
+</script>
+</body></html>
+"""
+
+
+class FakeWhatsAppServer:
+    """Serve the fake WhatsApp Web pages on a background thread
+
+    server_latency delays every HTTP response, render_latency delays the
+    app rendering its panes and composer, switch_latency delays opening a
+    chat from an in-app link, confirm_latency delays the outgoing bubble
+    after Enter.  delivery_latency and read_latency are how long after
+    that the chat list shows the message as delivered, then read (None:
+    never read).  All are in seconds.  requests counts full page loads.
+
+    popup_rate, invalid_rate and drop_rate are the fractions of phones
+    that get a popup in front of the chat, an "invalid number" dialog, or
+    no confirmation bubble.  With logged_in=False the app shows the QR
+    login screen first; it logs itself in after login_delay seconds, or
+    never if login_delay is None.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, server_latency=0.05,
+                 render_latency=0.3, confirm_latency=0.2, switch_latency=0.05,
+                 popup_rate=0.0, invalid_rate=0.0, drop_rate=0.0,
+                 logged_in=True, login_delay=2.0, seed=0, delivery_latency=0.5, read_latency=None):
+        self.server_latency = server_latency
+        self.switch_latency = switch_latency
+        self.render_latency = render_latency
+        self.confirm_latency = confirm_latency
+        self.delivery_latency = delivery_latency
+        self.read_latency = read_latency
+        self.popup_rate = popup_rate
+        self.invalid_rate = invalid_rate
+        self.drop_rate = drop_rate
+        self.logged_in = logged_in
+        self.login_delay = login_delay
+        self.seed = seed
+        self.requests = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page_config(self, phone, text):
+        return {
+            'phone': phone,
+            'text': text,
+            'render_ms': int(self.render_latency * 1000),
+            'confirm_ms': int(self.confirm_latency * 1000),
+            'deliver_ms': int(self.delivery_latency * 1000),
+            'read_ms': -1 if self.read_latency is None else int(self.read_latency * 1000),
+            'switch_ms': int(self.switch_latency * 1000),
+            'popup_rate': self.popup_rate,
+            'invalid_rate': self.invalid_rate,
+            'drop_rate': self.drop_rate,
+            'logged_in': self.logged_in,
+            'login_ms': -1 if self.login_delay is None else int(self.login_delay * 1000),
+            'seed': self.seed,
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                parsed = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(parsed.query)
+                phone = query.get('phone', [None])[0] if parsed.path.startswith('/send') else None
+                text = query.get('text', [''])[0]
+                if server.server_latency:
+                    time.sleep(server.server_latency)
+                config = json.dumps(server.page_config(phone, text))
+                body = (PAGE % {'config': config.replace('</', '<\\/')}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def headless_driver():
+    """A headless Chrome driver for benchmarks (needs selenium and Chrome)"""
+    from selenium import webdriver
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return webdriver.Chrome(options=options)
+
+
+if __name__ == "__main__":
+    with FakeWhatsAppServer() as fake:
+        print(f"Fake WhatsApp Web running at {fake.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,225 @@
+# cli.py
+"""Headless broadcast runner: send a campaign without the GUI.
+
+    python cli.py contacts.csv message.txt [options]
+
+Progress is written to stdout as one JSON object per line ("event" says
+which kind); everything else the senders print goes to stderr.  PyQt6 is
+never imported.
+"""
+import argparse
+import contextlib
+import json
+import sys
+import threading
+import time
+
+from core.contact_manager import ContactManager, DEDUP_POLICIES
+from core.driver_resolver import default_resolver
+from core.message_sender import MessageSender
+from core.rate_scheduler import RateScheduler
+from core.send_journal import DEFAULT_JOURNAL_PATH
+from core.send_progress import SendProgress
+from core.template_engine import compile_template
+
+# Exit codes
+EXIT_OK = 0                 # Every recipient got the message
+EXIT_SEND_FAILURES = 1      # Some recipients failed or had invalid numbers
+EXIT_USAGE = 2              # Bad command line (argparse uses this too)
+EXIT_INPUT_ERROR = 3        # Contacts or template file unusable
+EXIT_CONNECT_FAILED = 4     # WhatsApp Web could not be opened or isn't logged in
+EXIT_INTERRUPTED = 130      # Stopped with Ctrl+C
+
+
+class JsonLines:
+    """Writes one JSON event per line, safe to call from several threads"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        line = json.dumps({'event': event, 'time': round(time.time(), 3), **fields}, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def parse_quiet_hours(value):
+    """'22-8' -> (22, 8)"""
+    try:
+        start, end = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected START-END hours, e.g. 22-8")
+    if not (0 <= start < 24 and 0 <= end < 24):
+        raise argparse.ArgumentTypeError("hours must be between 0 and 23")
+    return start, end
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Send a WhatsApp broadcast without the GUI.")
+    parser.add_argument('contacts', help="contacts CSV file (needs a 'phone' column)")
+    parser.add_argument('template', help="message template file; (column) placeholders are filled per contact")
+    parser.add_argument('--country-code', help="default country code for numbers without one, e.g. 20")
+    parser.add_argument('--dedup', choices=DEDUP_POLICIES, default='merge',
+                        help="how to collapse rows with the same phone number (default: merge)")
+    parser.add_argument('--sessions', type=int, default=1, help="parallel WhatsApp Web sessions (default: 1)")
+    parser.add_argument('--rate', type=float, default=12, help="messages per minute (default: 12)")
+    parser.add_argument('--burst', type=int, default=3, help="messages allowed back to back (default: 3)")
+    parser.add_argument('--hourly-cap', type=int, help="maximum messages in any hour")
+    parser.add_argument('--daily-cap', type=int, help="maximum messages in any 24 hours")
+    parser.add_argument('--quiet-hours', type=parse_quiet_hours, metavar='START-END',
+                        help="local hours with no sending, e.g. 22-8")
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH,
+                        help=f"send journal used to resume campaigns (default: {DEFAULT_JOURNAL_PATH})")
+    parser.add_argument('--no-journal', action='store_true', help="don't record or resume campaigns")
+    parser.add_argument('--campaign', help="campaign id (default: resume the last run of this template)")
+    parser.add_argument('--restart', action='store_true',
+                        help="start a new campaign, sending again to contacts that already got the message")
+    parser.add_argument('--chromedriver', metavar='PATH', help="chromedriver to use instead of resolving one")
+    parser.add_argument('--offline', action='store_true',
+                        help="never download chromedriver; use the cache, --chromedriver or PATH")
+    parser.add_argument('--progress-interval', type=float, default=1.0,
+                        help="seconds between progress events (default: 1)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="load, validate and render only; don't open WhatsApp")
+    return parser
+
+
+def load_inputs(args, out):
+    """Load contacts and template, returning (contact_manager, template) or an exit code"""
+    contact_manager = ContactManager()
+    if args.country_code:
+        contact_manager.phone_normalizer.set_default_country_code(args.country_code)
+    try:
+        with open(args.template, 'r', encoding='utf-8') as f:
+            template = f.read()
+        report = contact_manager.load_from_csv(args.contacts, dedup=args.dedup)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        out.emit('error', message=str(e))
+        return None, EXIT_INPUT_ERROR
+    if not template.strip():
+        out.emit('error', message="the message template is empty")
+        return None, EXIT_INPUT_ERROR
+    if not contact_manager.store.has_column('phone'):
+        out.emit('error', message="the contacts file has no 'phone' column")
+        return None, EXIT_INPUT_ERROR
+
+    compiled = compile_template(template, contact_manager.get_columns())
+    out.emit('loaded', contacts=len(contact_manager.store), duplicates=len(report),
+             invalid_phones=len(contact_manager.invalid_phones),
+             placeholders=compiled.used_columns, unknown_placeholders=compiled.unknown_placeholders)
+    return (contact_manager, template), None
+
+
+def dry_run(contact_manager, template, out):
+    compiled = compile_template(template, contact_manager.get_columns())
+    longest = 0
+    for contact in contact_manager.get_contacts():
+        longest = max(longest, len(compiled.render(contact)))
+    for index, raw, reason in contact_manager.invalid_phones:
+        out.emit('result', phone=raw, success=False, reason=reason, row=index)
+    invalid = len(contact_manager.invalid_phones)
+    out.emit('done', dry_run=True, recipients=len(contact_manager.store) - invalid,
+             invalid_phones=invalid, max_message_length=longest)
+    return EXIT_SEND_FAILURES if invalid else EXIT_OK
+
+
+def emit_progress(progress, out):
+    snapshot = progress.snapshot()
+    for phone, success, reason in snapshot.pop('results'):
+        out.emit('result', phone=phone, success=success, reason=None if success else reason)
+    if snapshot['eta_seconds'] is not None:
+        snapshot['eta_seconds'] = round(snapshot['eta_seconds'], 1)
+    snapshot['elapsed_seconds'] = round(snapshot['elapsed_seconds'], 1)
+    out.emit('progress', **snapshot)
+
+
+def send(args, contact_manager, template, out):
+    scheduler = RateScheduler(rate_per_minute=args.rate, burst=args.burst, hourly_cap=args.hourly_cap,
+                              daily_cap=args.daily_cap, quiet_hours=args.quiet_hours)
+    resolver = default_resolver()
+    if args.chromedriver:
+        resolver.driver_path = args.chromedriver
+    if args.offline:
+        resolver.offline = True
+    message_sender = MessageSender(phone_normalizer=contact_manager.phone_normalizer,
+                                   session_count=args.sessions,
+                                   journal_path=None if args.no_journal else args.journal,
+                                   scheduler=scheduler)
+    message_sender.set_message_template(template)
+    message_sender.receipt_callback = lambda phone, state: out.emit('receipt', phone=phone, state=state)
+    campaign_id = args.campaign
+    if args.restart:
+        campaign_id = message_sender.new_campaign_id()
+    elif campaign_id is None:
+        campaign_id = message_sender.campaign_id_for()
+
+    contacts = [dict(contact) for contact in contact_manager.get_contacts()]
+    out.emit('start', campaign=campaign_id, contacts=len(contacts), sessions=args.sessions)
+    if not message_sender.initialize_whatsapp():
+        out.emit('error', message="could not open WhatsApp Web (is this profile logged in?)")
+        return EXIT_CONNECT_FAILED
+
+    progress = SendProgress()
+    outcome = {}
+
+    def run():
+        try:
+            outcome['counts'] = message_sender.send_bulk_messages(
+                contacts,
+                progress_callback=progress.on_progress,
+                status_callback=progress.on_status,
+                campaign_id=campaign_id,
+                result_callback=progress.on_result
+            )
+        except Exception as e:
+            outcome['error'] = str(e)
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(args.progress_interval)
+            emit_progress(progress, out)
+    except KeyboardInterrupt:
+        if message_sender.journal:
+            message_sender.journal.flush()
+        # The send thread dies with the process; Chrome and chromedriver would not
+        message_sender.close_whatsapp()
+        out.emit('interrupted', campaign=campaign_id)
+        return EXIT_INTERRUPTED
+    finally:
+        if not worker.is_alive():
+            message_sender.close_whatsapp()
+
+    if 'error' in outcome:
+        out.emit('error', message=outcome['error'])
+        return EXIT_SEND_FAILURES
+    success_count, total_count = outcome['counts']
+    out.emit('timings', campaign=campaign_id, stages=message_sender.last_timings)
+    out.emit('done', campaign=campaign_id, succeeded=success_count, total=total_count,
+             failed=total_count - success_count)
+    return EXIT_OK if success_count == total_count else EXIT_SEND_FAILURES
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.sessions < 1 or args.rate <= 0 or args.burst < 1 or args.progress_interval <= 0:
+        parser.error("--sessions, --rate, --burst and --progress-interval must be positive")
+
+    out = JsonLines(sys.stdout)
+    # Keep stdout machine-readable: the senders' own prints go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        inputs, exit_code = load_inputs(args, out)
+        if inputs is None:
+            return exit_code
+        contact_manager, template = inputs
+        if args.dry_run:
+            return dry_run(contact_manager, template, out)
+        return send(args, contact_manager, template, out)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# core/adaptive_timing.py
+import random
+import threading
+import time
+
+# Share of a stage's ceiling its learned timeout never drops below.  Giving up
+# on a confirmation too soon fails (and retries) a message that went out late.
+STAGE_FLOOR_FRACTIONS = {'confirm': 0.75}
+
+
+class _StageStats:
+    """Exponentially weighted mean and deviation of one stage's latency"""
+
+    __slots__ = ('mean', 'deviation', 'samples')
+
+    def __init__(self):
+        self.mean = None
+        self.deviation = 0.0
+        self.samples = 0
+
+    def observe(self, seconds, alpha):
+        if self.mean is None:
+            self.mean = seconds
+            self.deviation = seconds / 2
+        else:
+            error = seconds - self.mean
+            self.mean += alpha * error
+            self.deviation += alpha * (abs(error) - self.deviation)
+        self.samples += 1
+
+
+class AdaptiveTiming:
+    """Learns how long WhatsApp Web takes and sizes waits and pacing from it
+
+    Waits are condition-based; this only decides how long a wait may last
+    before it is treated as a failure (timeout) and how often the condition
+    is polled.  Until a stage has been observed the configured ceiling is
+    used, which matches the old fixed timeouts; learned timeouts stay above
+    timeout_floor and, per stage, a share of the ceiling (see
+    STAGE_FLOOR_FRACTIONS).  pace() enforces a minimum
+    interval between sends as anti-abuse pacing, and is the only place that
+    deliberately sleeps.
+    """
+
+    def __init__(self, min_send_interval=1.5, jitter=0.5, alpha=0.2,
+                 timeout_floor=5.0, deviation_factor=4.0):
+        self.min_send_interval = min_send_interval
+        self.jitter = jitter
+        self.alpha = alpha
+        self.timeout_floor = timeout_floor
+        self.deviation_factor = deviation_factor
+        self._stats = {}
+        self._last_send = None
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Record how long a stage took"""
+        with self._lock:
+            self._stats.setdefault(stage, _StageStats()).observe(seconds, self.alpha)
+
+    def mean(self, stage):
+        stats = self._stats.get(stage)
+        return stats.mean if stats else None
+
+    def timeout(self, stage, ceiling):
+        """How long to wait for a stage before giving up"""
+        stats = self._stats.get(stage)
+        if stats is None or stats.samples < 3:
+            return ceiling
+        learned = stats.mean + self.deviation_factor * stats.deviation
+        floor = max(self.timeout_floor, ceiling * STAGE_FLOOR_FRACTIONS.get(stage, 0.0))
+        return min(ceiling, max(floor, learned))
+
+    def poll_interval(self, stage):
+        """How often to re-check a stage's condition"""
+        stats = self._stats.get(stage)
+        if stats is None:
+            return 0.1
+        return min(0.5, max(0.05, stats.mean / 20))
+
+    def pace(self):
+        """Sleep just long enough to keep the minimum interval between sends"""
+        with self._lock:
+            now = time.monotonic()
+            if self._last_send is not None and self.min_send_interval > 0:
+                interval = self.min_send_interval + random.uniform(0, self.jitter)
+                wait = self._last_send + interval - now
+                if wait > 0:
+                    time.sleep(wait)
+                    now = time.monotonic()
+            self._last_send = now
+
+    def stats(self):
+        """Snapshot of learned means per stage, in seconds"""
+        with self._lock:
+            return {stage: stats.mean for stage, stats in self._stats.items()}
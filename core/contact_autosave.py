@@ -0,0 +1,193 @@
+# core/contact_autosave.py
+import hashlib
+import json
+import os
+import queue
+import threading
+
+from core.contact_manager import (write_csv_atomic, CHANGE_CELL, CHANGE_ROW, CHANGE_ROWS_INSERTED,
+                                  CHANGE_ROWS_REMOVED, CHANGE_COLUMN_ADDED, CHANGE_RESET)
+
+# The contacts file loaded at startup and kept up to date
+DEFAULT_CONTACTS_PATH = 'contacts.csv'
+# Changed rows are appended here between full rewrites of the CSV
+DELTA_SUFFIX = '.delta'
+# The delta is folded into the CSV once it holds more rows than
+# COMPACT_MIN_ROWS and more than COMPACT_RATIO of the contacts
+COMPACT_MIN_ROWS = 5000
+COMPACT_RATIO = 0.2
+# Bytes hashed at each end of the CSV to recognise it
+SIGNATURE_BYTES = 65536
+
+
+def _file_signature(path):
+    """Size and a hash of both ends of a file, to tell whether a delta still belongs to it
+
+    Unlike a modification time this survives copying the file elsewhere.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        digest.update(f.read(SIGNATURE_BYTES))
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(SIGNATURE_BYTES, size - SIGNATURE_BYTES))
+        digest.update(f.read())
+    return [size, digest.hexdigest()]
+
+
+class ContactAutosave:
+    """Keeps the contacts CSV in step with ContactManager without rewriting it on every edit
+
+    Edited and appended rows are tracked from ContactManager change events;
+    save() appends just those rows to a delta file (one JSON line each,
+    fsynced).  Structural changes (deleted rows, new columns, an import)
+    and a delta that grew past the compaction threshold rewrite the whole
+    CSV atomically and start a fresh delta.  Row values are copied on the
+    calling thread; the files are written by one background thread in
+    order, so a large rewrite doesn't block the caller.  load() reads the
+    CSV and replays the delta, ignoring it if the CSV changed since the
+    delta was started; the CSV itself is left as it is until a structural
+    change or compaction.
+    """
+
+    def __init__(self, contact_manager, path=DEFAULT_CONTACTS_PATH,
+                 compact_min_rows=COMPACT_MIN_ROWS, compact_ratio=COMPACT_RATIO):
+        self.contact_manager = contact_manager
+        self.path = path
+        self.delta_path = path + DELTA_SUFFIX
+        self.compact_min_rows = compact_min_rows
+        self.compact_ratio = compact_ratio
+        self._dirty = set()  # Rows changed since the last save
+        self._full = True  # The CSV must be rewritten (until load() proves a delta can be used)
+        self._delta_rows = 0  # Rows in the current delta file
+        self._loading = False
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._writer = None
+        contact_manager.subscribe(self.on_contacts_changed)
+
+    @property
+    def dirty(self):
+        return self._full or bool(self._dirty)
+
+    def on_contacts_changed(self, event, *args):
+        if self._loading:
+            return
+        with self._lock:
+            if event in (CHANGE_CELL, CHANGE_ROW):
+                self._dirty.add(args[0])
+            elif event == CHANGE_ROWS_INSERTED:
+                first, last = args
+                if last == len(self.contact_manager.store) - 1:
+                    self._dirty.update(range(first, last + 1))
+                else:
+                    self._full = True  # Later rows moved down
+            elif event in (CHANGE_ROWS_REMOVED, CHANGE_COLUMN_ADDED, CHANGE_RESET):
+                self._full = True
+
+    def load(self):
+        """Load the CSV and replay its delta; raises FileNotFoundError if there is no CSV"""
+        self._loading = True
+        try:
+            self.contact_manager.load_from_csv(self.path)
+            rows, complete = self._read_delta()
+            if rows:
+                self.contact_manager.replace_rows(rows)
+        finally:
+            self._loading = False
+        with self._lock:
+            self._dirty.clear()
+            self._full = False
+            self._delta_rows = len(rows or ())
+        if rows is None or not complete:
+            # Start a delta for the CSV as loaded; rows read before a torn line are kept,
+            # since appending after one would lose what is appended
+            self._queue(('start', list(self.contact_manager.columns), rows or []))
+        return True
+
+    def _read_delta(self):
+        """(rows, complete) of a delta matching the CSV; rows is None if there is none usable"""
+        try:
+            with open(self.delta_path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or 'null')
+                if (not isinstance(header, dict) or header.get('base') != _file_signature(self.path) or
+                        header.get('columns') != list(self.contact_manager.columns)):
+                    print("⚠️ Ignoring contacts autosave delta: the contacts file changed since it was written")
+                    return None, True
+                rows = []
+                for line in f:
+                    try:
+                        index, values = json.loads(line)
+                    except ValueError:
+                        return rows, False  # A torn last line from a crash
+                    rows.append((index, values))
+                return rows, True
+        except FileNotFoundError:
+            return None, True
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read the contacts autosave delta: {str(e)}")
+            return None, True
+
+    def save(self):
+        """Queue the changes since the last save for writing; False if there were none"""
+        manager = self.contact_manager
+        with self._lock:
+            if not self._full and not self._dirty:
+                return False
+            columns = list(manager.columns)
+            threshold = max(self.compact_min_rows, int(len(manager.store) * self.compact_ratio))
+            if self._full or self._delta_rows + len(self._dirty) > threshold:
+                job = ('full', columns, manager.snapshot_columns())
+                self._delta_rows = 0
+            else:
+                store = manager.store
+                rows = [(index, [store.get(index, column) for column in columns])
+                        for index in sorted(self._dirty) if index < len(store)]
+                job = ('delta', columns, rows)
+                self._delta_rows += len(rows)
+            self._dirty.clear()
+            self._full = False
+        self._queue(job)
+        return True
+
+    def _queue(self, job):
+        self._jobs.put(job)
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_jobs, name="contacts-autosave", daemon=True)
+            self._writer.start()
+
+    def flush(self):
+        """Wait until everything saved so far is on disk"""
+        self._jobs.join()
+
+    def _write_jobs(self):
+        while True:
+            kind, columns, data = self._jobs.get()
+            try:
+                if kind == 'full':
+                    write_csv_atomic(self.path, columns, data)
+                    self._start_delta(columns)
+                elif kind == 'start':
+                    self._start_delta(columns, data)
+                else:
+                    self._append_delta(data)
+            except Exception as e:
+                print(f"⚠️ Autosaving contacts failed: {str(e)}")
+                with self._lock:
+                    self._full = True  # Rewrite everything on the next save
+            finally:
+                self._jobs.task_done()
+
+    def _start_delta(self, columns, rows=()):
+        temp_path = self.delta_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'base': _file_signature(self.path), 'columns': columns}) + "\n")
+            f.write("".join(json.dumps([index, values], ensure_ascii=False) + "\n" for index, values in rows))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.delta_path)
+
+    def _append_delta(self, rows):
+        with open(self.delta_path, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps([index, values], ensure_ascii=False) + "\n" for index, values in rows))
+            f.flush()
+            os.fsync(f.fileno())
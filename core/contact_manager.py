@@ -1,43 +1,291 @@
 # core/contact_manager.py
-import pandas as pd
+import bisect
 import csv
+import os
+
+from core.contact_store import ContactStore
+from core.phone_numbers import PhoneNormalizer
+
+# Number of CSV rows parsed per chunk while importing
+CSV_CHUNK_SIZE = 10000
+
+PHONE_COLUMN = 'phone'
+
+# Duplicate-phone policies for imports
+DEDUP_KEEP_FIRST = 'keep_first'
+DEDUP_KEEP_LAST = 'keep_last'
+DEDUP_MERGE = 'merge'
+DEDUP_POLICIES = (DEDUP_KEEP_FIRST, DEDUP_KEEP_LAST, DEDUP_MERGE)
+
+# Change events passed to ContactManager listeners, with their arguments.
+# The "about to" events fire before the store changes, mirroring Qt's
+# begin/end model notifications.
+CHANGE_ROWS_ABOUT_TO_BE_INSERTED = 'rows_about_to_be_inserted'  # (first, last)
+CHANGE_ROWS_INSERTED = 'rows_inserted'                          # (first, last)
+CHANGE_ROWS_ABOUT_TO_BE_REMOVED = 'rows_about_to_be_removed'    # (first, last)
+CHANGE_ROWS_REMOVED = 'rows_removed'                            # (first, last)
+CHANGE_COLUMN_ABOUT_TO_BE_ADDED = 'column_about_to_be_added'    # (position, column_name)
+CHANGE_COLUMN_ADDED = 'column_added'                            # (position, column_name)
+CHANGE_CELL = 'cell_changed'                                    # (index, column_name)
+CHANGE_ROW = 'row_changed'                                      # (index,)
+CHANGE_ABOUT_TO_RESET = 'about_to_reset'                        # ()
+CHANGE_RESET = 'reset'                                          # () or (removed_rows,)
+# delete_contacts() announces more runs of rows than this as one reset, passing
+# the removed rows (ascending) with CHANGE_RESET, instead of one removal per run
+MAX_REMOVAL_RUNS = 16
+
+
+class DedupReport:
+    """Duplicates collapsed during an import"""
+
+    def __init__(self, policy=None):
+        self.policy = policy
+        # (dedup_key, kept_index, csv_row_number, raw_phone) per collapsed row
+        self.duplicates = []
+
+    def __len__(self):
+        return len(self.duplicates)
+
+    def add(self, key, kept_index, row_number, raw_phone):
+        self.duplicates.append((key, kept_index, row_number, raw_phone))
+
+    def summary(self):
+        if not self.duplicates:
+            return "No duplicate phone numbers found"
+        numbers = len(set(key for key, _, _, _ in self.duplicates))
+        return f"Collapsed {len(self.duplicates)} duplicate row(s) for {numbers} phone number(s) ({self.policy})"
+
+
+class _ByteCounter:
+    """Decode a binary line stream while keeping track of bytes consumed"""
 
-class ContactManager:
     def __init__(self):
-        self.contacts = []
-        self.columns = ['phone', 'name']  # Default columns
-        
-    def load_from_csv(self, file_path):
-        """Load contacts from CSV file"""
+        self.bytes_read = 0
+
+    def decode_lines(self, binary_file):
+        first = True
+        for raw in binary_file:
+            self.bytes_read += len(raw)
+            line = raw.decode('utf-8')
+            if first:
+                line = line.lstrip('\ufeff')  # Drop a UTF-8 BOM
+                first = False
+            yield line
+
+
+def write_csv_atomic(file_path, columns, column_values):
+    """Write columns of values as CSV to a temp file, then rename it over file_path
+
+    Rows are streamed straight from the column lists, and the rename only
+    happens once the data is on disk, so a crash leaves either the old
+    file or the new one, never a partial file.
+    """
+    temp_path = file_path + '.tmp'
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(columns)
+            writer.writerows(zip(*column_values))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
         try:
-            df = pd.read_csv(file_path)
-            self.contacts = df.to_dict('records')
-            self.columns = list(df.columns)
-        except Exception as e:
-            # Fallback to manual CSV reading
-            self.contacts = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.columns = reader.fieldnames or ['phone', 'name']
-                for row in reader:
-                    # Ensure all columns are present and handle NaN values
-                    cleaned_row = {}
-                    for col in self.columns:
-                        value = row.get(col, '')
-                        # Convert pandas NaN or None to empty string
-                        if pd.isna(value) or value is None:
-                            value = ''
-                        cleaned_row[col] = str(value).strip()
-                    self.contacts.append(cleaned_row)
-                    
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _unique_columns(header):
+    """Strip header names and suffix duplicates the way pandas does (name, name.1)"""
+    columns = []
+    seen = set()
+    for col in header:
+        col = str(col).strip()
+        name = col
+        suffix = 1
+        while name in seen:
+            name = f"{col}.{suffix}"
+            suffix += 1
+        seen.add(name)
+        columns.append(name)
+    return columns
+
+
+class ContactManager:
+    def __init__(self, phone_normalizer=None):
+        self.store = ContactStore(['phone', 'name'])  # Default columns
+        self._phone_index = {}  # Dedup key -> index of its first row
+        self._indexed_country = None  # Default country code the index was keyed with
+        self.last_dedup_report = DedupReport()
+        self.phone_normalizer = phone_normalizer or PhoneNormalizer()
+        self.invalid_phones = []  # (index, raw_phone, reason) by index, kept current by edits
+        self._listeners = []
+
+    def subscribe(self, listener):
+        """Call listener(event, *args) for every change (see CHANGE_*)"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        for listener in list(self._listeners):
+            listener(event, *args)
+
+    @property
+    def contacts(self):
+        """Sequence of dict-like row views over the contact store"""
+        return self.store.rows()
+
+    @property
+    def columns(self):
+        return self.store.columns
+
+    def load_from_csv(self, file_path, chunk_size=CSV_CHUNK_SIZE, progress_callback=None, dedup=None):
+        """Load contacts from CSV file, streaming it in chunks
+
+        Every value is kept as a string (phone numbers are never parsed as
+        floats) and only one chunk of raw rows is held at a time.
+        progress_callback, if given, is called after each chunk with
+        (rows_loaded, bytes_read, total_bytes).
+
+        dedup collapses rows whose phone numbers normalize to the same key:
+        DEDUP_KEEP_FIRST keeps the first row, DEDUP_KEEP_LAST overwrites it
+        with the last one and DEDUP_MERGE fills the first row's empty cells
+        from later ones.  The collapsed rows are listed in last_dedup_report.
+        """
+        if dedup is not None and dedup not in DEDUP_POLICIES:
+            raise ValueError(f"Unknown dedup policy: {dedup}")
+
+        store = None
+        phone_index = {}
+        report = DedupReport(dedup)
+        row_number = 0
+        dedup_key = self.phone_normalizer.dedup_key
+        for columns, chunk, bytes_read, total_bytes in self.iter_csv_chunks(file_path, chunk_size):
+            if store is None:
+                store = ContactStore(columns)
+                phone_pos = columns.index(PHONE_COLUMN) if PHONE_COLUMN in columns else None
+            if phone_pos is None:
+                store.extend_rows(chunk)
+                row_number += len(chunk)
+            else:
+                base = len(store)
+                pending = []
+                for row in chunk:
+                    row_number += 1
+                    key = dedup_key(row[phone_pos])
+                    existing = phone_index.get(key) if key else None
+                    if existing is None:
+                        if key:
+                            phone_index[key] = base + len(pending)
+                        pending.append(row)
+                    elif dedup is None:
+                        pending.append(row)
+                    else:
+                        report.add(key, existing, row_number, row[phone_pos])
+                        self._collapse_row(store, pending, base, existing, row, dedup)
+                store.extend_rows(pending)
+            if progress_callback:
+                progress_callback(len(store), bytes_read, total_bytes)
+
+        self._notify(CHANGE_ABOUT_TO_RESET)
+        self.store = store
+        self._phone_index = phone_index
+        self._indexed_country = self.phone_normalizer.default_country_code
+        self.last_dedup_report = report
+        self.validate_phones()
+        self._notify(CHANGE_RESET)
+        return report
+
+    def validate_phones(self):
+        """Normalize the whole phone column, returning the invalid numbers
+
+        Valid numbers end up in the normalizer's cache, so sending looks
+        them up instead of parsing them again.
+        """
+        if self.store.has_column(PHONE_COLUMN):
+            self.invalid_phones = self.phone_normalizer.validate_many(self.store.column(PHONE_COLUMN))
+        else:
+            self.invalid_phones = []
+        return self.invalid_phones
+
+    def _revalidate_phone(self, index):
+        """Update invalid_phones after the phone of row index changed"""
+        position = bisect.bisect_left(self.invalid_phones, (index,))
+        if position < len(self.invalid_phones) and self.invalid_phones[position][0] == index:
+            del self.invalid_phones[position]
+        phone = self.store.get(index, PHONE_COLUMN)
+        e164, reason = self.phone_normalizer.parse(phone)
+        if e164 is None:
+            self.invalid_phones.insert(position, (index, phone, reason))
+
+    def _forget_invalid_rows(self, rows):
+        """Drop deleted rows (sorted) from invalid_phones and shift the ones after them"""
+        if self.invalid_phones:
+            doomed = set(rows)
+            self.invalid_phones = [(index - bisect.bisect_left(rows, index), phone, reason)
+                                   for index, phone, reason in self.invalid_phones if index not in doomed]
+
+    def _collapse_row(self, store, pending, base, existing, row, policy):
+        """Fold a duplicate row into the row it duplicates"""
+        if existing >= base:
+            # The kept row is still in the current chunk
+            kept = pending[existing - base]
+            if policy == DEDUP_KEEP_LAST:
+                pending[existing - base] = row
+            elif policy == DEDUP_MERGE:
+                pending[existing - base] = [old if old != '' else new for old, new in zip(kept, row)]
+            return
+        for column_name, value in zip(store.columns, row):
+            if policy == DEDUP_KEEP_LAST:
+                store.set(existing, column_name, value)
+            elif policy == DEDUP_MERGE and value != '' and store.get(existing, column_name) == '':
+                store.set(existing, column_name, value)
+
+    def iter_csv_chunks(self, file_path, chunk_size=CSV_CHUNK_SIZE):
+        """Yield (columns, rows, bytes_read, total_bytes) for each chunk of a CSV file
+
+        Rows are lists of stripped string values in column order.
+        """
+        total_bytes = os.path.getsize(file_path)
+        counter = _ByteCounter()
+        with open(file_path, 'rb') as f:
+            reader = csv.reader(counter.decode_lines(f))
+            header = next(reader, None)
+            columns = _unique_columns(header) if header else ['phone', 'name']
+            width = len(columns)
+            chunk = []
+            yielded = False
+            for row in reader:
+                if not row:
+                    continue  # Skip blank lines
+                # Missing trailing cells become empty strings, extra cells are dropped
+                if len(row) < width:
+                    row = row + [''] * (width - len(row))
+                elif len(row) > width:
+                    row = row[:width]
+                chunk.append([value.strip() for value in row])
+                if len(chunk) >= chunk_size:
+                    yield columns, chunk, counter.bytes_read, total_bytes
+                    yielded = True
+                    chunk = []
+            # Always yield at least once so callers learn the columns
+            if chunk or not yielded:
+                yield columns, chunk, counter.bytes_read, total_bytes
+
     def save_to_csv(self, file_path):
-        """Save contacts to CSV file"""
-        if self.contacts:
-            df = pd.DataFrame(self.contacts)
-            # Replace empty strings with NaN to avoid writing empty values
-            df = df.replace('', pd.NA)
-            df.to_csv(file_path, index=False, encoding='utf-8')
-            
+        """Save contacts to CSV file, atomically (see write_csv_atomic)"""
+        write_csv_atomic(file_path, list(self.columns), self.snapshot_columns())
+
+    def snapshot_columns(self):
+        """A copy of every column's values, in column order, safe to write from another thread"""
+        return [self.store.column(col) for col in self.columns]
+
+
     def get_contacts(self):
         """Get all contacts"""
         return self.contacts
@@ -46,38 +294,137 @@ class ContactManager:
         """Get column names"""
         return self.columns
         
+    def find_by_phone(self, phone):
+        """Return the index of the first contact with this phone number, or None"""
+        key = self.phone_normalizer.dedup_key(phone)
+        if not key:
+            return None
+        if not self._phone_index_current():
+            self._rebuild_phone_index()
+        return self._phone_index.get(key)
+
+    def _phone_index_current(self):
+        # Keys change with the default country code
+        return (self._phone_index is not None and
+                self._indexed_country == self.phone_normalizer.default_country_code)
+
+    def _rebuild_phone_index(self):
+        index = {}
+        dedup_key = self.phone_normalizer.dedup_key
+        if self.store.has_column(PHONE_COLUMN):
+            for row, phone in enumerate(self.store.column(PHONE_COLUMN)):
+                key = dedup_key(phone)
+                if key and key not in index:
+                    index[key] = row
+        self._phone_index = index
+        self._indexed_country = self.phone_normalizer.default_country_code
+
     def add_contact(self, phone, name):
         """Add a new contact"""
-        contact = {'phone': phone, 'name': name}
-        # Add empty values for other columns
-        for col in self.columns:
-            if col not in contact:
-                contact[col] = ""
-        self.contacts.append(contact)
+        # Other columns are left empty
+        self.add_column('phone')
+        self.add_column('name')
+        index = len(self.store)
+        self._notify(CHANGE_ROWS_ABOUT_TO_BE_INSERTED, index, index)
+        self.store.append({'phone': phone, 'name': name})
+        key = self.phone_normalizer.dedup_key(phone)
+        if self._phone_index_current() and key and key not in self._phone_index:
+            self._phone_index[key] = index
+        self._revalidate_phone(index)
+        self._notify(CHANGE_ROWS_INSERTED, index, index)
         
     def delete_contact(self, index):
         """Delete contact by index"""
-        if 0 <= index < len(self.contacts):
-            del self.contacts[index]
+        if 0 <= index < len(self.store):
+            self._notify(CHANGE_ROWS_ABOUT_TO_BE_REMOVED, index, index)
+            self.store.delete(index)
+            # Row positions shifted; rebuild the index on next lookup
+            self._phone_index = None
+            self._forget_invalid_rows([index])
+            self._notify(CHANGE_ROWS_REMOVED, index, index)
+            
+    def delete_contacts(self, indices):
+        """Delete several contacts by index at once
+
+        Listeners see one removal per contiguous run of rows, last run
+        first, so the positions they are given stay valid.  A scattered
+        selection of more than MAX_REMOVAL_RUNS runs is deleted in one pass
+        and announced as a reset instead.
+        """
+        rows = sorted(set(i for i in indices if 0 <= i < len(self.store)))
+        if not rows:
+            return
+        runs = []
+        if self._listeners:
+            first = last = rows[0]
+            for row in rows[1:]:
+                if row != last + 1:
+                    runs.append((first, last))
+                    first = row
+                last = row
+            runs.append((first, last))
+        if len(runs) > MAX_REMOVAL_RUNS:
+            self._notify(CHANGE_ABOUT_TO_RESET)
+            self.store.delete_many(rows)
+            self._phone_index = None
+            self._forget_invalid_rows(rows)
+            self._notify(CHANGE_RESET, rows)
+            return
+        if not runs:
+            self.store.delete_many(rows)
+        else:
+            for first, last in reversed(runs):
+                self._notify(CHANGE_ROWS_ABOUT_TO_BE_REMOVED, first, last)
+                self.store.delete_range(first, last)
+                self._notify(CHANGE_ROWS_REMOVED, first, last)
+        self._phone_index = None
+        self._forget_invalid_rows(rows)
             
     def add_column(self, column_name):
         """Add a new column to contacts"""
-        if column_name not in self.columns:
-            self.columns.append(column_name)
-            # Add empty values for the new column to all contacts
-            for contact in self.contacts:
-                contact[column_name] = ""
+        # Existing contacts read the new column as an empty string
+        column_name = str(column_name)
+        if self.store.has_column(column_name):
+            return
+        position = len(self.store.columns)
+        self._notify(CHANGE_COLUMN_ABOUT_TO_BE_ADDED, position, column_name)
+        self.store.add_column(column_name)
+        self._notify(CHANGE_COLUMN_ADDED, position, column_name)
                 
     def update_contact(self, index, column_name, value):
         """Update a specific contact field"""
-        if 0 <= index < len(self.contacts) and column_name in self.columns:
-            self.contacts[index][column_name] = value
+        if 0 <= index < len(self.store) and self.store.has_column(column_name):
+            self.store.set(index, column_name, value)
+            if column_name == PHONE_COLUMN:
+                self._phone_index = None
+                self._revalidate_phone(index)
+            self._notify(CHANGE_CELL, index, column_name)
             
+    def replace_rows(self, rows):
+        """Overwrite whole rows given as (index, values in column order)
+
+        An index at or past the end appends the row.  Listeners see a
+        single reset instead of one event per row.
+        """
+        self._notify(CHANGE_ABOUT_TO_RESET)
+        columns = list(self.columns)
+        for index, values in rows:
+            if index < len(self.store):
+                for column_name, value in zip(columns, values):
+                    self.store.set(index, column_name, value)
+            else:
+                self.store.append(dict(zip(columns, values)))
+        self._phone_index = None
+        self.validate_phones()
+        self._notify(CHANGE_RESET)
+
     def update_contact_row(self, index, contact_data):
         """Update entire contact row"""
-        if 0 <= index < len(self.contacts):
+        if 0 <= index < len(self.store):
             for col in self.columns:
                 if col in contact_data:
-                    self.contacts[index][col] = contact_data[col]
-                elif col not in self.contacts[index]:
-                    self.contacts[index][col] = ""
\ No newline at end of file
+                    self.store.set(index, col, contact_data[col])
+            if PHONE_COLUMN in contact_data:
+                self._phone_index = None
+                self._revalidate_phone(index)
+            self._notify(CHANGE_ROW, index)
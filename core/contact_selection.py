@@ -0,0 +1,89 @@
+# core/contact_selection.py
+import bisect
+
+
+class ContactSelection:
+    """Which contact rows are selected, kept as a default plus exceptions
+
+    The selection is "everything" or "nothing" (the default) except for the
+    rows in a small set of exceptions, so select_all and clear are O(1) and
+    memory only grows with the rows toggled by hand.
+    """
+
+    def __init__(self, row_count=0):
+        self.row_count = row_count
+        self._default = False
+        self._exceptions = set()
+
+    def resize(self, row_count):
+        """Adjust to a new row count, dropping exceptions past the end"""
+        if row_count < self.row_count:
+            self._exceptions = set(i for i in self._exceptions if i < row_count)
+        self.row_count = row_count
+
+    def insert_rows(self, first, count):
+        """Make room for count unselected rows starting at first"""
+        self._exceptions = set(i + count if i >= first else i for i in self._exceptions)
+        if self._default:
+            self._exceptions.update(range(first, first + count))
+        self.row_count += count
+
+    def remove_rows(self, first, last):
+        """Forget rows first..last inclusive, shifting the ones after them"""
+        count = last - first + 1
+        self._exceptions = set(i - count if i > last else i
+                               for i in self._exceptions if not first <= i <= last)
+        self.row_count -= count
+
+    def remove_many(self, rows):
+        """Forget the given rows (ascending), shifting the ones after each of them"""
+        removed = set(rows)
+        self._exceptions = set(i - bisect.bisect_left(rows, i)
+                               for i in self._exceptions if i not in removed)
+        self.row_count -= len(removed)
+
+    def select_all(self):
+        self._default = True
+        self._exceptions = set()
+
+    def clear(self):
+        self._default = False
+        self._exceptions = set()
+
+    def is_selected(self, index):
+        return (index in self._exceptions) != self._default
+
+    def set_selected(self, index, selected):
+        if selected == self._default:
+            self._exceptions.discard(index)
+        else:
+            self._exceptions.add(index)
+
+    def toggle(self, index):
+        self.set_selected(index, not self.is_selected(index))
+
+    def count(self):
+        if self._default:
+            return self.row_count - len(self._exceptions)
+        return len(self._exceptions)
+
+    def indices(self):
+        """Selected row indices in ascending order"""
+        if not self._default:
+            return sorted(self._exceptions)
+        exceptions = self._exceptions
+        return [i for i in range(self.row_count) if i not in exceptions]
+
+    def sample(self, size):
+        """Up to size selected indices spread evenly, without listing them all"""
+        count = self.count()
+        if count <= size:
+            return self.indices()
+        ranks = [int(i * count / size) for i in range(size)]
+        exceptions = sorted(self._exceptions)
+        if not self._default:
+            return [exceptions[rank] for rank in ranks]
+        # The rank-th selected row is rank plus the unselected rows before
+        # it; exception j lies before it when exceptions[j] - j <= rank
+        shifted = [index - j for j, index in enumerate(exceptions)]
+        return [rank + bisect.bisect_right(shifted, rank) for rank in ranks]
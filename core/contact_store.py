@@ -0,0 +1,175 @@
+# core/contact_store.py
+import sys
+from collections.abc import Mapping, Sequence
+
+
+class ContactStore:
+    """Columnar storage for contacts: one list of values per column.
+
+    Column names are interned and stored once instead of being repeated in
+    every contact dict.  A column list may be shorter than the number of
+    rows; the missing trailing cells read as empty strings, which is what
+    makes add_column O(1).
+    """
+
+    def __init__(self, columns=None):
+        self.columns = []
+        self._data = {}
+        self._length = 0
+        for column_name in columns or []:
+            self.add_column(column_name)
+
+    def __len__(self):
+        return self._length
+
+    def has_column(self, column_name):
+        return column_name in self._data
+
+    def add_column(self, column_name):
+        """Add an empty column, returning False if it already exists"""
+        column_name = sys.intern(str(column_name))
+        if column_name in self._data:
+            return False
+        self.columns.append(column_name)
+        self._data[column_name] = []
+        return True
+
+    def _pad(self, values, length):
+        if len(values) < length:
+            values.extend([''] * (length - len(values)))
+
+    def append(self, contact_data):
+        """Append a row from a mapping of column name to value"""
+        index = self._length
+        for column_name, values in self._data.items():
+            value = contact_data.get(column_name, '')
+            if value == '' and len(values) < index:
+                continue  # Leave the cell implicit
+            self._pad(values, index)
+            values.append(value)
+        self._length += 1
+        return index
+
+    def extend_rows(self, rows):
+        """Append rows given as value lists in column order (short rows end in empty cells)"""
+        column_lists = [self._data[column_name] for column_name in self.columns]
+        # Implicit trailing cells must become real before rows go after them
+        for values in column_lists:
+            self._pad(values, self._length)
+        width = len(column_lists)
+        count = 0
+        for row in rows:
+            if len(row) < width:
+                row = list(row) + [''] * (width - len(row))
+            for values, value in zip(column_lists, row):
+                values.append(value)
+            count += 1
+        self._length += count
+
+    def get(self, index, column_name):
+        values = self._data[column_name]
+        return values[index] if index < len(values) else ''
+
+    def set(self, index, column_name, value):
+        values = self._data[column_name]
+        self._pad(values, index + 1)
+        values[index] = value
+
+    def delete(self, index):
+        for values in self._data.values():
+            if index < len(values):
+                del values[index]
+        self._length -= 1
+
+    def delete_range(self, first, last):
+        """Delete rows first..last inclusive"""
+        for values in self._data.values():
+            del values[first:last + 1]
+        self._length -= last - first + 1
+
+    def delete_many(self, indices):
+        """Delete several rows in one pass over each column"""
+        doomed = set(i for i in indices if 0 <= i < self._length)
+        if not doomed:
+            return
+        for column_name, values in self._data.items():
+            self._data[column_name] = [v for i, v in enumerate(values) if i not in doomed]
+        self._length -= len(doomed)
+
+    def column(self, column_name):
+        """Return a full-length copy of a column's values"""
+        values = list(self._data[column_name])
+        self._pad(values, self._length)
+        return values
+
+    def row(self, index):
+        return ContactRow(self, index)
+
+    def rows(self):
+        return ContactRows(self)
+
+
+class ContactRows(Sequence):
+    """Sequence of ContactRow views over a ContactStore"""
+
+    __slots__ = ('_store',)
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ContactRow(self._store, i) for i in range(*index.indices(len(self._store)))]
+        if index < 0:
+            index += len(self._store)
+        if not 0 <= index < len(self._store):
+            raise IndexError("contact index out of range")
+        return ContactRow(self._store, index)
+
+    def __iter__(self):
+        store = self._store
+        for index in range(len(store)):
+            yield ContactRow(store, index)
+
+
+class ContactRow(Mapping):
+    """Dict-like view of one contact in a ContactStore.
+
+    A view refers to a row position, so it should not be kept across row
+    deletions.  Use dict(row) for a detached copy.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, column_name):
+        if not self._store.has_column(column_name):
+            raise KeyError(column_name)
+        return self._store.get(self._index, column_name)
+
+    def __setitem__(self, column_name, value):
+        self._store.add_column(column_name)
+        self._store.set(self._index, column_name, value)
+
+    def __contains__(self, column_name):
+        return self._store.has_column(column_name)
+
+    def __iter__(self):
+        return iter(self._store.columns)
+
+    def __len__(self):
+        return len(self._store.columns)
+
+    def get(self, column_name, default=None):
+        if not self._store.has_column(column_name):
+            return default
+        return self._store.get(self._index, column_name)
+
+    def __repr__(self):
+        return f"ContactRow({dict(self)!r})"
@@ -0,0 +1,148 @@
+# core/driver_resolver.py
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+
+# Use this chromedriver instead of resolving one
+DRIVER_PATH = os.environ.get('WHATSAPP_CHROMEDRIVER_PATH', '')
+# "1" never asks the network for a driver (cache, configured path or PATH only)
+OFFLINE = os.environ.get('WHATSAPP_DRIVER_OFFLINE', '') not in ('', '0', 'false', 'no')
+
+# Chrome version -> chromedriver path, kept next to the Chrome profiles
+DEFAULT_CACHE_PATH = os.path.join(os.getcwd(), 'chromedriver_cache.json')
+
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+MAC_CHROME_PATH = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+WINDOWS_VERSION_KEYS = (
+    r'HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon',
+    r'HKEY_LOCAL_MACHINE\Software\Google\Chrome\BLBeacon',
+)
+VERSION_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+
+
+def _run_quietly(command):
+    try:
+        return subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ''
+
+
+def detect_chrome_version():
+    """Installed Chrome version (e.g. '126.0.6478.126') from local sources only, or None"""
+    if sys.platform.startswith('win'):
+        for key in WINDOWS_VERSION_KEYS:
+            match = VERSION_PATTERN.search(_run_quietly(['reg', 'query', key, '/v', 'version']))
+            if match:
+                return match.group(1)
+        return None
+    candidates = [MAC_CHROME_PATH] if sys.platform == 'darwin' else []
+    candidates += [path for path in map(shutil.which, CHROME_BINARIES) if path]
+    for binary in candidates:
+        if os.path.exists(binary):
+            match = VERSION_PATTERN.search(_run_quietly([binary, '--version']))
+            if match:
+                return match.group(1)
+    return None
+
+
+class ChromeDriverResolver:
+    """Finds a chromedriver for the installed Chrome, downloading at most once
+
+    Resolution order: a configured driver_path, the in-process result, the
+    on-disk cache keyed on the Chrome version, then a chromedriver on PATH
+    when offline, else webdriver_manager.  resolve() returns None when none
+    was found; online that means "let selenium find a driver itself", while
+    offline callers must not start Chrome without a path, since selenium's
+    own lookup may download one.  One resolver is shared by every session,
+    so pool workers resolve once between them.
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, driver_path=None, offline=None):
+        self.cache_path = cache_path
+        self.driver_path = driver_path if driver_path is not None else DRIVER_PATH
+        self.offline = OFFLINE if offline is None else offline
+        self._lock = threading.Lock()
+        self._chrome_version = None
+        self._resolved = None
+
+    def chrome_version(self):
+        if self._chrome_version is None:
+            self._chrome_version = detect_chrome_version() or ''
+        return self._chrome_version or None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        temp_path = self.cache_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not save the ChromeDriver cache: {str(e)}")
+
+    def resolve(self):
+        """Path of a chromedriver to use, or None to fall back to selenium's own lookup"""
+        if self.driver_path:
+            if os.path.exists(self.driver_path):
+                return self.driver_path
+            print(f"⚠️ Configured ChromeDriver not found: {self.driver_path}")
+        with self._lock:
+            if self._resolved and os.path.exists(self._resolved):
+                return self._resolved
+            version = self.chrome_version()
+            if version:
+                cached = self._load_cache().get(version)
+                if cached and os.path.exists(cached):
+                    self._resolved = cached
+                    return cached
+            if self.offline:
+                self._resolved = shutil.which('chromedriver')
+                return self._resolved
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+            except Exception as e:
+                print(f"ChromeDriver download failed: {e}")
+                return None
+            self._resolved = path
+            if version:
+                cache = self._load_cache()
+                cache[version] = path
+                self._save_cache(cache)
+            return path
+
+    def invalidate(self, path):
+        """Forget a driver that failed to start (e.g. after a Chrome update)"""
+        with self._lock:
+            if self._resolved == path:
+                self._resolved = None
+            cache = self._load_cache()
+            stale = [version for version, cached in cache.items() if cached == path]
+            if stale:
+                for version in stale:
+                    del cache[version]
+                self._save_cache(cache)
+
+
+_default_resolver = None
+_default_lock = threading.Lock()
+
+
+def default_resolver():
+    """The process-wide resolver shared by every WhatsAppSender"""
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            _default_resolver = ChromeDriverResolver()
+        return _default_resolver
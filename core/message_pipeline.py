@@ -0,0 +1,81 @@
+# core/message_pipeline.py
+import queue
+import threading
+import time
+
+from core.template_engine import compile_template
+
+# Messages rendered ahead of the one being sent
+PREPARE_AHEAD = 64
+
+_DONE = object()
+
+
+class PreparedMessages:
+    """(phone, message, name) per contact, rendered on a producer thread
+
+    Template rendering and phone normalization run ahead of the sender
+    through a bounded queue, so the first message goes out without waiting
+    for the whole campaign to render, and at most `ahead` rendered messages
+    wait in memory.  len() is known up front, so senders can report
+    progress as with a list; iterate it once.  With metrics, the time spent
+    rendering (not waiting for room in the queue) is recorded as
+    'campaign.render'.
+    """
+
+    def __init__(self, contacts, template, phone_normalizer, ahead=PREPARE_AHEAD, metrics=None):
+        self.contacts = contacts
+        self.template = template
+        self.phone_normalizer = phone_normalizer
+        self.metrics = metrics
+        self._queue = queue.Queue(maxsize=ahead)
+        self._stop = threading.Event()
+        self._error = None
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def _put(self, item):
+        """Block until there is room; False once the consumer went away"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce(self):
+        busy = 0.0
+        try:
+            started = time.perf_counter()
+            columns = self.contacts[0].keys() if self.contacts else []
+            compiled = compile_template(self.template, columns)
+            normalize = self.phone_normalizer.normalize
+            for contact in self.contacts:
+                item = (normalize(contact.get('phone', '')), compiled.render(contact), contact.get('name', ''))
+                busy += time.perf_counter() - started
+                if not self._put(item):
+                    return
+                started = time.perf_counter()
+        except Exception as e:
+            self._error = e
+        finally:
+            if self.metrics:
+                self.metrics.observe('campaign.render', busy, self._error is not None)
+        self._put(_DONE)
+
+    def __iter__(self):
+        thread = threading.Thread(target=self._produce, name="message-producer", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    break
+                yield item
+            if self._error is not None:
+                raise self._error
+        finally:
+            # Stops the producer if the sender gave up early
+            self._stop.set()
@@ -1,25 +1,90 @@
 # core/message_sender.py
-from core.personalized_sender import WhatsAppSender
-import threading
+from core.template_engine import compile_template
+from core.phone_numbers import PhoneNormalizer
+from core.send_journal import (SendJournal, DEFAULT_JOURNAL_PATH, STATE_SENT, STATE_FAILED, STATE_UNCONFIRMED,
+                               STATE_DELIVERED, STATE_READ)
+from core.retry_queue import FAILURE_UNCONFIRMED
+from core.rate_scheduler import RateScheduler, DAY
+from core.session_manager import SessionManager
+from core.send_metrics import default_metrics
+from core.message_pipeline import PreparedMessages
+from core.receipt_tracker import RECEIPT_DELIVERED, RECEIPT_READ, MAX_TRACKED
+import hashlib
 import time
 
 class MessageSender:
-    def __init__(self):
-        self.whatsapp_sender = WhatsAppSender()
+    def __init__(self, phone_normalizer=None, session_count=1, journal_path=DEFAULT_JOURNAL_PATH,
+                 scheduler=None, metrics=None):
+        self.phone_normalizer = phone_normalizer or PhoneNormalizer()
+        self.session_count = session_count
+        # Created on first use: it pulls in selenium, which is slow to import
+        self._whatsapp_sender = None
         self.is_sending = False
+        # Background start-up, liveness probes and reconnects for the browser
+        self.session = SessionManager(self)
+        # Durable record of who already got which campaign; None disables resume
+        self.journal = SendJournal(journal_path) if journal_path else None
+        self.last_campaign_id = None
+        # Per-stage timings; each campaign's share is exported when it ends
+        self.metrics = metrics or default_metrics()
+        self.last_timings = {}  # Per-stage summary of the last campaign
+        # Called as (phone, state) when a sent message gets a new tick, also after its campaign
+        self.receipt_callback = None
+        self._receipt_campaigns = {}  # Phone -> campaign of its latest sent message
+        # Paces every outbound message (rate, burst, caps, quiet hours)
+        self.scheduler = scheduler or RateScheduler()
+        if self.journal:
+            # Earlier sends still count towards the hourly and daily caps
+            self.scheduler.seed(self.journal.send_times_since(time.time() - DAY))
         
+    @property
+    def whatsapp_sender(self):
+        if self._whatsapp_sender is None:
+            self._whatsapp_sender = self._create_sender(self.session_count)
+        return self._whatsapp_sender
+
+    def _create_sender(self, session_count):
+        """One WhatsAppSender, or a SenderPool when several sessions are linked"""
+        if session_count > 1:
+            from core.sender_pool import SenderPool
+            sender = SenderPool(session_count, phone_normalizer=self.phone_normalizer)
+        else:
+            from core.personalized_sender import WhatsAppSender
+            sender = WhatsAppSender(phone_normalizer=self.phone_normalizer)
+        sender.set_receipt_callback(self._on_receipt)
+        return sender
+
+    def _on_receipt(self, phone, state):
+        """Journal delivered and read ticks under the campaign that sent the message"""
+        campaign_id = self._receipt_campaigns.get(phone)
+        if self.journal and campaign_id and state in (RECEIPT_DELIVERED, RECEIPT_READ):
+            self.journal.record(campaign_id, phone, STATE_DELIVERED if state == RECEIPT_DELIVERED else STATE_READ)
+            if not self.is_sending:
+                self.journal.flush()  # Idle sweeps are rare; don't leave them buffered
+        if state == RECEIPT_READ:
+            self._receipt_campaigns.pop(phone, None)
+        if self.receipt_callback:
+            self.receipt_callback(phone, state)
+
+    def set_session_count(self, session_count):
+        """Change the number of parallel WhatsApp sessions (only while disconnected)"""
+        if session_count == self.session_count:
+            return True
+        if self.session.launching or (self._whatsapp_sender is not None and self._whatsapp_sender.is_initialized):
+            return False
+        self.session_count = session_count
+        self._whatsapp_sender = None
+        return True
+
     def personalize_message(self, template, contact_data):
         """Personalize message template with contact data"""
-        message = template
-        for key, value in contact_data.items():
-            placeholder = f"({key})"
-            message = message.replace(placeholder, str(value))
-        return message
+        return compile_template(template, contact_data.keys()).render(contact_data)
         
     def initialize_whatsapp(self):
         """Initialize WhatsApp Web connection"""
         print("Initializing WhatsApp Web...")
-        success = self.whatsapp_sender.initialize_driver()
+        # Joins a background start-up that is already under way
+        success = self.session.connect()
         if success:
             print("WhatsApp Web initialized successfully")
         else:
@@ -30,46 +95,188 @@ class MessageSender:
         """Send message to phone number using Selenium"""
         return self.whatsapp_sender.send_single_message(phone, message)
         
-    def send_bulk_messages(self, contacts_data, progress_callback=None, status_callback=None):
-        """Send messages to multiple contacts"""
+    def campaign_id_for(self, template=None):
+        """Default campaign id: the latest campaign that sent this template
+
+        Sending the same template again therefore resumes where the last
+        run stopped, unless new_campaign_id() is used.
+        """
+        base = self._template_campaign_prefix(template)
+        if self.journal:
+            return self.journal.latest_campaign(base) or base
+        return base
+
+    def _template_campaign_prefix(self, template=None):
+        if template is None:
+            template = self.current_template
+        return "tmpl-" + hashlib.sha1(template.encode('utf-8')).hexdigest()[:12]
+
+    def new_campaign_id(self, template=None):
+        """A fresh campaign id for deliberately re-sending a template"""
+        return f"{self._template_campaign_prefix(template)}-{int(time.time())}"
+
+    def already_sent(self, contacts_data, campaign_id=None):
+        """Contacts that the journal shows as sent for this campaign"""
+        if not self.journal:
+            return []
+        campaign_id = campaign_id or self.campaign_id_for()
+        done = self.journal.completed_phones(campaign_id)
+        return [c for c in contacts_data if self.phone_normalizer.normalize(c.get('phone', '')) in done]
+
+    def send_bulk_messages(self, contacts_data, progress_callback=None, status_callback=None, campaign_id=None,
+                           result_callback=None):
+        """Send messages to multiple contacts
+
+        With a journal, results are recorded under campaign_id (by default
+        derived from the template) and contacts already sent in that
+        campaign are skipped, so an interrupted campaign resumes; so are
+        unconfirmed ones, which may have been sent.
+        result_callback, if given, is called as (phone, success, reason)
+        once per contact, including those skipped for an invalid number.
+        Stage timings of the campaign end up in last_timings and are
+        exported by self.metrics.
+        """
+        if self.journal:
+            campaign_id = campaign_id or self.campaign_id_for()
+        since = self.metrics.snapshot()
+        span = self.metrics.span('campaign.total')
+        success_count, total_count = 0, len(contacts_data)
+        try:
+            success_count, total_count = self._send_bulk_messages(
+                contacts_data, progress_callback, status_callback, campaign_id, result_callback)
+        finally:
+            span.end(error=success_count < total_count)
+            self.last_timings = self.metrics.export(since, campaign=campaign_id,
+                                                    succeeded=success_count, total=total_count)
+        return success_count, total_count
+
+    def _send_bulk_messages(self, contacts_data, progress_callback, status_callback, campaign_id,
+                            result_callback):
+        # Normalize numbers and drop invalid ones before any browser work
+        with self.metrics.span('campaign.prepare'):
+            contacts_data, invalid = self.prepare_recipients(contacts_data)
+        if invalid and status_callback:
+            status_callback(f"⚠️ Skipping {len(invalid)} invalid phone number(s)")
+        if result_callback:
+            for contact, reason in invalid:
+                result_callback(contact.get('phone', ''), False, reason)
+
+        caller_result_callback = result_callback
+        if self.journal:
+            campaign_id = campaign_id or self.campaign_id_for()
+            self.last_campaign_id = campaign_id
+            with self.metrics.span('campaign.journal_lookup'):
+                done = self.journal.completed_phones(campaign_id)
+            if done:
+                remaining = [c for c in contacts_data
+                             if self.phone_normalizer.normalize(c.get('phone', '')) not in done]
+                if status_callback:
+                    status_callback(f"⏭️ Skipping {len(contacts_data) - len(remaining)} contact(s) already sent")
+                contacts_data = remaining
+
+            def result_callback(phone, success, reason):
+                if success:
+                    state = STATE_SENT
+                elif self.whatsapp_sender.last_failure == FAILURE_UNCONFIRMED:
+                    state = STATE_UNCONFIRMED  # May have been sent: resuming skips it
+                else:
+                    state = STATE_FAILED
+                self.journal.record(campaign_id, phone, state, None if success else reason)
+                if success:
+                    self._receipt_campaigns.pop(phone, None)
+                    self._receipt_campaigns[phone] = campaign_id
+                    if len(self._receipt_campaigns) > MAX_TRACKED:
+                        del self._receipt_campaigns[next(iter(self._receipt_campaigns))]
+                if caller_result_callback:
+                    caller_result_callback(phone, success, reason)
+
+        if not contacts_data:
+            return 0, len(invalid)
+
         if not self.whatsapp_sender.is_initialized:
             if status_callback:
                 status_callback("🟡 Connecting to WhatsApp Web...")
-            if not self.initialize_whatsapp():
+            with self.metrics.span('campaign.connect'):
+                connected = self.initialize_whatsapp()
+            if not connected:
                 if status_callback:
                     status_callback("❌ Failed to initialize WhatsApp Web")
-                return 0, len(contacts_data)
-        
-        # Prepare data for bulk sending
-        contacts_with_messages = []
-        for contact in contacts_data:
-            phone = contact.get('phone', '')
-            name = contact.get('name', '')
-            personalized_message = self.personalize_message(self.current_template, contact)
-            contacts_with_messages.append((phone, personalized_message, name))
+                return 0, len(contacts_data) + len(invalid)
         
+        # Messages are rendered on a producer thread while earlier ones are being sent
+        contacts_with_messages = PreparedMessages(contacts_data, self.current_template, self.phone_normalizer,
+                                                  metrics=self.metrics)
+
         if status_callback:
             status_callback(f"🟡 Sending to {len(contacts_with_messages)} contacts...")
         
-        # Send messages
-        success_count, total_count = self.whatsapp_sender.send_bulk_messages(
-            contacts_with_messages, 
-            progress_callback
-        )
+        if self.journal:
+            normalize = self.phone_normalizer.normalize
+            self.journal.queue(campaign_id, [normalize(contact.get('phone', '')) for contact in contacts_data])
+
+        def on_scheduler_wait(seconds, reason):
+            if status_callback:
+                status_callback(f"⏸️ Waiting {seconds / 60:.0f} min ({reason})")
+
+        self.scheduler.enqueue(len(contacts_with_messages))
+        self.scheduler.wait_callback = on_scheduler_wait
+
+        # Send messages; the send loop recovers crashed sessions itself meanwhile
+        self.is_sending = True
+        try:
+            with self.metrics.span('campaign.send'):
+                success_count, total_count = self.whatsapp_sender.send_bulk_messages(
+                    contacts_with_messages,
+                    progress_callback,
+                    result_callback,
+                    self.scheduler
+                )
+        finally:
+            self.is_sending = False
+            self.scheduler.wait_callback = None
+            self.scheduler.discard(self.scheduler.queue_depth)
+            if self.journal:
+                self.journal.flush()
         
+        total_count += len(invalid)
         if status_callback:
             status_callback(f"✅ Sent {success_count}/{total_count} messages successfully")
         
         return success_count, total_count
+
+    def prepare_recipients(self, contacts_data):
+        """Split contacts into sendable ones and (contact, reason) for invalid numbers
+
+        Contacts whose numbers normalize to the same E.164 number are only
+        kept once, so a broadcast never opens the same chat twice.
+        """
+        valid = []
+        invalid = []
+        seen_phones = set()
+        for contact in contacts_data:
+            e164, reason = self.phone_normalizer.parse(contact.get('phone', ''))
+            if e164 is None:
+                invalid.append((contact, reason))
+            elif e164 not in seen_phones:
+                seen_phones.add(e164)
+                valid.append(contact)
+        return valid, invalid
         
+    def get_send_status(self):
+        """Current send rate and queue depth from the scheduler"""
+        return self.scheduler.status()
+
     def set_message_template(self, template):
         """Set the current message template"""
         self.current_template = template
         
     def close_whatsapp(self):
         """Close WhatsApp connection"""
-        self.whatsapp_sender.close_driver()
+        self.session.disconnect()
+        if self._whatsapp_sender is not None:
+            self._whatsapp_sender.close_driver()
         
     def is_whatsapp_ready(self):
         """Check if WhatsApp is initialized and ready"""
-        return self.whatsapp_sender.is_initialized and self.whatsapp_sender.check_whatsapp_ready()
\ No newline at end of file
+        sender = self._whatsapp_sender
+        return sender is not None and sender.is_initialized and sender.check_whatsapp_ready()
\ No newline at end of file
@@ -5,21 +5,212 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from webdriver_manager.chrome import ChromeDriverManager
 import urllib.parse, time, random, os
+import collections
 import subprocess
 import sys
+from core.phone_numbers import PhoneNormalizer
+from core.adaptive_timing import AdaptiveTiming
+from core.driver_resolver import default_resolver
+from core.send_metrics import default_metrics
+from core.receipt_tracker import ReceiptTracker, RECEIPT_PENDING
+from core.retry_queue import (RetryQueue, SendFailure, classify_exception, FAILURE_INVALID_NUMBER,
+                              FAILURE_TIMEOUT, FAILURE_POPUP, FAILURE_LOGGED_OUT, FAILURE_DRIVER_CRASH,
+                              FAILURE_UNCONFIRMED)
+
+WHATSAPP_WEB_URL = "https://web.whatsapp.com"
+
+SIDE_PANEL_XPATH = "//div[@id='pane-side']"
+MESSAGE_BOX_XPATH = "//footer//div[@contenteditable='true' and @data-tab]"
+OUTGOING_MESSAGE_XPATH = "//div[contains(@class,'message-out')]"
+DIALOG_XPATH = "//div[@role='dialog']"
+DIALOG_BUTTON_XPATH = "//div[@role='dialog']//button"
+LOGGED_OUT_XPATH = "//canvas[@aria-label='Scan me!'] | //div[contains(@class, 'landing-wrapper')]"
+# Popups that keep coming back after this many rounds of closing fail the send
+MAX_POPUP_ROUNDS = 3
+
+# Composer of a chat panel opened after the previous one was marked stale
+FRESH_MESSAGE_BOX_XPATH = (
+    "//div[@id='main' and not(@data-wb-previous)]//footer//div[@contenteditable='true' and @data-tab]"
+)
+
+# Written into a Chrome profile once it reached the chat list, removed when it
+# shows the QR code: tells profiles that can start without a scan from new ones
+LOGIN_MARKER_FILE = '.whatsapp_logged_in'
+
+# Upper bounds for the condition waits (the old fixed timeouts)
+CHAT_OPEN_TIMEOUT = 20
+CHAT_SWITCH_TIMEOUT = 8
+CONFIRM_TIMEOUT = 10
+
+# How send_single_message opens a chat
+NAVIGATION_FULL = 'full'      # driver.get() of the /send URL, reloading the whole app
+NAVIGATION_IN_APP = 'in_app'  # click a chat link inside the loaded app, full load as fallback
+# In-app switching relies on WhatsApp Web routing an injected chat link, which
+# is only verified against the local fake; opt in with WHATSAPP_NAVIGATION=in_app
+NAVIGATION = os.environ.get('WHATSAPP_NAVIGATION', NAVIGATION_FULL)
+
+# WhatsApp Web routes clicks on these links to the chat without reloading
+IN_APP_CHAT_LINK = "https://api.whatsapp.com/send?phone={phone}"
+# Give up on in-app switching after this many failures in a row
+MAX_IN_APP_FAILURES = 3
+
+# Marks the open chat panel as stale, then clicks a chat link inside the app
+OPEN_CHAT_IN_APP_JS = """
+var main = document.getElementById('main');
+if (main) { main.setAttribute('data-wb-previous', '1'); }
+var link = document.createElement('a');
+link.href = arguments[0];
+link.style.display = 'none';
+document.body.appendChild(link);
+link.click();
+link.remove();
+"""
+
+# Types text into the composer the way a paste would (keeps emoji and newlines)
+INSERT_TEXT_JS = """
+arguments[0].focus();
+document.execCommand('insertText', false, arguments[1]);
+"""
+
+# True once the composer holds the message: any raw text (even whitespace) or an
+# emoji, which the composer shows as an image
+COMPOSER_FILLED_JS = "return arguments[0].textContent.length > 0 || !!arguments[0].querySelector('img');"
+
+# Liveness probe: one round trip, true while the logged-in app is loaded
+PROBE_JS = "return !!document.getElementById('pane-side');"
+# A session seen working this recently isn't re-checked before the next send
+READY_CHECK_TTL = 30.0
+
+# Messages whose own bubble is watched for at once.  Bubbles are matched by
+# content anywhere in the page, so message N keeps confirming while the chat
+# for N+1 opens; beyond this many (or when a page load discards the watchers)
+# the oldest is left to the chat list ticks instead.  send_bulk_messages with
+# 1 confirms each send before moving on.  A message confirmed neither way fails
+# as FAILURE_UNCONFIRMED and is not retried, since it may have been sent.
+PIPELINE_DEPTH = 4
+# Seconds a message left to the chat list ticks may take to show one
+RECEIPT_CONFIRM_TIMEOUT = 60
+
+# Leading letters and digits of a message looked for in its bubble (long
+# messages are shown cut short behind "Read more")
+CONFIRM_MATCH_CHARS = 40
+
+# Watches for the bubble of the message about to be sent: an outgoing bubble
+# added anywhere in the page whose letters and digits start with the message's
+# (emoji and punctuation may be rendered as images, so they are ignored)
+WATCH_CONFIRMATION_JS = """
+var token = arguments[0];
+var strip = function (text) { return (text || '').replace(/[^\\p{L}\\p{N}]/gu, ''); };
+var expected = strip(arguments[1]).slice(0, arguments[2]);
+var confirmed = window.__wbConfirmed || (window.__wbConfirmed = {});
+var observers = window.__wbObservers || (window.__wbObservers = {});
+var selector = "div[class*='message-out']";
+var armed = Date.now();
+function isOurs(node) {
+  var element = node.nodeType === 1 ? node : node.parentElement;
+  if (!element) { return false; }
+  var bubble = element.closest(selector);
+  var bubbles = bubble ? [bubble] : element.querySelectorAll(selector);
+  for (var i = 0; i < bubbles.length; i++) {
+    if (strip(bubbles[i].textContent).indexOf(expected) !== -1) { return true; }
+  }
+  return false;
+}
+var observer = new MutationObserver(function (mutations) {
+  for (var i = 0; i < mutations.length; i++) {
+    for (var j = 0; j < mutations[i].addedNodes.length; j++) {
+      if (isOurs(mutations[i].addedNodes[j])) {
+        confirmed[token] = Date.now() - armed;
+        observer.disconnect();
+        delete observers[token];
+        return;
+      }
+    }
+  }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+observers[token] = observer;
+"""
+
+# {token: milliseconds to confirm} for watched sends seen confirmed; stops
+# watching the tokens given up on
+COLLECT_CONFIRMATIONS_JS = """
+var confirmed = window.__wbConfirmed || {};
+var observers = window.__wbObservers || {};
+var result = {};
+arguments[0].forEach(function (token) {
+  if (token in confirmed) { result[token] = confirmed[token]; delete confirmed[token]; }
+});
+arguments[1].forEach(function (token) {
+  if (observers[token]) { observers[token].disconnect(); delete observers[token]; }
+});
+return result;
+"""
+
+
+class PendingConfirmation:
+    """A message that was sent (Enter pressed) but whose bubble wasn't seen yet"""
+
+    __slots__ = ('token', 'phone', 'context', 'deadline', 'span', 'success', 'failure', 'error')
+
+    def __init__(self, token, phone, context, deadline, span):
+        self.token = token
+        self.phone = phone
+        self.context = context  # Whatever the caller passed to submit_message
+        self.deadline = deadline
+        self.span = span
+        self.success = None
+        self.failure = None
+        self.error = None
+
+    def resolve(self, success, failure=None, error=None):
+        self.success = success
+        self.failure = failure
+        self.error = error
+        self.span.end(error=not success)
 
 class WhatsAppSender:
-    def __init__(self):
+    def __init__(self, phone_normalizer=None, profile_dir=None, base_url=WHATSAPP_WEB_URL, timing=None,
+                 navigation=NAVIGATION, driver_resolver=None, metrics=None, pipeline_depth=PIPELINE_DEPTH):
         self.driver = None
         self.is_initialized = False
+        self.phone_normalizer = phone_normalizer or PhoneNormalizer()
+        # Each Chrome profile holds its own WhatsApp Web login
+        self.profile_dir = profile_dir or os.path.join(os.getcwd(), "User_Data")
+        self.base_url = base_url.rstrip('/')
+        # Learns page latency to size waits; also owns the anti-abuse pacing floor
+        self.timing = timing or AdaptiveTiming()
+        self.navigation = navigation
+        self.last_ready_at = None  # time.monotonic() when the session last proved usable
+        # Shared by all sessions so chromedriver is looked up once per Chrome version
+        self.driver_resolver = driver_resolver or default_resolver()
+        # Per-stage latency histograms, shared by all sessions
+        self.metrics = metrics or default_metrics()
+        self.in_app_failures = 0  # In-app switches in a row that needed a full page load
+        self.last_error = None  # Why the last send_single_message failed
+        self.last_failure = None  # Its failure class (FAILURE_* in core.retry_queue)
+        self.pipeline_depth = pipeline_depth
+        self.unconfirmed = collections.deque()  # PendingConfirmation, oldest first
+        self.awaiting_receipt = []  # PendingConfirmation whose bubble is no longer watched for
+        self.resolved = []  # PendingConfirmation settled but not yet taken by the caller
+        self._next_token = 0
+        # Sent / delivered / read ticks, swept from the chat list between sends
+        self.receipts = ReceiptTracker()
+        self.receipts.receipt_callback = self._on_receipt
+        self.receipt_callback = None  # See set_receipt_callback()
         
     def initialize_driver(self):
         """Initialize the Chrome driver for WhatsApp Web"""
+        span = self.metrics.span('init.total')
+        success = self._initialize_driver()
+        span.end(error=not success)
+        return success
+
+    def _initialize_driver(self):
         try:
             # Setup Chrome
-            user_data_dir = os.path.join(os.getcwd(), "User_Data")
+            user_data_dir = self.profile_dir
             if not os.path.exists(user_data_dir):
                 os.makedirs(user_data_dir)
 
@@ -33,25 +224,47 @@ class WhatsAppSender:
             options.add_experimental_option("excludeSwitches", ["enable-automation"])
             options.add_experimental_option('useAutomationExtension', False)
 
-            # Try to initialize driver with better error handling
+            # Cached, version-matched chromedriver; None lets selenium find one itself
+            with self.metrics.span('init.resolve_driver'):
+                driver_path = self.driver_resolver.resolve()
+            offline = self.driver_resolver.offline
+            if offline and not driver_path:
+                # Selenium's own lookup would download a driver
+                print("❌ No local ChromeDriver found while offline: set WHATSAPP_CHROMEDRIVER_PATH "
+                      "or put chromedriver on PATH")
+                return False
+            span = self.metrics.span('init.start_browser')
             try:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=options)
+                if driver_path:
+                    self.driver = webdriver.Chrome(service=Service(driver_path), options=options)
+                else:
+                    self.driver = webdriver.Chrome(options=options)
             except Exception as e:
                 print(f"ChromeDriver initialization failed: {e}")
-                # Fallback: try without ChromeDriverManager
+                if not driver_path:
+                    span.end(error=True)
+                    return False
+                # The cached driver may no longer match Chrome: forget it and let selenium try
+                self.driver_resolver.invalidate(driver_path)
+                if offline:
+                    span.end(error=True)
+                    return False
                 try:
                     self.driver = webdriver.Chrome(options=options)
                 except Exception as e2:
                     print(f"Fallback Chrome initialization also failed: {e2}")
+                    span.end(error=True)
                     return False
+            span.end()
 
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            self.driver.get("https://web.whatsapp.com/")
+            with self.metrics.span('init.load_app'):
+                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                self.driver.get(self.base_url + "/")
             
             print("🔒 Please scan the QR code in the browser window...")
             
             # Wait for QR code to be scanned with multiple conditions
+            span = self.metrics.span('init.login')
             try:
                 # Wait for either the side panel (logged in) or QR code element
                 WebDriverWait(self.driver, 120).until(
@@ -62,20 +275,26 @@ class WhatsAppSender:
                 
                 # Check if we're actually logged in by looking for the side panel
                 if self.driver.find_elements(By.XPATH, "//div[@id='pane-side']"):
+                    span.end()
+                    self._mark_logged_in(True)
                     self.is_initialized = True
                     print("✅ WhatsApp Web is ready!")
                     return True
                 else:
                     print("⏳ QR code detected, waiting for scan...")
+                    self._mark_logged_in(False)
                     # Wait additional time for login to complete
                     WebDriverWait(self.driver, 60).until(
                         EC.presence_of_element_located((By.XPATH, "//div[@id='pane-side']"))
                     )
+                    span.end()
+                    self._mark_logged_in(True)
                     self.is_initialized = True
                     print("✅ WhatsApp Web is ready!")
                     return True
                     
             except Exception as e:
+                span.end(error=True)
                 print(f"❌ Failed to detect WhatsApp login: {e}")
                 return False
             
@@ -83,6 +302,21 @@ class WhatsAppSender:
             print(f"❌ Failed to initialize driver: {e}")
             return False
 
+    def logged_in_before(self):
+        """True if this profile was logged in when last used, so starting it needs no QR scan"""
+        return os.path.exists(os.path.join(self.profile_dir, LOGIN_MARKER_FILE))
+
+    def _mark_logged_in(self, logged_in):
+        marker = os.path.join(self.profile_dir, LOGIN_MARKER_FILE)
+        try:
+            if logged_in:
+                with open(marker, 'w', encoding='utf-8') as f:
+                    f.write(time.strftime('%Y-%m-%d %H:%M:%S') + "\n")
+            elif os.path.exists(marker):
+                os.remove(marker)
+        except OSError as e:
+            print(f"⚠️ Could not update the login marker: {str(e)}")
+
     def check_whatsapp_ready(self):
         """Check if WhatsApp Web is ready to send messages"""
         if not self.driver:
@@ -91,97 +325,509 @@ class WhatsAppSender:
         try:
             # Check if we're on WhatsApp and logged in
             current_url = self.driver.current_url
-            if "web.whatsapp.com" not in current_url:
-                self.driver.get("https://web.whatsapp.com/")
-                time.sleep(3)
+            if not current_url.startswith(self.base_url):
+                self._release_watchers()  # The page load discards them
+                self.driver.get(self.base_url + "/")
+                WebDriverWait(self.driver, CHAT_OPEN_TIMEOUT).until(
+                    EC.presence_of_element_located((By.XPATH, SIDE_PANEL_XPATH))
+                )
                 
             # Check for login status
-            side_panel = self.driver.find_elements(By.XPATH, "//div[@id='pane-side']")
+            side_panel = self.driver.find_elements(By.XPATH, SIDE_PANEL_XPATH)
+            if side_panel:
+                self.last_ready_at = time.monotonic()
             return len(side_panel) > 0
         except:
             return False
 
-    def send_single_message(self, phone, message):
-        """Send a single message to a phone number"""
+    def probe(self):
+        """Cheap liveness check: one script call, no navigation"""
         if not self.driver:
-            print("❌ Driver not initialized.")
             return False
+        try:
+            alive = bool(self.driver.execute_script(PROBE_JS))
+        except Exception:
+            alive = False
+        self.last_ready_at = time.monotonic() if alive else None
+        return alive
+
+    def reconnect(self):
+        """Restart the browser on the same profile"""
+        self.close_driver()
+        return self.initialize_driver()
+
+    def _ready_recently(self):
+        return self.last_ready_at is not None and time.monotonic() - self.last_ready_at < READY_CHECK_TTL
+
+    def send_single_message(self, phone, message, pace=True, name=''):
+        """Send a single message to a phone number
+
+        Returns True once the message's own bubble showed up; on failure
+        the reason is left in last_error and its failure class in
+        last_failure (FAILURE_UNCONFIRMED if Enter was pressed but the
+        bubble never showed, which is not retried).  pace=False skips
+        the built-in minimum interval, for callers that schedule sends
+        themselves (see RateScheduler).  name is the contact's name, which
+        its chat is listed under if it is saved (for receipts).  Each stage
+        is timed into self.metrics under a 'send.' name.
+        """
+        pending = self.submit_message(phone, message, pace=pace, name=name)
+        if pending is None:
+            return False
+        with self.metrics.span('send.confirm_wait'):
+            while pending.success is None:
+                self.collect_confirmations()
+                if pending.success is None:
+                    time.sleep(self.timing.poll_interval('confirm'))
+        self.resolved.remove(pending)
+        self.last_failure = pending.failure
+        self.last_error = pending.error
+        return pending.success
+
+    def submit_message(self, phone, message, context=None, pace=True, name=''):
+        """Send a message without waiting for its confirmation
+
+        Returns a PendingConfirmation, or None when sending failed before
+        Enter was pressed (reason in last_error and last_failure).  The
+        message's own bubble is watched for inside the page, across chat
+        switches, and picked up by collect_confirmations(); past
+        pipeline_depth watchers, or when the page reloads, the oldest is
+        confirmed by its chat list ticks instead (see _on_receipt()).
+        """
+        self._next_token += 1
+        token = str(self._next_token)
+        span = self.metrics.span('send.total')
+        if not self._send_single_message(phone, message, pace, watch=token, name=name):
+            span.end(error=True)
+            return None
+        deadline = time.monotonic() + self.timing.timeout('confirm', CONFIRM_TIMEOUT)
+        pending = PendingConfirmation(token, phone, context, deadline, span)
+        self.unconfirmed.append(pending)
+        self.collect_confirmations()
+        while len(self.unconfirmed) > max(self.pipeline_depth, 1):
+            self._await_receipt(self.unconfirmed.popleft())
+        return pending
 
+    def poll_confirmations(self, keep=0):
+        """Settle submitted messages until at most `keep` remain unconfirmed
+
+        Confirmed and expired ones move to self.resolved (see
+        take_resolved()).  A message not confirmed by its deadline fails as
+        FAILURE_UNCONFIRMED: Enter was pressed, so it is not retried.
+        """
+        waited = None
+        while self.unconfirmed or self.awaiting_receipt:
+            self.collect_confirmations()
+            if len(self.unconfirmed) + len(self.awaiting_receipt) <= keep:
+                break
+            if waited is None:
+                waited = self.metrics.span('send.confirm_wait')
+            time.sleep(self.timing.poll_interval('confirm'))
+        if waited is not None:
+            waited.end()
+
+    def collect_confirmations(self):
+        """Settle the confirmed and expired submissions, without waiting
+
+        One script call collects the bubbles seen; messages left to the
+        chat list ticks are swept for when a sweep is due, and once more
+        at their deadline.
+        """
+        if self.awaiting_receipt:
+            now = time.monotonic()
+            self.sweep_receipts(force=any(now >= pending.deadline for pending in self.awaiting_receipt))
+            for pending in [p for p in self.awaiting_receipt if now >= p.deadline]:
+                print(f"❌ No confirmation for the message to {pending.phone}")
+                pending.resolve(False, FAILURE_UNCONFIRMED, "the message was not confirmed")
+                self.awaiting_receipt.remove(pending)
+                self.resolved.append(pending)
+        if not self.unconfirmed:
+            return
+        now = time.monotonic()
+        expired = [pending.token for pending in self.unconfirmed if now >= pending.deadline]
         try:
-            # Ensure WhatsApp is ready
-            if not self.check_whatsapp_ready():
-                print("❌ WhatsApp is not ready. Please ensure you're logged in.")
-                return False
+            confirmed = self.driver.execute_script(
+                COLLECT_CONFIRMATIONS_JS, [pending.token for pending in self.unconfirmed], expired)
+        except Exception as e:
+            self._expire_unconfirmed(f"{type(e).__name__}: {e}".strip())
+            return
+        for pending in list(self.unconfirmed):
+            if pending.token in confirmed:
+                seconds = confirmed[pending.token] / 1000
+                self.timing.observe('confirm', seconds)
+                self.metrics.observe('send.confirm', seconds)
+                self.last_ready_at = time.monotonic()
+                pending.resolve(True)
+                print(f"✅ Message sent to {pending.phone}")
+            elif pending.token in expired:
+                print(f"❌ No confirmation for the message to {pending.phone}")
+                self.last_ready_at = None
+                pending.resolve(False, FAILURE_UNCONFIRMED, "the message was not confirmed")
+            else:
+                continue
+            self.unconfirmed.remove(pending)
+            self.resolved.append(pending)
 
-            # Clean phone number (remove spaces, dashes, etc.)
-            clean_phone = ''.join(filter(str.isdigit, str(phone)))
-            if not clean_phone:
-                print(f"❌ Invalid phone number: {phone}")
-                return False
+    def sweep_receipts(self, force=False):
+        """Pick up new ticks for tracked messages if a sweep is due (one script call)"""
+        if not self.driver or not (force and len(self.receipts) or self.receipts.due()):
+            return 0
+        try:
+            with self.metrics.span('send.receipt_sweep'):
+                return self.receipts.sweep(self.driver)
+        except Exception as e:
+            print(f"⚠️ Could not read message receipts: {str(e)}")
+            return 0
 
-            encoded = urllib.parse.quote(message)
-            url = f"https://web.whatsapp.com/send?phone={phone}&text={encoded}"
-            self.driver.get(url)
+    def set_receipt_callback(self, callback):
+        """Report receipt changes as callback(phone, state)"""
+        self.receipt_callback = callback
 
-            # Wait for potential overlay
-            time.sleep(3)
-            try:
-                close_btns = self.driver.find_elements(By.XPATH, "//div[@role='dialog']//button")
-                for btn in close_btns:
-                    try:
-                        btn.click()
-                        print(f"ℹ️ Closed a popup before sending to {phone}")
-                    except:
-                        pass
-            except:
-                pass
+    def _on_receipt(self, phone, state):
+        # A tick in the chat list confirms a message whose bubble went unseen
+        if state != RECEIPT_PENDING:
+            for pending in [p for p in self.awaiting_receipt if p.phone == phone]:
+                print(f"✅ Message sent to {phone} (seen in the chat list)")
+                pending.resolve(True)
+                self.awaiting_receipt.remove(pending)
+                self.resolved.append(pending)
+        if self.receipt_callback:
+            self.receipt_callback(phone, state)
 
-            # Wait until message input box appears
-            msg_box = WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located(
-                    (By.XPATH, "//footer//div[@contenteditable='true' and @data-tab]")
-                )
-            )
+    def _await_receipt(self, pending):
+        """Stop watching for a message's bubble and wait for its chat list tick"""
+        pending.deadline = time.monotonic() + RECEIPT_CONFIRM_TIMEOUT
+        self.awaiting_receipt.append(pending)
 
-            # Focus and send message
-            self.driver.execute_script("arguments[0].focus();", msg_box)
-            time.sleep(0.5)
-            msg_box.send_keys(Keys.ENTER)
+    def _release_watchers(self):
+        """Collect what is confirmed before a page load discards the bubble watchers"""
+        self.collect_confirmations()
+        while self.unconfirmed:
+            self._await_receipt(self.unconfirmed.popleft())
 
-            # Wait until message is visible in chat
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[contains(@class,'message-out')]"))
-            )
+    def _expire_unconfirmed(self, error):
+        self.last_ready_at = None
+        for pending in list(self.unconfirmed) + self.awaiting_receipt:
+            pending.resolve(False, FAILURE_UNCONFIRMED, error)
+            self.resolved.append(pending)
+        self.unconfirmed.clear()
+        self.awaiting_receipt = []
+
+    def take_resolved(self):
+        """PendingConfirmations settled since the last call"""
+        resolved, self.resolved = self.resolved, []
+        return resolved
+
+    def _send_single_message(self, phone, message, pace, watch, name=''):
+        self.last_error = None
+        self.last_failure = None
+        if not self.driver:
+            print("❌ Driver not initialized.")
+            return self._fail(FAILURE_DRIVER_CRASH, "driver not initialized")
+
+        # Reject invalid numbers before touching the browser (cached lookup)
+        e164, reason = self.phone_normalizer.parse(phone)
+        if e164 is None:
+            print(f"❌ Invalid phone number: {phone} ({reason})")
+            return self._fail(FAILURE_INVALID_NUMBER, f"invalid number: {reason}")
+
+        try:
+            # Ensure WhatsApp is ready, unless a recent send or probe showed it is
+            if not self._ready_recently():
+                with self.metrics.span('send.ready_check'):
+                    ready = self.check_whatsapp_ready()
+                if not ready:
+                    print("❌ WhatsApp is not ready. Please ensure you're logged in.")
+                    return self._fail(self._diagnose_page(), "WhatsApp not ready")
 
-            print(f"✅ Message sent to {phone}")
-            time.sleep(2)
+            # Anti-abuse pacing: the only deliberate delay in the send path
+            if pace:
+                with self.metrics.span('send.pace'):
+                    self.timing.pace()
+
+            msg_box = None
+            if self.navigation == NAVIGATION_IN_APP:
+                msg_box = self._open_chat_in_app(e164, phone)
+                if msg_box is not None:
+                    with self.metrics.span('send.insert_text'):
+                        self.driver.execute_script(INSERT_TEXT_JS, msg_box, message)
+
+            if msg_box is None:
+                encoded = urllib.parse.quote(message)
+                url = f"{self.base_url}/send?phone={e164[1:]}&text={encoded}"
+                started = time.monotonic()
+                self._release_watchers()  # The page load discards them
+                with self.metrics.span('send.page_load'):
+                    self.driver.get(url)
+
+                with self.metrics.span('send.wait_chat'):
+                    msg_box = self._wait_for_chat(phone)
+                self.timing.observe('open_chat', time.monotonic() - started)
+
+            # Wait for the composer to hold the text rather than sleeping
+            with self.metrics.span('send.compose_wait'):
+                WebDriverWait(self.driver, CONFIRM_TIMEOUT, poll_frequency=0.05).until(
+                    lambda driver: driver.execute_script(COMPOSER_FILLED_JS, msg_box)
+                )
+
+            # Watch for this message's own bubble, so a chat's history rendering late can't confirm it
+            with self.metrics.span('send.submit'):
+                self.driver.execute_script(WATCH_CONFIRMATION_JS, watch, message, CONFIRM_MATCH_CHARS)
+                self.driver.execute_script("arguments[0].focus();", msg_box)
+                msg_box.send_keys(Keys.ENTER)
+            self.receipts.track(phone, message, name)
+            return True  # Confirmed by collect_confirmations()
 
         except Exception as e:
             print(f"❌ Error sending to {phone}: {e}")
+            failure = classify_exception(e)
+            if failure == FAILURE_TIMEOUT:
+                # Find out what was actually in the way
+                failure = self._diagnose_page(default=FAILURE_TIMEOUT)
+            return self._fail(failure, f"{type(e).__name__}: {e}".strip())
+
+    def _fail(self, failure, error):
+        if failure != FAILURE_INVALID_NUMBER:
+            self.last_ready_at = None  # Check the session again before the next send
+        self.last_failure = failure
+        self.last_error = error
+        return False
+
+    def _diagnose_page(self, default=FAILURE_LOGGED_OUT):
+        """Classify why the page isn't usable: crashed browser, login screen or popup"""
+        try:
+            if self.driver.find_elements(By.XPATH, LOGGED_OUT_XPATH):
+                return FAILURE_LOGGED_OUT
+            if self.driver.find_elements(By.XPATH, DIALOG_XPATH):
+                return FAILURE_POPUP
+            return default
+        except Exception as e:
+            return FAILURE_DRIVER_CRASH if classify_exception(e) == FAILURE_DRIVER_CRASH else default
+
+    def _open_chat_in_app(self, e164, phone):
+        """Switch to a chat inside the already loaded app
+
+        Returns the message box, or None when the switch didn't happen and
+        the caller should fall back to a full page load.  SendFailure
+        (e.g. an invalid number) is passed on to the caller.
+        """
+        if not self.driver.find_elements(By.XPATH, SIDE_PANEL_XPATH):
+            return None  # App not loaded yet
+        started = time.monotonic()
+        span = self.metrics.span('send.switch_chat')
+        try:
+            self.driver.execute_script(OPEN_CHAT_IN_APP_JS, IN_APP_CHAT_LINK.format(phone=e164[1:]))
+            msg_box = self._wait_for_chat(phone, FRESH_MESSAGE_BOX_XPATH, 'switch_chat', CHAT_SWITCH_TIMEOUT)
+        except SendFailure:
+            span.end(error=True)
+            raise
+        except Exception as e:
+            span.end(error=True)
+            if classify_exception(e) == FAILURE_DRIVER_CRASH:
+                raise
+            self.in_app_failures += 1
+            print(f"ℹ️ In-app chat switch failed for {phone}, reloading instead: {e}")
+            if self.in_app_failures >= MAX_IN_APP_FAILURES:
+                print("ℹ️ In-app chat switching keeps failing, using full page loads from now on")
+                self.navigation = NAVIGATION_FULL
+            return None
+        span.end()
+        self.in_app_failures = 0
+        self.timing.observe('switch_chat', time.monotonic() - started)
+        return msg_box
+
+    def _wait_for_chat(self, phone, box_xpath=MESSAGE_BOX_XPATH, stage='open_chat', ceiling=CHAT_OPEN_TIMEOUT):
+        """Wait until the chat composer is ready, closing popups on the way
+
+        Returns the message box element.  Raises SendFailure as soon as the
+        page shows an invalid-number dialog, the login screen, or a popup
+        that keeps coming back, instead of waiting for the timeout.
+        """
+        deadline = time.monotonic() + self.timing.timeout(stage, ceiling)
+        poll = self.timing.poll_interval(stage)
+        popup_rounds = 0
+        while True:
+            remaining = max(0.1, deadline - time.monotonic())
+            WebDriverWait(self.driver, remaining, poll_frequency=poll).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete" and (
+                    driver.find_elements(By.XPATH, box_xpath) or
+                    driver.find_elements(By.XPATH, DIALOG_BUTTON_XPATH) or
+                    driver.find_elements(By.XPATH, LOGGED_OUT_XPATH)
+                )
+            )
+            boxes = self.driver.find_elements(By.XPATH, box_xpath)
+            if boxes:
+                return boxes[0]
+            if self.driver.find_elements(By.XPATH, LOGGED_OUT_XPATH):
+                raise SendFailure(FAILURE_LOGGED_OUT, "WhatsApp Web is showing the login screen")
+
+            # A popup with buttons is in the way
+            dialog_text = " ".join(d.text for d in self.driver.find_elements(By.XPATH, DIALOG_XPATH))
+            if "invalid" in dialog_text.lower():
+                print(f"❌ WhatsApp reports an invalid number: {phone}")
+                raise SendFailure(FAILURE_INVALID_NUMBER, "invalid number: rejected by WhatsApp")
+            popup_rounds += 1
+            if popup_rounds > MAX_POPUP_ROUNDS:
+                raise SendFailure(FAILURE_POPUP, f"popup keeps blocking the chat: {dialog_text[:80]}")
+            with self.metrics.span('send.popup_sweep'):
+                for btn in self.driver.find_elements(By.XPATH, DIALOG_BUTTON_XPATH):
+                    try:
+                        btn.click()
+                        print(f"ℹ️ Closed a popup before sending to {phone}")
+                    except:
+                        pass
+                try:
+                    WebDriverWait(self.driver, 2, poll_frequency=0.05).until(
+                        lambda driver: not driver.find_elements(By.XPATH, DIALOG_BUTTON_XPATH)
+                    )
+                except Exception:
+                    pass
+            if time.monotonic() >= deadline:
+                raise SendFailure(FAILURE_POPUP, f"popup blocked the chat with {phone}")
 
-    def send_bulk_messages(self, contacts_with_messages, progress_callback=None):
-        """Send messages to multiple contacts with progress tracking"""
+    def send_bulk_messages(self, contacts_with_messages, progress_callback=None, result_callback=None,
+                           scheduler=None, retry_queue=None):
+        """Send messages to multiple contacts with progress tracking
+
+        result_callback, if given, is called as (phone, success, reason)
+        once per contact, after its final attempt, with last_failure set to
+        its failure class.  With a scheduler, each
+        send waits for scheduler.acquire() instead of the fixed pacing
+        interval.  Failed sends are classified and, if their policy allows,
+        deferred to a retry queue that is drained after the main pass.
+        Receipts of earlier messages are swept between sends, never waited
+        for (see set_receipt_callback()).  Once the session can't be
+        restarted, every contact left fails at once instead of waiting for
+        another browser start.
+
+        Sends never wait for their confirmation: each message's bubble is
+        watched for while the next chat opens, and up to pipeline_depth
+        are outstanding before the oldest is left to its chat list tick
+        (see submit_message()); results are reported as they settle.
+        With pipeline_depth 1 each send is confirmed before the next.
+        """
         if not self.is_initialized:
             if not self.initialize_driver():
                 return 0, len(contacts_with_messages)
 
         success_count = 0
+        done = 0  # Contacts through their first attempt
         total_count = len(contacts_with_messages)
+        if retry_queue is None:
+            retry_queue = RetryQueue()
+        lost = None  # Why the session couldn't be recovered; set once, fails everyone left
 
-        for index, (phone, message, name) in enumerate(contacts_with_messages):
-            if progress_callback:
-                progress_callback(index, total_count, f"Sending to {name}...")
+        def submit(index, phone, message, name, first):
+            if scheduler:
+                with self.metrics.span('send.schedule_wait'):
+                    scheduler.acquire()
+            pending = self.submit_message(phone, message, (index, message, name, first), pace=scheduler is None,
+                                          name=name)
+            if pending is None:
+                account(index, phone, message, name, first, False)
+            if self.pipeline_depth <= 1:
+                self.poll_confirmations()
+            finish_confirmed()
 
-            if self.send_single_message(phone, message):
+        def settle(index, phone, message, name, success):
+            """Report a final result or defer a retry; returns True if final"""
+            if not success and lost is None and retry_queue.push(index, (phone, message, name), self.last_failure):
+                print(f"↩️ Will retry {phone} later ({self.last_failure})")
+                return False
+            if result_callback:
+                result_callback(phone, success, self.last_error)
+            return True
+
+        def account(index, phone, message, name, first, success):
+            """Account for an attempt whose outcome is known"""
+            nonlocal success_count, done, lost
+            if success:
                 success_count += 1
+            settle(index, phone, message, name, success)
+            if not first:
+                return
+            if not success and self.last_failure == FAILURE_DRIVER_CRASH and lost is None:
+                # Everyone after this would fail too: restart the browser now
+                if not self._recover(FAILURE_DRIVER_CRASH):
+                    lost = "could not restart the browser"
+                    print("❌ Could not restart the browser, failing the remaining contacts")
+            done += 1
+            if progress_callback:
+                progress_callback(done, total_count, f"Sent to {name}" if success else f"Failed: {name}")
 
+        def finish_confirmed():
+            while self.resolved:
+                for pending in self.take_resolved():
+                    index, message, name, first = pending.context
+                    self.last_failure = pending.failure
+                    self.last_error = pending.error
+                    account(index, pending.phone, message, name, first, pending.success)
+
+        for index, (phone, message, name) in enumerate(contacts_with_messages):
+            if lost is not None:
+                self._fail(FAILURE_DRIVER_CRASH, lost)
+                account(index, phone, message, name, True, False)
+                continue
             if progress_callback:
-                progress_callback(index + 1, total_count, f"Sent to {name}")
+                progress_callback(done, total_count, f"Sending to {name}...")
+            submit(index, phone, message, name, True)
+            self.sweep_receipts()
+
+        # The campaign is through: wait for what is still unconfirmed
+        self.poll_confirmations()
+        finish_confirmed()
 
+        # Deferred retries, after everyone got a first attempt
+        while len(retry_queue):
+            wait = retry_queue.next_ready_in()
+            if wait > 0 and lost is None:
+                time.sleep(wait)
+            index, (phone, message, name), failure = retry_queue.pop()
+            if lost is None:
+                if progress_callback:
+                    progress_callback(total_count, total_count,
+                                      f"Retrying {name} ({failure}, {len(retry_queue)} more queued)...")
+                if not self._recover(failure):
+                    lost = "could not recover the WhatsApp session"
+                    print("❌ Could not recover the WhatsApp session, failing the remaining retries")
+            if lost is not None:
+                self._fail(failure, lost)
+                settle(index, phone, message, name, False)
+                continue
+            if scheduler:
+                scheduler.enqueue()
+            submit(index, phone, message, name, False)
+            self.sweep_receipts()
+            if not len(retry_queue):
+                self.poll_confirmations()
+                finish_confirmed()
+
+        self.sweep_receipts(force=True)
         return success_count, total_count
 
+    def _recover(self, failure):
+        """Get the session usable again before retrying a failure class"""
+        with self.metrics.span('send.recover'):
+            return self._recover_session(failure)
+
+    def _recover_session(self, failure):
+        self._release_watchers()  # A restart would discard them
+        if failure in (FAILURE_DRIVER_CRASH, FAILURE_LOGGED_OUT) and self.check_whatsapp_ready():
+            return True  # Already recovered for an earlier retry
+        if failure == FAILURE_DRIVER_CRASH:
+            print("🔄 Browser session lost, restarting it...")
+            self.close_driver()
+            return self.initialize_driver()
+        if failure == FAILURE_LOGGED_OUT:
+            print("🔒 WhatsApp Web logged out, waiting for the QR code to be scanned again...")
+            self.close_driver()
+            return self.initialize_driver()
+        return True
+
     def close_driver(self):
         """Close the browser driver"""
+        if self.unconfirmed or self.awaiting_receipt:
+            self._expire_unconfirmed("browser closed before the message was confirmed")
         if self.driver:
             try:
                 self.driver.quit()
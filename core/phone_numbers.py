@@ -0,0 +1,140 @@
+# core/phone_numbers.py
+import os
+
+# Country calling code used for numbers written in national format,
+# e.g. "20" turns "0100 123 4567" into "+201001234567"
+DEFAULT_COUNTRY_CODE = os.environ.get('WHATSAPP_DEFAULT_COUNTRY_CODE', '')
+
+# E.164 allows at most 15 digits; anything under 8 can't be a mobile number
+MIN_DIGITS = 8
+MAX_DIGITS = 15
+# Longest number we still treat as national when a default country is set
+MAX_NATIONAL_DIGITS = 10
+
+# Characters people use to format phone numbers
+SEPARATOR_CHARS = ' -.()/\t'
+SEPARATORS = set(SEPARATOR_CHARS)
+
+# Validation failure reasons
+INVALID_EMPTY = 'empty'
+INVALID_CHARACTERS = 'invalid characters'
+INVALID_TOO_SHORT = 'too short'
+INVALID_TOO_LONG = 'too long'
+INVALID_NO_COUNTRY = 'missing country code'
+
+
+def phone_key(phone):
+    """Return a normalized lookup key for a phone number
+
+    "+20 100-123", "0020100123" and "20100123" all map to "20100123".
+    Returns an empty string when the value holds no digits.
+    """
+    digits = ''.join(ch for ch in str(phone) if ch.isdigit())
+    if digits.startswith('00'):
+        digits = digits[2:]  # International dialing prefix
+    return digits
+
+
+class PhoneNormalizer:
+    """Normalize and validate phone numbers into E.164 ("+201001234567")
+
+    Results are cached per raw value, so normalizing a whole contact column
+    costs one parse per distinct number and repeat lookups at send time are
+    dictionary hits.
+    """
+
+    def __init__(self, default_country_code=None, cache_size=500000):
+        if default_country_code is None:
+            default_country_code = DEFAULT_COUNTRY_CODE
+        self.default_country_code = ''.join(ch for ch in str(default_country_code) if ch.isdigit())
+        self.cache_size = cache_size
+        self._cache = {}
+
+    def set_default_country_code(self, country_code):
+        """Change the default country code, invalidating cached results"""
+        self.default_country_code = ''.join(ch for ch in str(country_code or '') if ch.isdigit())
+        self._cache.clear()
+
+    def parse(self, phone):
+        """Return (e164, reason); e164 is None and reason set when invalid"""
+        raw = '' if phone is None else str(phone)
+        result = self._cache.get(raw)
+        if result is None:
+            result = self._parse(raw)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[raw] = result
+        return result
+
+    def _parse(self, raw):
+        text = raw.strip()
+        if not text:
+            return None, INVALID_EMPTY
+
+        # The '+' may follow an opening bracket, as in "(+20) 100 123 4567"
+        lead = text.lstrip(SEPARATOR_CHARS)
+        international = lead.startswith('+')
+        if international:
+            text = lead[1:]
+        digits = []
+        for ch in text:
+            if ch.isdigit():
+                digits.append(ch)
+            elif ch not in SEPARATORS:
+                return None, INVALID_CHARACTERS
+        digits = ''.join(digits)
+        if not digits:
+            return None, INVALID_EMPTY
+
+        if not international:
+            if digits.startswith('00'):
+                digits = digits[2:]  # International dialing prefix
+            elif digits.startswith('0'):
+                # National trunk prefix: needs the default country
+                if not self.default_country_code:
+                    return None, INVALID_NO_COUNTRY
+                digits = self.default_country_code + digits.lstrip('0')
+            elif (self.default_country_code and len(digits) <= MAX_NATIONAL_DIGITS
+                    and not digits.startswith(self.default_country_code)):
+                digits = self.default_country_code + digits
+
+        if digits.startswith('0'):
+            return None, INVALID_NO_COUNTRY
+        if len(digits) < MIN_DIGITS:
+            return None, INVALID_TOO_SHORT
+        if len(digits) > MAX_DIGITS:
+            return None, INVALID_TOO_LONG
+        return '+' + digits, None
+
+    def normalize(self, phone):
+        """Return the E.164 form of phone, or None if it is invalid"""
+        return self.parse(phone)[0]
+
+    def dedup_key(self, phone):
+        """Key under which duplicates of a number collide
+
+        With a default country code, numbers are compared by their E.164
+        digits, so "0100 123 4567" matches "+20 100 123 4567" just as it
+        will at send time; otherwise, or if the number doesn't parse, by
+        phone_key().
+        """
+        if self.default_country_code:
+            e164 = self.parse(phone)[0]
+            if e164 is not None:
+                return e164[1:]
+        return phone_key(phone)
+
+    def normalize_many(self, phones):
+        """Normalize a whole column, returning a list of E.164 numbers or None"""
+        parse = self.parse
+        return [parse(phone)[0] for phone in phones]
+
+    def validate_many(self, phones):
+        """Return (index, raw_phone, reason) for every invalid number in phones"""
+        parse = self.parse
+        invalid = []
+        for index, phone in enumerate(phones):
+            e164, reason = parse(phone)
+            if e164 is None:
+                invalid.append((index, phone, reason))
+        return invalid
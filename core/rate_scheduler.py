@@ -0,0 +1,180 @@
+# core/rate_scheduler.py
+import collections
+import datetime
+import random
+import threading
+import time
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+class TokenBucket:
+    """Classic token bucket: up to burst sends at once, refilled at rate per second"""
+
+    def __init__(self, rate, burst, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self.tokens = float(burst)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self):
+        """Take a token; returns 0 on success or the seconds until one is available"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateScheduler:
+    """Decides when the next message may go out
+
+    Combines a token bucket (burst and sustained rate), rolling hourly and
+    daily caps, random jitter and quiet hours.  Senders call acquire()
+    before every message; it returns as soon as the limits allow, so the
+    pipeline runs right up to the configured rate instead of idling on
+    fixed delays.
+    """
+
+    def __init__(self, rate_per_minute=12, burst=3, hourly_cap=None, daily_cap=None,
+                 jitter=0.25, quiet_hours=None, clock=time.time, sleep=time.sleep):
+        self.rate_per_minute = rate_per_minute
+        self.hourly_cap = hourly_cap
+        self.daily_cap = daily_cap
+        # Extra random wait, as a fraction of the sustained send interval
+        self.jitter = jitter
+        # (start_hour, end_hour) in local time, e.g. (22, 8); None disables
+        self.quiet_hours = quiet_hours
+        self._clock = clock
+        self._sleep = sleep
+        self._bucket = TokenBucket(rate_per_minute / 60.0, burst, clock=clock)
+        self._sent = collections.deque()  # Send times within the last day
+        self._queued = 0
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self.wait_callback = None  # Called as (seconds, reason) before long waits
+
+    @property
+    def queue_depth(self):
+        """Messages handed to the scheduler that haven't been released yet"""
+        return self._queued
+
+    @property
+    def waiting(self):
+        """Senders currently blocked in acquire()"""
+        return self._waiting
+
+    def enqueue(self, count=1):
+        with self._lock:
+            self._queued += count
+
+    def discard(self, count=1):
+        """Forget queued messages that will not be sent"""
+        with self._lock:
+            self._queued = max(0, self._queued - count)
+
+    def seed(self, send_times):
+        """Account for sends made before this scheduler existed (e.g. from the journal)"""
+        cutoff = self._clock() - DAY
+        with self._lock:
+            for sent_at in sorted(send_times):
+                if sent_at > cutoff:
+                    self._sent.append(sent_at)
+
+    def current_rate(self):
+        """Messages released in the last minute"""
+        cutoff = self._clock() - 60
+        with self._lock:
+            return sum(1 for sent_at in self._sent if sent_at > cutoff)
+
+    def status(self):
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            last_hour = sum(1 for sent_at in self._sent if sent_at > now - HOUR)
+            return {
+                'rate_per_minute': sum(1 for sent_at in self._sent if sent_at > now - 60),
+                'queue_depth': self._queued,
+                'waiting': self._waiting,
+                'tokens': round(self._bucket.tokens, 2),
+                'sent_last_hour': last_hour,
+                'sent_last_day': len(self._sent),
+            }
+
+    def _expire(self, now):
+        while self._sent and self._sent[0] <= now - DAY:
+            self._sent.popleft()
+
+    def _quiet_wait(self, now):
+        """Seconds until quiet hours end, or 0 outside them"""
+        if not self.quiet_hours:
+            return 0.0
+        start, end = self.quiet_hours
+        local = datetime.datetime.fromtimestamp(now)
+        hour = local.hour + local.minute / 60 + local.second / 3600
+        if start <= end:
+            quiet = start <= hour < end
+        else:
+            quiet = hour >= start or hour < end  # Window wraps past midnight
+        if not quiet:
+            return 0.0
+        remaining = (end - hour) % 24
+        return remaining * HOUR
+
+    def _cap_wait(self, now):
+        """Seconds until the hourly and daily caps allow another send"""
+        wait = 0.0
+        if self.daily_cap is not None and len(self._sent) >= self.daily_cap:
+            wait = max(wait, self._sent[len(self._sent) - self.daily_cap] + DAY - now)
+        if self.hourly_cap is not None:
+            recent = [sent_at for sent_at in self._sent if sent_at > now - HOUR]
+            if len(recent) >= self.hourly_cap:
+                wait = max(wait, recent[len(recent) - self.hourly_cap] + HOUR - now)
+        return wait
+
+    def next_delay(self):
+        """Seconds to wait before the next send, and why (0 means go now)
+
+        Takes a token when it returns 0.
+        """
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            quiet = self._quiet_wait(now)
+            if quiet > 0:
+                return quiet, "quiet hours"
+            cap = self._cap_wait(now)
+            if cap > 0:
+                return cap, "hourly/daily cap reached"
+            bucket = self._bucket.try_take()
+            if bucket > 0:
+                return bucket, "rate limit"
+            self._sent.append(now)
+            self._queued = max(0, self._queued - 1)
+            return 0.0, None
+
+    def acquire(self):
+        """Block until the next message may be sent"""
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                delay, reason = self.next_delay()
+                if delay <= 0:
+                    return True
+                if reason == "rate limit" and self.jitter:
+                    delay += random.uniform(0, self.jitter * 60.0 / self.rate_per_minute)
+                if delay > 60 and self.wait_callback:
+                    self.wait_callback(delay, reason)
+                # Re-check at least every minute so setting changes take effect
+                self._sleep(min(delay, 60))
+        finally:
+            with self._lock:
+                self._waiting -= 1
@@ -0,0 +1,147 @@
+# core/receipt_tracker.py
+import re
+import threading
+import time
+
+# Delivery states of a submitted message, in the order they can happen
+RECEIPT_PENDING = 'pending'      # Clock icon: still on this device
+RECEIPT_SENT = 'sent'            # One grey tick: reached WhatsApp's servers
+RECEIPT_DELIVERED = 'delivered'  # Two grey ticks: reached the recipient's phone
+RECEIPT_READ = 'read'            # Two blue ticks
+RECEIPT_ORDER = (RECEIPT_PENDING, RECEIPT_SENT, RECEIPT_DELIVERED, RECEIPT_READ)
+
+# Seconds between chat list sweeps
+SWEEP_INTERVAL = 15.0
+# Messages are followed this long after they were submitted
+TRACK_WINDOW = 6 * 3600.0
+# Oldest messages are dropped beyond this many
+MAX_TRACKED = 5000
+# Leading characters of the message compared with a chat's last-message preview
+PREVIEW_MATCH_CHARS = 40
+
+# Title, tick icon, its label and last-message preview of every chat in the list
+SWEEP_RECEIPTS_JS = """
+var rows = document.querySelectorAll("#pane-side [role='listitem'], #pane-side [role='row']");
+var result = [];
+for (var i = 0; i < rows.length; i++) {
+  var titles = rows[i].querySelectorAll('span[title]');
+  var icon = rows[i].querySelector("span[data-icon^='status-'], span[data-icon^='msg-']");
+  if (!titles.length || !icon) { continue; }
+  result.push([
+    titles[0].getAttribute('title'),
+    icon.getAttribute('data-icon'),
+    icon.getAttribute('aria-label') || '',
+    titles.length > 1 ? titles[titles.length - 1].getAttribute('title') : rows[i].innerText
+  ]);
+}
+return result;
+"""
+
+NON_DIGITS = re.compile(r'\D')
+
+
+def receipt_from_icon(icon, label=''):
+    """Receipt state shown by a WhatsApp Web tick icon, or None for other icons"""
+    kind = icon.split('-', 1)[-1]
+    if kind == 'time':
+        return RECEIPT_PENDING
+    if kind == 'check':
+        return RECEIPT_SENT
+    if kind == 'dblcheck':
+        return RECEIPT_READ if 'read' in label.lower() else RECEIPT_DELIVERED
+    return None
+
+
+def _preview_key(text):
+    return " ".join(text.split())[:PREVIEW_MATCH_CHARS]
+
+
+class _Tracked:
+    __slots__ = ('phone', 'name', 'preview', 'status', 'tracked_at')
+
+    def __init__(self, phone, name, preview, tracked_at):
+        self.phone = phone
+        self.name = name
+        self.preview = preview
+        self.status = RECEIPT_PENDING
+        self.tracked_at = tracked_at
+
+
+class ReceiptTracker:
+    """Follows the ticks of submitted messages without waiting for them
+
+    track() registers a message once it was submitted; sweep() reads the
+    chat list in one script call and matches each chat's title (number or
+    contact name) and last-message preview against the tracked messages,
+    so a tick is only credited to that exact message.  Every state that
+    moved forward is reported through receipt_callback(phone, state).
+    The list only shows ticks for a chat's last message, so a message is
+    followed until it is read, a newer message to the same chat replaces
+    it, or track_window passes.
+    """
+
+    def __init__(self, sweep_interval=SWEEP_INTERVAL, track_window=TRACK_WINDOW, max_tracked=MAX_TRACKED,
+                 clock=time.monotonic):
+        self.sweep_interval = sweep_interval
+        self.track_window = track_window
+        self.max_tracked = max_tracked
+        self.receipt_callback = None  # Called as (phone, state) from the sweeping thread
+        self._clock = clock
+        self._tracked = {}  # Phone digits -> _Tracked, oldest first
+        self._last_sweep = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tracked)
+
+    def track(self, phone, message, name=''):
+        """Start following a message that was just submitted to phone"""
+        digits = NON_DIGITS.sub('', phone)
+        with self._lock:
+            # Only the newest message of a chat shows its ticks in the list
+            self._tracked.pop(digits, None)
+            self._tracked[digits] = _Tracked(phone, name.strip().lower(), _preview_key(message), self._clock())
+            while len(self._tracked) > self.max_tracked:
+                del self._tracked[next(iter(self._tracked))]
+
+    def due(self):
+        """True when there is something to follow and the last sweep is old enough"""
+        return bool(self._tracked) and (
+            self._last_sweep is None or self._clock() - self._last_sweep >= self.sweep_interval)
+
+    def sweep(self, driver):
+        """Read the chat list once and report changed receipts; returns how many changed"""
+        self._last_sweep = self._clock()
+        return self.update(driver.execute_script(SWEEP_RECEIPTS_JS) or [])
+
+    def update(self, rows):
+        """Apply (title, icon, label, preview) rows from the chat list"""
+        changes = []
+        with self._lock:
+            by_name = {t.name: digits for digits, t in self._tracked.items() if t.name}
+            for title, icon, label, preview in rows:
+                state = receipt_from_icon(icon or '', label or '')
+                if state is None:
+                    continue
+                digits = NON_DIGITS.sub('', title or '')
+                tracked = self._tracked.get(digits) if len(digits) >= 7 else None
+                if tracked is None:
+                    # Saved contacts are listed under their name
+                    digits = by_name.get((title or '').strip().lower())
+                    tracked = self._tracked.get(digits) if digits else None
+                if tracked is None or _preview_key(preview or '') != tracked.preview:
+                    continue
+                if RECEIPT_ORDER.index(state) > RECEIPT_ORDER.index(tracked.status):
+                    tracked.status = state
+                    changes.append((tracked.phone, state))
+                    if state == RECEIPT_READ:
+                        del self._tracked[digits]  # Nothing left to wait for
+
+            cutoff = self._clock() - self.track_window
+            for digits in [d for d, t in self._tracked.items() if t.tracked_at < cutoff]:
+                del self._tracked[digits]
+
+        if self.receipt_callback:
+            for phone, state in changes:
+                self.receipt_callback(phone, state)
+        return len(changes)
@@ -0,0 +1,135 @@
+# core/retry_queue.py
+import heapq
+import itertools
+import random
+import time
+
+# Failure classes for a send attempt
+FAILURE_INVALID_NUMBER = 'invalid_number'
+FAILURE_TIMEOUT = 'timeout'
+FAILURE_POPUP = 'popup'
+FAILURE_LOGGED_OUT = 'logged_out'
+FAILURE_DRIVER_CRASH = 'driver_crash'
+FAILURE_UNCONFIRMED = 'unconfirmed'  # Enter was pressed, but the message's bubble never showed
+FAILURE_UNKNOWN = 'unknown'
+
+# Fragments of WebDriver error messages that mean the browser is gone
+DRIVER_CRASH_MARKERS = (
+    'invalid session id',
+    'chrome not reachable',
+    'disconnected',
+    'no such window',
+    'session deleted',
+    'target window already closed',
+    'connection refused',
+    'max retries exceeded',
+)
+
+
+class RetryPolicy:
+    """How often and how soon a failure class is retried
+
+    The n-th retry waits base_delay * factor ** (n - 1) seconds (capped at
+    max_delay) plus up to 20% random jitter.
+    """
+
+    def __init__(self, max_retries, base_delay=5.0, factor=2.0, max_delay=300.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+
+    def delay(self, retry_number):
+        delay = min(self.max_delay, self.base_delay * self.factor ** (retry_number - 1))
+        return delay * (1 + random.uniform(0, 0.2))
+
+
+DEFAULT_POLICIES = {
+    # WhatsApp won't accept the number: retrying can't help
+    FAILURE_INVALID_NUMBER: RetryPolicy(0),
+    # Slow page or network: back off and try again later
+    FAILURE_TIMEOUT: RetryPolicy(3, base_delay=30.0),
+    # Something covered the chat; usually gone on the next load
+    FAILURE_POPUP: RetryPolicy(2, base_delay=5.0),
+    # Needs the user to scan the QR code again
+    FAILURE_LOGGED_OUT: RetryPolicy(1, base_delay=60.0),
+    # Browser died: restart it, then retry
+    FAILURE_DRIVER_CRASH: RetryPolicy(2, base_delay=10.0),
+    # The message may well have gone out: a retry could send it twice
+    FAILURE_UNCONFIRMED: RetryPolicy(0),
+    FAILURE_UNKNOWN: RetryPolicy(1, base_delay=15.0),
+}
+
+
+class SendFailure(Exception):
+    """A send attempt failed for a known reason (one of the FAILURE_* classes)"""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+def classify_exception(error):
+    """Map an exception raised while sending to a failure class"""
+    if isinstance(error, SendFailure):
+        return error.kind
+    name = type(error).__name__
+    message = str(error).lower()
+    if name in ('InvalidSessionIdException', 'NoSuchWindowException') or \
+            any(marker in message for marker in DRIVER_CRASH_MARKERS):
+        return FAILURE_DRIVER_CRASH
+    if name in ('TimeoutException', 'TimeoutError'):
+        return FAILURE_TIMEOUT
+    if name == 'ElementClickInterceptedException':
+        return FAILURE_POPUP
+    return FAILURE_UNKNOWN
+
+
+class RetryQueue:
+    """Deferred retries, ordered by when each one becomes due
+
+    Failed sends are pushed here instead of being retried inline, so a
+    transient failure doesn't hold up the main pass; the queue is drained
+    after it.
+    """
+
+    def __init__(self, policies=None, clock=time.monotonic):
+        self.policies = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self._clock = clock
+        self._heap = []
+        self._order = itertools.count()
+        self._retries = {}  # key -> retries scheduled so far
+
+    def __len__(self):
+        return len(self._heap)
+
+    def should_retry(self, key, failure):
+        policy = self.policies.get(failure, self.policies[FAILURE_UNKNOWN])
+        return self._retries.get(key, 0) < policy.max_retries
+
+    def push(self, key, item, failure):
+        """Schedule a retry; returns False when the failure's policy is exhausted"""
+        if not self.should_retry(key, failure):
+            return False
+        policy = self.policies.get(failure, self.policies[FAILURE_UNKNOWN])
+        retry_number = self._retries.get(key, 0) + 1
+        self._retries[key] = retry_number
+        ready_at = self._clock() + policy.delay(retry_number)
+        heapq.heappush(self._heap, (ready_at, next(self._order), key, item, failure))
+        return True
+
+    def next_ready_in(self):
+        """Seconds until the earliest retry is due (0 if one is due now)"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
+
+    def pop(self):
+        """Remove and return (key, item, failure) for the earliest retry"""
+        _, _, key, item, failure = heapq.heappop(self._heap)
+        return key, item, failure
+
+    def retries(self, key):
+        return self._retries.get(key, 0)
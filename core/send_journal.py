@@ -0,0 +1,176 @@
+# core/send_journal.py
+import sqlite3
+import threading
+import time
+
+# Per-contact states recorded in the journal
+STATE_QUEUED = 'queued'
+STATE_SENT = 'sent'
+STATE_FAILED = 'failed'
+# Enter was pressed but the message was never seen in the chat: it may have
+# been delivered, so resuming doesn't send it again
+STATE_UNCONFIRMED = 'unconfirmed'
+# Receipts reported after a message was sent
+STATE_DELIVERED = 'delivered'
+STATE_READ = 'read'
+
+DEFAULT_JOURNAL_PATH = 'send_journal.db'
+# Campaigns unused for this long are dropped when the journal is opened
+RETENTION_SECONDS = 90 * 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    campaign TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    state TEXT NOT NULL,
+    reason TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_campaign_state ON events (campaign, state, phone);
+CREATE INDEX IF NOT EXISTS events_campaign_phone ON events (campaign, phone, id);
+CREATE INDEX IF NOT EXISTS events_state_time ON events (state, created_at);
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign TEXT PRIMARY KEY,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS campaigns_last_used ON campaigns (last_used);
+"""
+
+
+class SendJournal:
+    """Append-only SQLite (WAL) journal of per-contact send results
+
+    Every state change of a (campaign, normalized phone) pair is appended as
+    an event, so a crashed or closed campaign can be resumed by skipping the
+    phones that already have a "sent" (or "unconfirmed") event.  Writes are
+    buffered and committed in batches of batch_size or every flush_interval
+    seconds, so at most one unflushed batch can be lost if the process dies.
+    A campaigns table keeps each campaign's last use, for prefix lookups
+    and for dropping campaigns older than `retention` seconds on open.
+    """
+
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, batch_size=50, flush_interval=1.0,
+                 retention=RETENTION_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        if self._conn.execute("SELECT 1 FROM campaigns LIMIT 1").fetchone() is None:
+            # Journals written before the campaigns table existed
+            self._conn.execute("INSERT INTO campaigns (campaign, last_used) "
+                               "SELECT campaign, MAX(created_at) FROM events GROUP BY campaign")
+        self._conn.commit()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        if retention:
+            self.prune(time.time() - retention)
+
+    def queue(self, campaign, phones):
+        """Record phones as queued for a campaign (written immediately)"""
+        now = time.time()
+        with self._lock:
+            self._pending.extend((campaign, phone, STATE_QUEUED, None, now) for phone in phones)
+            self._flush_locked()
+
+    def record(self, campaign, phone, state, reason=None):
+        """Buffer a state change; flushed in batches"""
+        with self._lock:
+            self._pending.append((campaign, phone, state, reason, time.time()))
+            if (len(self._pending) >= self.batch_size or
+                    time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            last_used = {}
+            for campaign, _, _, _, created_at in self._pending:
+                last_used[campaign] = max(created_at, last_used.get(campaign, created_at))
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO events (campaign, phone, state, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                    self._pending
+                )
+                self._conn.executemany(
+                    "INSERT INTO campaigns (campaign, last_used) VALUES (?, ?) ON CONFLICT (campaign) "
+                    "DO UPDATE SET last_used = MAX(last_used, excluded.last_used)",
+                    last_used.items()
+                )
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def completed_phones(self, campaign):
+        """Phones that already received (or may have received) this campaign's message"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT phone FROM events WHERE campaign = ? AND state IN (?, ?)",
+                (campaign, STATE_SENT, STATE_UNCONFIRMED)
+            ).fetchall()
+        return set(phone for (phone,) in rows)
+
+    def send_times_since(self, timestamp):
+        """Times of all "sent" events after timestamp, across campaigns"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT created_at FROM events WHERE state = ? AND created_at > ?",
+                (STATE_SENT, timestamp)
+            ).fetchall()
+        return [created_at for (created_at,) in rows]
+
+    def latest_campaign(self, prefix):
+        """The most recently used campaign whose id starts with prefix, or None"""
+        self.flush()
+        with self._lock:
+            # A range on the primary key instead of substr(), which can't use it
+            row = self._conn.execute(
+                "SELECT campaign FROM campaigns WHERE campaign >= ? AND campaign < ? "
+                "ORDER BY last_used DESC LIMIT 1",
+                (prefix, prefix + '\U0010ffff')
+            ).fetchone()
+        return row[0] if row else None
+
+    def prune(self, before):
+        """Drop campaigns not used since the `before` timestamp; returns how many"""
+        self.flush()
+        with self._lock:
+            stale = [campaign for (campaign,) in self._conn.execute(
+                "SELECT campaign FROM campaigns WHERE last_used < ?", (before,)
+            ).fetchall()]
+            if stale:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM events WHERE campaign = ?", [(c,) for c in stale])
+                    self._conn.executemany("DELETE FROM campaigns WHERE campaign = ?", [(c,) for c in stale])
+        return len(stale)
+
+    def latest_states(self, campaign):
+        """Map of phone -> (state, reason) from each phone's latest event"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT phone, state, reason FROM events WHERE id IN "
+                "(SELECT MAX(id) FROM events WHERE campaign = ? GROUP BY phone)",
+                (campaign,)
+            ).fetchall()
+        return {phone: (state, reason) for phone, state, reason in rows}
+
+    def summary(self, campaign):
+        """Count of phones per latest state, e.g. {'sent': 10, 'failed': 2}"""
+        counts = {}
+        for state, _ in self.latest_states(campaign).values():
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
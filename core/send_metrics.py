@@ -0,0 +1,215 @@
+# core/send_metrics.py
+import bisect
+import json
+import os
+import threading
+import time
+
+# "0" turns span recording off (spans become no-ops)
+ENABLED = os.environ.get('WHATSAPP_METRICS', '1') not in ('', '0', 'false', 'no')
+
+# One JSON line of per-stage timings per campaign, appended
+DEFAULT_JSONL_PATH = os.path.join(os.getcwd(), 'send_metrics.jsonl')
+# Cumulative histograms in Prometheus text format (node_exporter textfile collector), rewritten
+DEFAULT_PROMETHEUS_PATH = os.path.join(os.getcwd(), 'send_metrics.prom')
+
+# Upper bounds in seconds: browser round trips up to the 120 s login wait
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+PROMETHEUS_NAME = 'whatsapp_send_stage_seconds'
+PROMETHEUS_ERRORS_NAME = 'whatsapp_send_stage_errors_total'
+
+
+class _Histogram:
+    """Bucket counts, sum and error count of one stage"""
+
+    __slots__ = ('counts', 'total', 'errors')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # Last one is +Inf
+        self.total = 0.0
+        self.errors = 0
+
+
+class Span:
+    """Times one stage; use as a context manager or call end() yourself"""
+
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+        self.started = time.perf_counter()
+
+    def end(self, error=False):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started, error)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc_type is not None)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def end(self, error=False):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+def quantile(counts, fraction):
+    """Estimate a quantile from bucket counts, interpolating inside the bucket"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = fraction * total
+    seen = 0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = BUCKETS[index - 1] if index > 0 else 0.0
+            if index == len(BUCKETS):
+                return lower  # Beyond the last bound: report the bound
+            return lower + (BUCKETS[index] - lower) * (rank - seen) / count
+        seen += count
+    return BUCKETS[-1]
+
+
+def summarize(snapshot):
+    """Per-stage count, total, mean and p50/p90/p99 from a snapshot() or delta()"""
+    summary = {}
+    for stage, data in snapshot.items():
+        count = sum(data['buckets'])
+        if not count:
+            continue
+        summary[stage] = {
+            'count': count,
+            'errors': data['errors'],
+            'sum': round(data['sum'], 4),
+            'mean': round(data['sum'] / count, 4),
+            'p50': round(quantile(data['buckets'], 0.5), 4),
+            'p90': round(quantile(data['buckets'], 0.9), 4),
+            'p99': round(quantile(data['buckets'], 0.99), 4),
+        }
+    return summary
+
+
+class SendMetrics:
+    """Per-stage latency histograms for the send pipeline
+
+    Code paths wrap each stage in span(stage); a span costs two
+    perf_counter() calls and a short locked bucket update, so it stays on in
+    production.  Histograms are cumulative for the life of the process:
+    export() appends one JSON line with a campaign's share (the delta from
+    a snapshot taken when it started) and rewrites the Prometheus file.
+    """
+
+    def __init__(self, jsonl_path=DEFAULT_JSONL_PATH, prometheus_path=DEFAULT_PROMETHEUS_PATH, enabled=None):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.enabled = ENABLED if enabled is None else enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        if not self.enabled:
+            return NO_SPAN
+        return Span(self, stage)
+
+    def observe(self, stage, seconds, error=False):
+        """Record how long a stage took (and whether it raised)"""
+        bucket = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = _Histogram()
+            histogram.counts[bucket] += 1
+            histogram.total += seconds
+            if error:
+                histogram.errors += 1
+
+    def snapshot(self):
+        """{stage: {'buckets': [...], 'sum': seconds, 'errors': n}}, cumulative"""
+        with self._lock:
+            return {stage: {'buckets': list(h.counts), 'sum': h.total, 'errors': h.errors}
+                    for stage, h in self._histograms.items()}
+
+    def delta(self, since):
+        """What was recorded after an earlier snapshot()"""
+        current = self.snapshot()
+        for stage, data in current.items():
+            before = since.get(stage)
+            if before:
+                data['buckets'] = [now - then for now, then in zip(data['buckets'], before['buckets'])]
+                data['sum'] -= before['sum']
+                data['errors'] -= before['errors']
+        return current
+
+    def export(self, since=None, **fields):
+        """Append a JSONL record (of the delta since `since`, if given) and rewrite the Prometheus file"""
+        snapshot = self.snapshot() if since is None else self.delta(since)
+        stages = summarize(snapshot)
+        if self.jsonl_path and stages:
+            record = {'time': round(time.time(), 3), **fields, 'stages': stages,
+                      'buckets': {stage: snapshot[stage]['buckets'] for stage in stages}, 'bounds': BUCKETS}
+            try:
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"⚠️ Could not write send metrics: {str(e)}")
+        if self.prometheus_path:
+            self.write_prometheus(self.prometheus_path)
+        return stages
+
+    def prometheus_text(self):
+        lines = [
+            f"# HELP {PROMETHEUS_NAME} Time spent in each stage of sending a WhatsApp message.",
+            f"# TYPE {PROMETHEUS_NAME} histogram",
+        ]
+        snapshot = self.snapshot()
+        for stage in sorted(snapshot):
+            data = snapshot[stage]
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), data['buckets']):
+                cumulative += count
+                lines.append(f'{PROMETHEUS_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PROMETHEUS_NAME}_sum{{stage="{stage}"}} {data["sum"]:.6f}')
+            lines.append(f'{PROMETHEUS_NAME}_count{{stage="{stage}"}} {cumulative}')
+        lines.append(f"# HELP {PROMETHEUS_ERRORS_NAME} Stages that ended with an exception.")
+        lines.append(f"# TYPE {PROMETHEUS_ERRORS_NAME} counter")
+        for stage in sorted(snapshot):
+            lines.append(f'{PROMETHEUS_ERRORS_NAME}{{stage="{stage}"}} {snapshot[stage]["errors"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Written to a temp file and renamed so a scraper never reads half a file
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text())
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not write Prometheus metrics: {str(e)}")
+
+
+_default_metrics = None
+_default_lock = threading.Lock()
+
+
+def default_metrics():
+    """The process-wide metrics shared by every sender"""
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = SendMetrics()
+        return _default_metrics
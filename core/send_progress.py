@@ -0,0 +1,97 @@
+# core/send_progress.py
+import collections
+import threading
+import time
+
+# Throughput is measured over this many seconds of recent results
+THROUGHPUT_WINDOW = 300
+
+
+class SendProgress:
+    """Thread-safe tally of a bulk send, read in coalesced snapshots
+
+    Sender threads report into it through the progress/result/status
+    callbacks, which only take a lock and update counters.  A reader (the
+    GUI timer, the CLI) calls snapshot() at its own pace and gets the
+    totals plus every per-contact result since its previous snapshot.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.total = 0  # Contacts the sender is working through
+        self.created_at = clock()
+        self.started_at = None  # First progress report from the sender
+        self.succeeded = 0
+        self.failed = 0
+        self.current = 0  # Contacts through their first attempt
+        self.status = ""
+        self._pending = []  # (phone, success, reason) not yet handed out
+        self._recent = collections.deque()  # Completion times within the window
+
+    def on_progress(self, current, total, status):
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = self._clock()
+            self.current = current
+            self.total = total
+            self.status = status
+
+    def on_status(self, status):
+        with self._lock:
+            self.status = status
+
+    def on_result(self, phone, success, reason):
+        now = self._clock()
+        with self._lock:
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self._pending.append((phone, success, reason))
+            # Results reported before sending starts (invalid numbers)
+            # took no browser time, so they don't count towards throughput
+            if self.started_at is not None:
+                self._recent.append(now)
+
+    def _rate_per_minute(self, now):
+        """Contacts finished per minute over the recent window (lock held)"""
+        while self._recent and self._recent[0] <= now - THROUGHPUT_WINDOW:
+            self._recent.popleft()
+        if self.started_at is None or not self._recent:
+            return 0.0
+        span = min(THROUGHPUT_WINDOW, now - self.started_at)
+        if span <= 0:
+            return 0.0
+        return len(self._recent) * 60.0 / span
+
+    def snapshot(self):
+        """Current totals plus the results reported since the last snapshot"""
+        now = self._clock()
+        with self._lock:
+            rate = self._rate_per_minute(now)
+            remaining = max(0, self.total - self.current)
+            results, self._pending = self._pending, []
+            return {
+                'total': self.total,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'current': self.current,
+                'status': self.status,
+                'rate_per_minute': round(rate, 1),
+                'eta_seconds': remaining * 60.0 / rate if rate else None,
+                'elapsed_seconds': now - self.created_at,
+                'results': results,
+            }
+
+
+def format_duration(seconds):
+    """Short human form of a duration, e.g. 1h 05m or 42s"""
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
@@ -0,0 +1,336 @@
+# core/sender_pool.py
+import os
+import queue
+import threading
+import time
+
+from core.personalized_sender import WhatsAppSender
+from core.retry_queue import RetryQueue, FAILURE_UNKNOWN, FAILURE_DRIVER_CRASH
+
+# Browser restarts per session and campaign before a crashing session is retired
+MAX_SESSION_RESTARTS = 2
+
+
+def profile_dir_for(worker_index, profile_root=None):
+    """Chrome profile directory for a pool worker
+
+    The first worker reuses the single-session "User_Data" profile so an
+    existing login keeps working; the others get User_Data_2, User_Data_3...
+    """
+    profile_root = profile_root or os.getcwd()
+    if worker_index == 0:
+        return os.path.join(profile_root, "User_Data")
+    return os.path.join(profile_root, f"User_Data_{worker_index + 1}")
+
+
+class _WorkItem:
+    __slots__ = ('index', 'phone', 'message', 'name', 'tried')
+
+    def __init__(self, index, phone, message, name):
+        self.index = index
+        self.phone = phone
+        self.message = message
+        self.name = name
+        self.tried = set()  # Workers that already failed this item
+
+
+class SenderPool:
+    """A pool of WhatsAppSender sessions sending from one shared work queue
+
+    Each worker drives its own Chrome profile (and so its own linked
+    WhatsApp account or device).  Failed messages are classified and
+    deferred to a shared retry queue with per-class backoff, drained after
+    the main pass; a retry goes to a worker that hasn't failed it yet
+    while there is one.  A session whose browser crashed is restarted up
+    to MAX_SESSION_RESTARTS times per campaign; one that is logged out is
+    retired and its share goes to the others.  The pool exposes the same methods as
+    WhatsAppSender, so MessageSender can use either.
+    """
+
+    def __init__(self, size=2, phone_normalizer=None, profile_root=None, sender_factory=None):
+        if size < 1:
+            raise ValueError("A sender pool needs at least one session")
+        sender_factory = sender_factory or WhatsAppSender
+        self.senders = [
+            sender_factory(phone_normalizer=phone_normalizer, profile_dir=profile_dir_for(i, profile_root))
+            for i in range(size)
+        ]
+        self._lock = threading.Lock()
+        self._reporting = threading.local()  # Failure class of the result being reported
+
+    @property
+    def phone_normalizer(self):
+        return self.senders[0].phone_normalizer
+
+    @property
+    def is_initialized(self):
+        return any(sender.is_initialized for sender in self.senders)
+
+    def ready_senders(self):
+        return [sender for sender in self.senders if sender.is_initialized]
+
+    def initialize_driver(self):
+        """Start every session in parallel; succeeds if at least one logs in"""
+        threads = []
+        for sender in self.senders:
+            if sender.is_initialized:
+                continue
+            thread = threading.Thread(target=sender.initialize_driver)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        ready = len(self.ready_senders())
+        print(f"✅ {ready}/{len(self.senders)} WhatsApp sessions ready")
+        return ready > 0
+
+    @property
+    def profile_dir(self):
+        """Profile of the first session (the single-session login)"""
+        return self.senders[0].profile_dir
+
+    @property
+    def last_failure(self):
+        """Inside result_callback: failure class of the contact being reported"""
+        return getattr(self._reporting, 'failure', None)
+
+    def logged_in_before(self):
+        """True if every session's profile was logged in when last used"""
+        return all(sender.logged_in_before() for sender in self.senders)
+
+    def check_whatsapp_ready(self):
+        return any(sender.check_whatsapp_ready() for sender in self.ready_senders())
+
+    def probe(self):
+        """True when every started session still responds"""
+        ready = self.ready_senders()
+        return bool(ready) and all([sender.probe() for sender in ready])
+
+    def reconnect(self):
+        """Restart the sessions that stopped responding, then start any that aren't running"""
+        for sender in self.ready_senders():
+            if not sender.probe():
+                sender.close_driver()
+        return self.initialize_driver()
+
+    def send_single_message(self, phone, message, pace=True, name=''):
+        """Send one message through the first ready session"""
+        for sender in self.ready_senders():
+            return sender.send_single_message(phone, message, pace=pace, name=name)
+        return False
+
+    def send_bulk_messages(self, contacts_with_messages, progress_callback=None, result_callback=None,
+                           scheduler=None, retry_queue=None):
+        """Send messages across all ready sessions with aggregated progress
+
+        result_callback, if given, is called as (phone, success, reason)
+        once per contact, after its final attempt, with last_failure set to
+        that contact's failure class meanwhile.  A scheduler is shared by
+        all workers, so its limits apply to the pool as a whole, and so is
+        the retry queue.  Workers send on while their messages confirm
+        (see WhatsAppSender.submit_message()), and take contacts from
+        contacts_with_messages one at a time as they get to them, so a
+        PreparedMessages keeps rendering only a little ahead of the pool.
+        """
+        if not self.is_initialized:
+            if not self.initialize_driver():
+                return 0, len(contacts_with_messages)
+
+        total_count = len(contacts_with_messages)
+        if retry_queue is None:
+            retry_queue = RetryQueue()
+        work = queue.Queue()  # Retries and items left for another worker
+        source = enumerate(contacts_with_messages)
+        source_lock = threading.Lock()
+
+        workers = self.ready_senders()
+        restarts = [0] * len(workers)
+        state = {'done': 0, 'success': 0, 'remaining': total_count, 'alive': len(workers),
+                 'pulled': 0, 'exhausted': False, 'error': None}
+
+        def report(status):
+            if progress_callback:
+                progress_callback(state['done'], total_count, status)
+
+        def finish(item, success, status, reason=None, failure=None):
+            with self._lock:
+                state['done'] += 1
+                state['remaining'] -= 1
+                if success:
+                    state['success'] += 1
+                report(status)
+            if result_callback:
+                self._reporting.failure = failure
+                result_callback(item.phone, success, reason)
+
+        def pull():
+            """Next contact from contacts_with_messages, or None once it ran out"""
+            with source_lock:
+                if state['exhausted']:
+                    return None
+                try:
+                    index, (phone, message, name) = next(source)
+                except Exception as e:
+                    state['exhausted'] = True
+                    if not isinstance(e, StopIteration):
+                        state['error'] = e
+                    with self._lock:
+                        # Contacts that will never come out can't be waited for
+                        state['remaining'] -= total_count - state['pulled']
+                    return None
+                state['pulled'] += 1
+                return _WorkItem(index, phone, message, name)
+
+        def next_item():
+            try:
+                return work.get_nowait()
+            except queue.Empty:
+                pass
+            item = pull()
+            if item is not None:
+                return item
+            try:
+                return work.get(timeout=0.2)
+            except queue.Empty:
+                return None
+
+        def next_retry():
+            """Move the earliest due retry onto the work queue once the main pass is through"""
+            with self._lock:
+                if not state['exhausted'] or not work.empty() or not len(retry_queue) or \
+                        retry_queue.next_ready_in() > 0:
+                    return
+                _, item, failure = retry_queue.pop()
+                report(f"Retrying {item.name} ({failure}, {len(retry_queue)} more queued)...")
+            if scheduler:
+                scheduler.enqueue()
+            work.put(item)
+
+        def settle(worker_id, sender, item, success, failure, error):
+            """Account for an attempt's outcome; returns False once the session is lost"""
+            if success:
+                finish(item, True, f"Sent to {item.name}")
+                return True
+            item.tried.add(worker_id)
+            failure = failure or FAILURE_UNKNOWN
+            with self._lock:
+                deferred = retry_queue.push(item.index, item, failure)
+            if deferred:
+                print(f"↩️ Will retry {item.phone} later ({failure})")
+            else:
+                finish(item, False, f"Failed to send to {item.name}", error, failure)
+            if sender.check_whatsapp_ready():
+                return True
+            return failure == FAILURE_DRIVER_CRASH and restart(worker_id, sender)
+
+        def restart(worker_id, sender):
+            """Restart a session whose browser died; False once it has to be retired"""
+            if restarts[worker_id] >= MAX_SESSION_RESTARTS:
+                return False
+            restarts[worker_id] += 1
+            print(f"🔄 Session {worker_id + 1} crashed, restarting it (attempt {restarts[worker_id]})...")
+            restarted = sender.reconnect()
+            for pending in sender.take_resolved():
+                settled(pending)  # Closing the old browser gave up on its unconfirmed messages
+            return restarted
+
+        def settle_confirmed(worker_id, sender):
+            usable = True
+            for pending in sender.take_resolved():
+                if usable:
+                    usable = settle(worker_id, sender, pending.context, pending.success, pending.failure,
+                                    pending.error)
+                else:
+                    settled(pending)
+            return usable
+
+        def settled(pending):
+            """Account for a confirmation that no longer gets a retry"""
+            item = pending.context
+            finish(item, pending.success, f"Sent to {item.name}" if pending.success else
+                   f"Failed to send to {item.name}", pending.error, pending.failure)
+
+        def retire(worker_id, sender):
+            print(f"❌ Session {worker_id + 1} can't send any more, retiring it")
+            # Don't leave its Chrome running until the pool is closed
+            sender.close_driver()
+            sender.is_initialized = False
+            for pending in sender.take_resolved():
+                settled(pending)
+            with self._lock:
+                state['alive'] -= 1
+                last_worker = state['alive'] == 0
+            if last_worker:
+                # Nobody left to pick up the queues: count them as failed
+                while True:
+                    try:
+                        item = work.get_nowait()
+                    except queue.Empty:
+                        item = pull()
+                        if item is None:
+                            with self._lock:
+                                if not len(retry_queue):
+                                    break
+                                _, item, _ = retry_queue.pop()
+                    finish(item, False, f"Failed to send to {item.name}", "no session left")
+
+        def run(worker_id, sender):
+            while True:
+                # Confirmations arrive while this worker sends on, never waited for
+                sender.collect_confirmations()
+                if not settle_confirmed(worker_id, sender):
+                    return retire(worker_id, sender)
+                with self._lock:
+                    if state['remaining'] <= 0:
+                        return
+                next_retry()
+                item = next_item()
+                if item is None:
+                    continue
+
+                if worker_id in item.tried:
+                    with self._lock:
+                        others_alive = state['alive'] > len(item.tried)
+                    if others_alive:
+                        # Leave it for a worker that hasn't failed it yet
+                        work.put(item)
+                        time.sleep(0.05)
+                        continue
+
+                with self._lock:
+                    report(f"Sending to {item.name}...")
+                if scheduler:
+                    with sender.metrics.span('send.schedule_wait'):
+                        scheduler.acquire()
+                pending = sender.submit_message(item.phone, item.message, item, pace=scheduler is None,
+                                                name=item.name)
+                if pending is None and not settle(worker_id, sender, item, False, sender.last_failure,
+                                                  sender.last_error):
+                    return retire(worker_id, sender)
+                sender.sweep_receipts()
+
+        threads = []
+        for worker_id, sender in enumerate(workers):
+            thread = threading.Thread(target=run, args=(worker_id, sender))
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        self.sweep_receipts(force=True)
+        if state['error'] is not None:
+            raise state['error']
+        return state['success'], total_count
+
+    def sweep_receipts(self, force=False):
+        return sum(sender.sweep_receipts(force) for sender in self.ready_senders())
+
+    def set_receipt_callback(self, callback):
+        for sender in self.senders:
+            sender.set_receipt_callback(callback)
+
+    def close_driver(self):
+        for sender in self.senders:
+            sender.close_driver()
@@ -0,0 +1,158 @@
+# core/session_manager.py
+import threading
+
+# Session states reported to state_callback
+SESSION_IDLE = 'idle'
+SESSION_STARTING = 'starting'
+SESSION_READY = 'ready'
+SESSION_RECONNECTING = 'reconnecting'
+SESSION_FAILED = 'failed'
+
+# Seconds between liveness probes while no campaign is running
+PROBE_INTERVAL = 30.0
+# Reconnect attempts in a row before giving up until the next connect()
+MAX_RECONNECTS = 3
+
+
+class SessionManager:
+    """Owns the lifecycle of a MessageSender's WhatsApp browser session(s)
+
+    prewarm() launches and logs in the browser on a background thread so
+    it is ready before the first send; connect() joins a launch already in
+    progress instead of starting a second browser on the same profile.  A
+    monitor thread probes the session every probe_interval seconds (one
+    script call, no navigation) and restarts it when it died while idle;
+    while idle it also sweeps message receipts.
+    During a campaign the send loop recovers crashed sessions itself.
+    """
+
+    def __init__(self, message_sender, probe_interval=PROBE_INTERVAL, max_reconnects=MAX_RECONNECTS):
+        self.message_sender = message_sender
+        self.probe_interval = probe_interval
+        self.max_reconnects = max_reconnects
+        self.state = SESSION_IDLE
+        self.state_callback = None  # Called as (state, message) from any thread
+        self.reconnects = 0  # Failed reconnects in a row
+        self._wanted = False  # A session should be kept alive
+        self._lock = threading.Lock()
+        self._launch_done = threading.Event()
+        self._launch_done.set()
+        self._stop = threading.Event()
+        self._monitor = None
+
+    @property
+    def launching(self):
+        return not self._launch_done.is_set()
+
+    def _set_state(self, state, message=""):
+        self.state = state
+        if self.state_callback:
+            self.state_callback(state, message)
+
+    def _claim_launch(self):
+        """Mark a launch as in progress; False if another one already is"""
+        with self._lock:
+            if not self._launch_done.is_set():
+                return False
+            self._launch_done.clear()
+            return True
+
+    def _launch(self, reconnect=False):
+        sender = self.message_sender.whatsapp_sender
+        self._set_state(SESSION_RECONNECTING if reconnect else SESSION_STARTING,
+                        "Restarting WhatsApp Web..." if reconnect else "Starting WhatsApp Web...")
+        try:
+            success = sender.reconnect() if reconnect else sender.initialize_driver()
+        except Exception as e:
+            print(f"❌ WhatsApp session start failed: {str(e)}")
+            success = False
+        if success:
+            self._wanted = True
+            self.reconnects = 0
+            self._set_state(SESSION_READY, "WhatsApp Web is ready")
+        else:
+            self._set_state(SESSION_FAILED, "Could not start WhatsApp Web")
+        self._launch_done.set()
+        return success
+
+    def prewarm(self, require_profile=True):
+        """Start the browser on a background thread; False if a launch is already running
+
+        With require_profile, only profiles that were still logged in when
+        last used are started (see WhatsAppSender.logged_in_before()), so a
+        first run or a login abandoned at the QR code doesn't pop one up
+        unasked.  The
+        sender is created on that thread too, keeping the selenium import
+        off the caller's.
+        """
+        if not self._claim_launch():
+            return False
+
+        def run():
+            try:
+                sender = self.message_sender.whatsapp_sender
+                skip = sender.is_initialized or (require_profile and not sender.logged_in_before())
+            except Exception as e:
+                print(f"⚠️ Could not prepare the WhatsApp session: {str(e)}")
+                skip = True
+            if skip:
+                self._launch_done.set()
+                return
+            self._launch()
+
+        threading.Thread(target=run, name="session-prewarm", daemon=True).start()
+        return True
+
+    def connect(self):
+        """Make sure a live session exists, waiting for one that is starting"""
+        sender = self.message_sender.whatsapp_sender
+        if not self.launching and sender.is_initialized and sender.probe():
+            self._wanted = True
+            return True
+        if self._claim_launch():
+            return self._launch(reconnect=sender.is_initialized)
+        self._launch_done.wait()
+        return self.message_sender.whatsapp_sender.is_initialized
+
+    def disconnect(self):
+        """Stop keeping the session alive (the caller closes the browser)"""
+        self._wanted = False
+        self._set_state(SESSION_IDLE, "")
+
+    def start_monitoring(self):
+        if self._monitor and self._monitor.is_alive():
+            return
+        self._stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="session-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop_monitoring(self):
+        self._stop.set()
+
+    def _monitor_loop(self):
+        while not self._stop.wait(self.probe_interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"⚠️ Session check failed: {str(e)}")
+
+    def check(self):
+        """Probe the session once and restart it if it died; returns True if alive"""
+        if not self._wanted or self.launching or self.message_sender.is_sending:
+            return True
+        sender = self.message_sender.whatsapp_sender
+        if sender.is_initialized and sender.probe():
+            if self.state != SESSION_READY:
+                self._set_state(SESSION_READY, "WhatsApp Web is ready")
+            # Ticks keep arriving after a campaign; pick them up while idle
+            sender.sweep_receipts()
+            return True
+        if self.reconnects >= self.max_reconnects:
+            if self.state != SESSION_FAILED:
+                self._set_state(SESSION_FAILED, "WhatsApp Web keeps failing; reconnect manually")
+            return False
+        self.reconnects += 1
+        print(f"🔄 WhatsApp session not responding, restarting it (attempt {self.reconnects})...")
+        if self._claim_launch():
+            return self._launch(reconnect=True)
+        return False
@@ -0,0 +1,107 @@
+# core/template_engine.py
+import functools
+import re
+
+# Anything that looks like "(word)" is treated as a placeholder candidate
+PLACEHOLDER_PATTERN = re.compile(r"\(([^()\n]+)\)")
+# Compiled templates kept by compile_template()
+TEMPLATE_CACHE_SIZE = 64
+
+
+class MessageTemplate:
+    """A message template compiled once and rendered for many contacts.
+
+    The template is split into a list of segments: literal strings and the
+    column names of its "(column)" placeholders.  Rendering a contact is then a
+    single pass over the segments instead of one str.replace per column.
+    """
+
+    def __init__(self, template, columns=None):
+        self.template = template or ""
+        self.columns = list(columns) if columns is not None else None
+        self.segments = []
+        self.used_columns = []
+        self.unknown_placeholders = []
+        self._compile()
+
+    def _compile(self):
+        """Parse the template into literal and placeholder segments"""
+        if self.columns is not None:
+            # Only known columns are placeholders; longest names first so that
+            # "(first name)" wins over a shorter overlapping column
+            names = sorted(set(self.columns), key=len, reverse=True)
+            if names:
+                pattern = re.compile(r"\((" + "|".join(re.escape(str(n)) for n in names) + r")\)")
+            else:
+                pattern = None
+        else:
+            pattern = PLACEHOLDER_PATTERN
+
+        segments = []
+        used = []
+        position = 0
+        if pattern is not None:
+            for match in pattern.finditer(self.template):
+                if match.start() > position:
+                    segments.append(self.template[position:match.start()])
+                key = match.group(1)
+                # Field segments are tuples so they can't be confused with literals
+                segments.append((key,))
+                if key not in used:
+                    used.append(key)
+                position = match.end()
+        if position < len(self.template):
+            segments.append(self.template[position:])
+
+        self.segments = segments
+        self.used_columns = used
+
+        # Report "(something)" tokens that don't match any column
+        if self.columns is not None:
+            known = set(self.columns)
+            unknown = []
+            for match in PLACEHOLDER_PATTERN.finditer(self.template):
+                key = match.group(1)
+                if key not in known and key not in unknown:
+                    unknown.append(key)
+            self.unknown_placeholders = unknown
+
+    def missing_columns(self, contact_data):
+        """Return the placeholders this template uses that contact_data lacks"""
+        return [key for key in self.used_columns if key not in contact_data]
+
+    def render(self, contact_data):
+        """Render the template for a single contact"""
+        parts = []
+        append = parts.append
+        for segment in self.segments:
+            if segment.__class__ is tuple:
+                key = segment[0]
+                if key in contact_data:
+                    append(str(contact_data[key]))
+                else:
+                    # Keep the placeholder untouched, like the old str.replace did
+                    append(f"({key})")
+            else:
+                append(segment)
+        return "".join(parts)
+
+    def render_many(self, contacts):
+        """Render the template for every contact, returning a list of messages"""
+        render = self.render
+        return [render(contact) for contact in contacts]
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_cached(template, columns):
+    return MessageTemplate(template, columns)
+
+
+def compile_template(template, columns=None):
+    """Compile a template, optionally validating it against known columns
+
+    Templates are cached by their text and column names, so rendering
+    contact after contact compiles each one only once.  The returned
+    template is shared: don't modify it.
+    """
+    return _compile_cached(template, tuple(columns) if columns is not None else None)
@@ -0,0 +1,55 @@
+# core/template_preview.py
+from core.template_engine import compile_template
+
+# Contacts rendered for the live preview
+PREVIEW_SAMPLE_SIZE = 200
+
+
+def sample_indices(indices, size=PREVIEW_SAMPLE_SIZE):
+    """Pick up to size row indices spread evenly over indices
+
+    The pick only depends on the input, so the preview doesn't jump
+    between different contacts while the template is being typed.
+    """
+    count = len(indices)
+    if count <= size:
+        return list(indices)
+    step = count / size
+    return [indices[int(i * step)] for i in range(size)]
+
+
+class TemplatePreview:
+    """Result of rendering a template against a sample of contacts"""
+
+    def __init__(self, template):
+        self.template = template
+        self.text = ""  # The message as the first sampled contact would get it
+        self.sample_size = 0
+        self.max_length = 0
+        self.longest_contact = None
+        self.empty_placeholders = []  # (contact, [columns with empty values])
+        self.unknown_placeholders = []
+
+
+def render_preview(template, contacts, columns):
+    """Render template for each contact (dicts) and collect preview stats"""
+    compiled = compile_template(template, columns)
+    preview = TemplatePreview(template)
+    preview.unknown_placeholders = compiled.unknown_placeholders
+    preview.sample_size = len(contacts)
+    if not contacts:
+        preview.text = template
+        return preview
+
+    used_columns = compiled.used_columns
+    for position, contact in enumerate(contacts):
+        message = compiled.render(contact)
+        if position == 0:
+            preview.text = message
+        if len(message) > preview.max_length:
+            preview.max_length = len(message)
+            preview.longest_contact = contact
+        empty = [column for column in used_columns if not str(contact.get(column, '')).strip()]
+        if empty:
+            preview.empty_placeholders.append((contact, empty))
+    return preview
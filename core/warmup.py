@@ -0,0 +1,27 @@
+# core/warmup.py
+import importlib
+import threading
+
+# Slow imports that sending needs, loaded ahead of time after startup
+WARM_UP_MODULES = (
+    'core.personalized_sender',  # selenium
+    'webdriver_manager.chrome',
+)
+
+
+def warm_up(modules=WARM_UP_MODULES):
+    """Import modules on a background thread so the first send doesn't wait for them
+
+    Missing optional packages are only reported; the real import at first
+    use raises the error where it can be shown.
+    """
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"⚠️ Warm-up import of {name} failed: {str(e)}")
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,172 @@
+# gui/contacts_model.py
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from core.contact_manager import (CHANGE_ROWS_ABOUT_TO_BE_INSERTED, CHANGE_ROWS_INSERTED,
+                                  CHANGE_ROWS_ABOUT_TO_BE_REMOVED, CHANGE_ROWS_REMOVED,
+                                  CHANGE_COLUMN_ABOUT_TO_BE_ADDED, CHANGE_COLUMN_ADDED,
+                                  CHANGE_CELL, CHANGE_ROW, CHANGE_ABOUT_TO_RESET, CHANGE_RESET)
+
+
+class ContactsTableModel(QAbstractTableModel):
+    """Table model reading straight from a ContactManager's column store
+
+    Qt only asks for the cells it is about to paint, so no per-cell objects
+    exist and the cost of showing the grid doesn't grow with the number of
+    contacts.  Changes reported by the ContactManager are forwarded as
+    the matching row/column/cell notifications, so views update in place.
+    """
+
+    # Model columns shown before the first contact column
+    column_offset = 0
+
+    def __init__(self, contact_manager, parent=None):
+        super().__init__(parent)
+        self.contact_manager = contact_manager
+        contact_manager.subscribe(self.on_contacts_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.contact_manager.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.contact_manager.get_columns())
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            column_name = self.contact_manager.get_columns()[index.column()]
+            return str(self.contact_manager.store.get(index.row(), column_name))
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        column_name = self.contact_manager.get_columns()[index.column()]
+        # The manager's cell_changed event emits dataChanged
+        self.contact_manager.update_contact(index.row(), column_name, value)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            columns = self.contact_manager.get_columns()
+            return columns[section] if section < len(columns) else None
+        return str(section + 1)
+
+    def refresh(self):
+        """Re-read everything after a bulk change (import, delete, new column)"""
+        self.beginResetModel()
+        self.endResetModel()
+
+    def on_contacts_changed(self, event, *args):
+        """Translate a ContactManager change event into model notifications"""
+        root = QModelIndex()
+        if event == CHANGE_ROWS_ABOUT_TO_BE_INSERTED:
+            self.beginInsertRows(root, *args)
+        elif event == CHANGE_ROWS_INSERTED:
+            self.endInsertRows()
+        elif event == CHANGE_ROWS_ABOUT_TO_BE_REMOVED:
+            self.beginRemoveRows(root, *args)
+        elif event == CHANGE_ROWS_REMOVED:
+            self.endRemoveRows()
+        elif event == CHANGE_COLUMN_ABOUT_TO_BE_ADDED:
+            position = args[0] + self.column_offset
+            self.beginInsertColumns(root, position, position)
+        elif event == CHANGE_COLUMN_ADDED:
+            self.endInsertColumns()
+        elif event == CHANGE_CELL:
+            row, column_name = args
+            columns = self.contact_manager.get_columns()
+            if column_name in columns:
+                cell = self.index(row, columns.index(column_name) + self.column_offset)
+                self.dataChanged.emit(cell, cell, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        elif event == CHANGE_ROW:
+            row = args[0]
+            self.dataChanged.emit(self.index(row, self.column_offset),
+                                  self.index(row, self.columnCount() - 1))
+        elif event == CHANGE_ABOUT_TO_RESET:
+            self.beginResetModel()
+        elif event == CHANGE_RESET:
+            self.endResetModel()
+
+
+class SelectableContactsModel(ContactsTableModel):
+    """Read-only contacts model with a leading "Select" check column
+
+    Check states come from a ContactSelection rather than per-row widgets,
+    and the selection follows rows as they are inserted or removed.
+    """
+
+    column_offset = 1
+
+    def __init__(self, contact_manager, selection, parent=None):
+        super().__init__(contact_manager, parent)
+        self.selection = selection
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.contact_manager.get_columns()) + 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.column() == 0:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                selected = self.selection.is_selected(index.row())
+                return Qt.CheckState.Checked if selected else Qt.CheckState.Unchecked
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            column_name = self.contact_manager.get_columns()[index.column() - 1]
+            return str(self.contact_manager.store.get(index.row(), column_name))
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != 0 or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.selection.set_selected(index.row(), checked)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if index.column() == 0:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if section == 0:
+                return "Select"
+            return super().headerData(section - 1, orientation, role)
+        return super().headerData(section, orientation, role)
+
+    def on_contacts_changed(self, event, *args):
+        # Keep the selection in step before the view is told to repaint
+        if event == CHANGE_ROWS_INSERTED:
+            self.selection.insert_rows(args[0], args[1] - args[0] + 1)
+        elif event == CHANGE_ROWS_REMOVED:
+            self.selection.remove_rows(*args)
+        elif event == CHANGE_RESET and args:
+            self.selection.remove_many(args[0])  # Rows deleted in one go
+        elif event == CHANGE_RESET:
+            self.selection.clear()
+            self.selection.resize(len(self.contact_manager.store))
+        super().on_contacts_changed(event, *args)
+
+    def check_states_changed(self):
+        """Repaint the check column after select all / deselect all"""
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, 0), [Qt.ItemDataRole.CheckStateRole])
@@ -1,9 +1,12 @@
 # gui/contacts_tab.py
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                            QTableWidgetItem, QPushButton, QHeaderView, QMessageBox,
-                            QInputDialog, QLineEdit, QFileDialog, QCheckBox)
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                            QPushButton, QHeaderView, QMessageBox,
+                            QInputDialog, QLineEdit, QFileDialog, QCheckBox,
+                            QProgressDialog, QApplication)
+from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtWidgets import QHeaderView
+from core.contact_manager import DEDUP_MERGE
+from gui.contacts_model import ContactsTableModel
 
 class ContactsTab(QWidget):
     contacts_updated = pyqtSignal()
@@ -43,63 +46,34 @@ class ContactsTab(QWidget):
         
         layout.addLayout(button_layout)
         
-        # Contacts table
-        self.contacts_table = QTableWidget()
+        # Contacts table: a view over the contact store, edits go straight to it
+        self.contacts_model = ContactsTableModel(self.contact_manager, self)
+        self.contacts_table = QTableView()
+        self.contacts_table.setModel(self.contacts_model)
         self.contacts_table.setAlternatingRowColors(True)
         self.contacts_table.horizontalHeader().setStretchLastSection(True)
-        
-        # Connect cell changed signal to handle edits
-        self.contacts_table.cellChanged.connect(self.on_cell_changed)
+        self.contacts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # Fixed row heights let the view skip measuring rows it doesn't show
+        self.contacts_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         
         layout.addWidget(self.contacts_table)
         
         self.refresh_table()
         
     def refresh_table(self):
-        # Disconnect cellChanged signal temporarily to avoid triggering during refresh
-        self.contacts_table.cellChanged.disconnect()
-        
-        contacts = self.contact_manager.get_contacts()
-        columns = self.contact_manager.get_columns()
-        
-        self.contacts_table.setRowCount(len(contacts))
-        self.contacts_table.setColumnCount(len(columns))
-        self.contacts_table.setHorizontalHeaderLabels(columns)
-        
-        for row, contact in enumerate(contacts):
-            for col, column_name in enumerate(columns):
-                value = contact.get(column_name, "")
-                item = QTableWidgetItem(str(value))
-                self.contacts_table.setItem(row, col, item)
-        
-        self.contacts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
-        # Reconnect cellChanged signal
-        self.contacts_table.cellChanged.connect(self.on_cell_changed)
-        
+        """Full reload; normal edits reach the model through ContactManager events"""
+        self.contacts_model.refresh()
         self.contacts_updated.emit()
         
-    def on_cell_changed(self, row, column):
-        """Handle when a cell is edited in the table"""
-        if row < self.contacts_table.rowCount() and column < self.contacts_table.columnCount():
-            item = self.contacts_table.item(row, column)
-            if item:
-                column_name = self.contact_manager.get_columns()[column]
-                new_value = item.text()
-                
-                # Update the contact manager with the new value
-                self.contact_manager.update_contact(row, column_name, new_value)
-        
     def add_contact(self):
         phone, ok = QInputDialog.getText(self, "Add Contact", "Phone Number:")
         if ok and phone:
             name, ok = QInputDialog.getText(self, "Add Contact", "Name:")
             if ok:
                 self.contact_manager.add_contact(phone.strip(), name.strip())
-                self.refresh_table()
                 
     def delete_selected(self):
-        selected_rows = set(index.row() for index in self.contacts_table.selectedIndexes())
+        selected_rows = set(index.row() for index in self.contacts_table.selectionModel().selectedIndexes())
         if not selected_rows:
             QMessageBox.warning(self, "Warning", "Please select contacts to delete.")
             return
@@ -109,27 +83,40 @@ class ContactsTab(QWidget):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            # Delete in reverse order to maintain correct indices
-            for row in sorted(selected_rows, reverse=True):
-                self.contact_manager.delete_contact(row)
-            self.refresh_table()
+            self.contact_manager.delete_contacts(selected_rows)
             
     def import_csv(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
         if file_path:
+            progress = QProgressDialog("Importing contacts...", None, 0, 100, self)
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(500)
+
+            def on_progress(rows_loaded, bytes_read, total_bytes):
+                if total_bytes:
+                    progress.setValue(int(bytes_read * 100 / total_bytes))
+                progress.setLabelText(f"Imported {rows_loaded} contacts...")
+                QApplication.processEvents()
+
             try:
-                self.contact_manager.load_from_csv(file_path)
-                self.refresh_table()
-                QMessageBox.information(self, "Success", "Contacts imported successfully!")
+                report = self.contact_manager.load_from_csv(file_path, progress_callback=on_progress,
+                                                            dedup=DEDUP_MERGE)
+                progress.close()
+                message = "Contacts imported successfully!"
+                if len(report):
+                    message += f"\n{report.summary()}."
+                invalid = self.contact_manager.invalid_phones
+                if invalid:
+                    message += f"\n{len(invalid)} contact(s) have invalid phone numbers and will be skipped when sending."
+                QMessageBox.information(self, "Success", message)
             except Exception as e:
+                progress.close()
                 QMessageBox.critical(self, "Error", f"Failed to import contacts: {str(e)}")
                 
     def export_csv(self):
         file_path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "contacts.csv", "CSV Files (*.csv)")
         if file_path:
             try:
-                # Ensure all table edits are saved before exporting
-                self.save_table_edits()
                 self.contact_manager.save_to_csv(file_path)
                 QMessageBox.information(self, "Success", "Contacts exported successfully!")
             except Exception as e:
@@ -139,14 +126,3 @@ class ContactsTab(QWidget):
         column_name, ok = QInputDialog.getText(self, "Add Column", "Column Name:")
         if ok and column_name:
             self.contact_manager.add_column(column_name.strip())
-            self.refresh_table()
-            
-    def save_table_edits(self):
-        """Ensure all pending edits in the table are saved to the contact manager"""
-        for row in range(self.contacts_table.rowCount()):
-            for col in range(self.contacts_table.columnCount()):
-                item = self.contacts_table.item(row, col)
-                if item:
-                    column_name = self.contact_manager.get_columns()[col]
-                    value = item.text()
-                    self.contact_manager.update_contact(row, column_name, value)
\ No newline at end of file
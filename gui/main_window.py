@@ -1,21 +1,32 @@
+import os
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QTabWidget, QPushButton, QTableWidget, QTableWidgetItem,
                             QTextEdit, QLineEdit, QLabel, QHeaderView, QMessageBox,
                             QCheckBox, QFileDialog, QSplitter, QFrame)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont
-import pandas as pd
 from core.contact_manager import ContactManager
+from core.contact_autosave import ContactAutosave, DEFAULT_CONTACTS_PATH
 from core.message_sender import MessageSender
 from gui.contacts_tab import ContactsTab
 from gui.message_tab import MessageTab
 from gui.send_tab import SendTab
 
+# Contacts are autosaved this long after the last edit
+AUTOSAVE_DELAY_MS = 2000
+
 class WhatsAppBroadcastApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.contact_manager = ContactManager()
-        self.message_sender = MessageSender()
+        # Share the normalizer so numbers validated at import are cache hits when sending
+        self.message_sender = MessageSender(phone_normalizer=self.contact_manager.phone_normalizer)
+        # Keeps contacts.csv up to date, writing only the rows that changed
+        self.autosave = ContactAutosave(self.contact_manager, DEFAULT_CONTACTS_PATH)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.setInterval(AUTOSAVE_DELAY_MS)
+        self.autosave_timer.timeout.connect(self.autosave.save)
         self.init_ui()
         self.load_initial_data()
         
@@ -48,22 +59,36 @@ class WhatsAppBroadcastApp(QMainWindow):
         self.connect_signals()
         
     def connect_signals(self):
-        # When contacts are updated in contacts tab, update send tab
-        self.contacts_tab.contacts_updated.connect(self.send_tab.refresh_contacts)
+        # Both contact tables follow ContactManager change events on their own
         # When message is updated in message tab, update send tab
         self.message_tab.message_updated.connect(self.send_tab.update_message_template)
+        # Every contact change (re)starts the autosave countdown
+        self.contact_manager.subscribe(lambda event, *args: self.autosave_timer.start())
+        
+    def start_background_session(self):
+        """Open WhatsApp Web ahead of the first send (called once the window is up)"""
+        self.send_tab.start_session()
         
     def load_initial_data(self):
         # Try to load existing data
         try:
-            self.contact_manager.load_from_csv('contacts.csv')
-            self.contacts_tab.refresh_table()
+            self.autosave.load()
         except FileNotFoundError:
             pass  # No existing contacts file
+        self.autosave_timer.stop()  # Nothing to save right after loading
             
         try:
             with open('message.txt', 'r', encoding='utf-8') as f:
                 message = f.read()
                 self.message_tab.set_message(message)
         except FileNotFoundError:
-            pass  # No existing message file
\ No newline at end of file
+            pass  # No existing message file
+
+    def closeEvent(self, event):
+        """Write pending contact changes before the window closes"""
+        self.autosave_timer.stop()
+        # Don't leave an empty contacts.csv behind if there never were contacts
+        if self.autosave.dirty and (len(self.contact_manager.store) or os.path.exists(self.autosave.path)):
+            self.autosave.save()
+        self.autosave.flush()
+        super().closeEvent(event)
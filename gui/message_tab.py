@@ -13,12 +13,12 @@ class MessageTab(QWidget):
         layout = QVBoxLayout(self)
         
         # Instructions
-        instructions = QLabel("Use (name) as placeholder for contact name. Example: Hello (name)!")
+        instructions = QLabel("Use (column name) placeholders for contact fields. Example: Hello (name)!")
         layout.addWidget(instructions)
         
         # Message editor
         self.message_edit = QTextEdit()
-        self.message_edit.setPlaceholderText("Enter your message here...\nUse (name) as placeholder for contact name.")
+        self.message_edit.setPlaceholderText("Enter your message here...\nUse (name), (phone) or any other column as a placeholder.")
         self.message_edit.textChanged.connect(self.on_message_changed)
         layout.addWidget(self.message_edit)
         
@@ -0,0 +1,32 @@
+# gui/preview_worker.py
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from core.template_preview import render_preview
+
+
+class PreviewSignals(QObject):
+    # (generation, TemplatePreview)
+    finished = pyqtSignal(int, object)
+
+
+class PreviewTask(QRunnable):
+    """Renders a preview on the thread pool from a snapshot of sampled contacts
+
+    The contacts are plain dict copies taken on the GUI thread, so the task
+    never touches the live contact store.
+    """
+
+    def __init__(self, generation, template, contacts, columns, signals):
+        super().__init__()
+        self.generation = generation
+        self.template = template
+        self.contacts = contacts
+        self.columns = columns
+        self.signals = signals
+
+    def run(self):
+        try:
+            preview = render_preview(self.template, self.contacts, self.columns)
+        except Exception as e:
+            print(f"❌ Preview failed: {str(e)}")
+            return
+        self.signals.finished.emit(self.generation, preview)
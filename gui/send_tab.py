@@ -1,17 +1,44 @@
 # gui/send_tab.py
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-                            QTableWidgetItem, QPushButton, QHeaderView, QCheckBox,
-                            QLabel, QProgressBar, QMessageBox, QTextEdit, QSplitter)
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                            QPushButton, QHeaderView, QLabel, QProgressBar,
+                            QMessageBox, QTextEdit, QSplitter, QSpinBox)
+from PyQt6.QtCore import QThreadPool, QTimer, pyqtSignal
 from PyQt6.QtCore import Qt
-import threading
+from core.contact_selection import ContactSelection
+from core.send_progress import format_duration
+from core.session_manager import SESSION_STARTING, SESSION_READY, SESSION_RECONNECTING, SESSION_FAILED
+from core.template_preview import PREVIEW_SAMPLE_SIZE, sample_indices
+from gui.contacts_model import SelectableContactsModel
+from gui.preview_worker import PreviewSignals, PreviewTask
+from gui.send_worker import ConnectWorker, ProgressBus, SendWorker, start_worker
+
+# Quiet time after the last keystroke or selection change before re-rendering
+PREVIEW_DEBOUNCE_MS = 250
 
 class SendTab(QWidget):
+    # (state, message) from the session manager's threads
+    session_state_changed = pyqtSignal(str, str)
+    
     def __init__(self, contact_manager, message_sender):
         super().__init__()
         self.contact_manager = contact_manager
         self.message_sender = message_sender
         self.message_template = ""
+        self.selection = ContactSelection(len(contact_manager.store))
+        self.preview_generation = 0
+        self.preview_signals = PreviewSignals(self)
+        self.preview_signals.finished.connect(self.on_preview_ready)
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self.preview_timer.timeout.connect(self.start_preview)
+        self.progress_bus = ProgressBus(self)
+        self.progress_bus.updated.connect(self.on_send_progress)
+        # Workers are kept referenced until the next run replaces them
+        self.connect_worker = None
+        self.send_worker = None
+        self.session_state_changed.connect(self.on_session_state)
+        self.message_sender.session.state_callback = self.session_state_changed.emit
         self.init_ui()
         
     def init_ui(self):
@@ -23,8 +50,15 @@ class SendTab(QWidget):
         self.connect_btn = QPushButton("Connect WhatsApp")
         self.connect_btn.clicked.connect(self.connect_whatsapp)
         
+        # Number of parallel WhatsApp Web sessions (one browser profile each)
+        self.sessions_spin = QSpinBox()
+        self.sessions_spin.setRange(1, 8)
+        self.sessions_spin.setValue(self.message_sender.session_count)
+        self.sessions_spin.setPrefix("Sessions: ")
+        
         self.status_layout.addWidget(self.whatsapp_status)
         self.status_layout.addStretch()
+        self.status_layout.addWidget(self.sessions_spin)
         self.status_layout.addWidget(self.connect_btn)
         layout.addLayout(self.status_layout)
         
@@ -37,11 +71,25 @@ class SendTab(QWidget):
         self.preview_text.setMaximumHeight(100)
         layout.addWidget(self.preview_text)
         
+        self.preview_stats = QLabel("")
+        self.preview_stats.setWordWrap(True)
+        layout.addWidget(self.preview_stats)
+        
         # Contacts selection table
-        self.contacts_table = QTableWidget()
+        self.contacts_model = SelectableContactsModel(self.contact_manager, self.selection, self)
+        self.contacts_table = QTableView()
+        self.contacts_table.setModel(self.contacts_model)
         self.contacts_table.setAlternatingRowColors(True)
+        self.contacts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.contacts_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         layout.addWidget(self.contacts_table)
         
+        # Selection and contact changes alter the preview sample
+        self.contacts_model.dataChanged.connect(self.schedule_preview)
+        self.contacts_model.modelReset.connect(self.schedule_preview)
+        self.contacts_model.rowsInserted.connect(self.schedule_preview)
+        self.contacts_model.rowsRemoved.connect(self.schedule_preview)
+        
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -51,6 +99,13 @@ class SendTab(QWidget):
         self.status_label = QLabel("Ready to send messages")
         layout.addWidget(self.status_label)
         
+        # Failed contacts of the current campaign
+        self.results_log = QTextEdit()
+        self.results_log.setReadOnly(True)
+        self.results_log.setMaximumHeight(80)
+        self.results_log.setVisible(False)
+        layout.addWidget(self.results_log)
+        
         # Buttons layout
         button_layout = QHBoxLayout()
         
@@ -74,90 +129,109 @@ class SendTab(QWidget):
         
     def connect_whatsapp(self):
         """Connect to WhatsApp Web"""
+        if not self.message_sender.set_session_count(self.sessions_spin.value()):
+            QMessageBox.warning(self, "Already Connected",
+                              "Close the current WhatsApp sessions before changing the session count.")
+            return
         self.status_label.setText("🟡 Connecting to WhatsApp Web...")
         self.connect_btn.setEnabled(False)
         
-        # Run in thread to avoid freezing GUI
-        thread = threading.Thread(target=self.connect_whatsapp_thread)
-        thread.daemon = True
-        thread.start()
-        
-    def connect_whatsapp_thread(self):
-        """Thread for connecting to WhatsApp"""
-        try:
-            success = self.message_sender.initialize_whatsapp()
-            if success:
-                self.whatsapp_status.setText("🟢 WhatsApp Connected")
-                self.status_label.setText("✅ WhatsApp is ready! You can now send messages.")
-            else:
-                self.whatsapp_status.setText("🔴 WhatsApp Connection Failed")
-                self.status_label.setText("❌ Failed to connect to WhatsApp. Please try again.")
-        except Exception as e:
-            self.whatsapp_status.setText("🔴 WhatsApp Connection Error")
-            self.status_label.setText(f"❌ Error: {str(e)}")
-        finally:
+        # Connect on a worker thread; the result comes back as a signal
+        self.connect_worker = ConnectWorker(self.message_sender)
+        self.connect_worker.finished.connect(self.on_whatsapp_connected)
+        start_worker(self.connect_worker, self)
+        
+    def start_session(self):
+        """Start the browser in the background and keep an eye on it"""
+        self.message_sender.session.prewarm()
+        self.message_sender.session.start_monitoring()
+        
+    def on_session_state(self, state, message):
+        if state == SESSION_READY:
+            self.whatsapp_status.setText("🟢 WhatsApp Connected")
+            self.connect_btn.setEnabled(True)
+        elif state in (SESSION_STARTING, SESSION_RECONNECTING):
+            self.whatsapp_status.setText(f"🟡 {message}")
+            self.connect_btn.setEnabled(False)
+        elif state == SESSION_FAILED:
+            self.whatsapp_status.setText(f"🔴 {message}")
             self.connect_btn.setEnabled(True)
         
-    def refresh_contacts(self):
-        contacts = self.contact_manager.get_contacts()
-        columns = ["Select"] + self.contact_manager.get_columns()
-        
-        self.contacts_table.setRowCount(len(contacts))
-        self.contacts_table.setColumnCount(len(columns))
-        self.contacts_table.setHorizontalHeaderLabels(columns)
-        
-        for row, contact in enumerate(contacts):
-            # Checkbox for selection
-            checkbox = QCheckBox()
-            checkbox_widget = QWidget()
-            checkbox_layout = QHBoxLayout(checkbox_widget)
-            checkbox_layout.addWidget(checkbox)
-            checkbox_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            checkbox_layout.setContentsMargins(0, 0, 0, 0)
-            self.contacts_table.setCellWidget(row, 0, checkbox_widget)
-            
-            # Contact data
-            for col, column_name in enumerate(self.contact_manager.get_columns(), 1):
-                value = contact.get(column_name, "")
-                item = QTableWidgetItem(str(value))
-                self.contacts_table.setItem(row, col, item)
+    def on_whatsapp_connected(self, success, error):
+        if success:
+            self.whatsapp_status.setText("🟢 WhatsApp Connected")
+            self.status_label.setText("✅ WhatsApp is ready! You can now send messages.")
+        elif error:
+            self.whatsapp_status.setText("🔴 WhatsApp Connection Error")
+            self.status_label.setText(f"❌ Error: {error}")
+        else:
+            self.whatsapp_status.setText("🔴 WhatsApp Connection Failed")
+            self.status_label.setText("❌ Failed to connect to WhatsApp. Please try again.")
+        self.connect_btn.setEnabled(True)
         
-        self.contacts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    def refresh_contacts(self):
+        self.selection.resize(len(self.contact_manager.store))
+        self.contacts_model.refresh()
         
     def update_message_template(self, message):
         self.message_template = message
         self.message_sender.set_message_template(message)
-        # Show preview with sample name
-        preview = message.replace("(name)", "Ahmed")
-        self.preview_text.setPlainText(preview)
+        self.schedule_preview()
+        
+    def schedule_preview(self, *args):
+        """Restart the debounce timer; the preview renders once typing pauses"""
+        self.preview_timer.start()
+        
+    def start_preview(self):
+        """Render the preview for a sample of the selected contacts (or all of them) off the GUI thread"""
+        self.preview_generation += 1
+        store = self.contact_manager.store
+        if self.selection.count():
+            rows = self.selection.sample(PREVIEW_SAMPLE_SIZE)
+        else:
+            rows = sample_indices(range(len(store)))
+        contacts = [dict(store.row(index)) for index in rows]
+        task = PreviewTask(self.preview_generation, self.message_template, contacts,
+                           list(self.contact_manager.get_columns()), self.preview_signals)
+        QThreadPool.globalInstance().start(task)
+        
+    def on_preview_ready(self, generation, preview):
+        if generation != self.preview_generation:
+            return  # A newer preview is on its way
+        self.preview_text.setPlainText(preview.text)
+        if not preview.sample_size:
+            self.preview_stats.setText("")
+            return
+        contact = preview.longest_contact or {}
+        who = contact.get('name') or contact.get('phone') or ""
+        lines = [f"📏 Longest message: {preview.max_length} characters ({who}), "
+                 f"from {preview.sample_size} sampled contact(s)"]
+        if preview.empty_placeholders:
+            columns = []
+            for _, empty in preview.empty_placeholders:
+                columns.extend(column for column in empty if column not in columns)
+            names = ", ".join(str(c.get('name') or c.get('phone') or "?")
+                              for c, _ in preview.empty_placeholders[:5])
+            if len(preview.empty_placeholders) > 5:
+                names += ", ..."
+            lines.append(f"⚠️ {len(preview.empty_placeholders)} sampled contact(s) have empty "
+                         + ", ".join(f"({c})" for c in columns) + f": {names}")
+        if preview.unknown_placeholders:
+            lines.append("⚠️ Not a column: " + ", ".join(f"({p})" for p in preview.unknown_placeholders))
+        self.preview_stats.setText("\n".join(lines))
         
     def get_selected_contacts(self):
-        selected_contacts = []
-        for row in range(self.contacts_table.rowCount()):
-            checkbox_widget = self.contacts_table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox and checkbox.isChecked():
-                contact_data = {}
-                for col, column_name in enumerate(self.contact_manager.get_columns(), 1):
-                    item = self.contacts_table.item(row, col)
-                    if item:
-                        contact_data[column_name] = item.text()
-                selected_contacts.append(contact_data)
-        return selected_contacts
+        """Detached copies of the selected contacts, read by row index"""
+        store = self.contact_manager.store
+        return [dict(store.row(index)) for index in self.selection.indices()]
         
     def select_all(self):
-        for row in range(self.contacts_table.rowCount()):
-            checkbox_widget = self.contacts_table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox:
-                checkbox.setChecked(True)
+        self.selection.select_all()
+        self.contacts_model.check_states_changed()
                 
     def deselect_all(self):
-        for row in range(self.contacts_table.rowCount()):
-            checkbox_widget = self.contacts_table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox:
-                checkbox.setChecked(False)
+        self.selection.clear()
+        self.contacts_model.check_states_changed()
                 
     def send_messages(self):
         if not self.message_sender.is_whatsapp_ready():
@@ -178,33 +252,65 @@ class SendTab(QWidget):
                                    f"Send message to {len(selected_contacts)} contact(s)?",
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
-        if reply == QMessageBox.StandardButton.Yes:
-            # Run sending in a separate thread to avoid freezing the GUI
-            thread = threading.Thread(target=self.send_messages_thread, args=(selected_contacts,))
-            thread.daemon = True
-            thread.start()
+        if reply != QMessageBox.StandardButton.Yes:
+            return
             
-    def send_messages_thread(self, contacts):
+        # Offer to resume when the journal shows some contacts already got this message
+        campaign_id = self.message_sender.campaign_id_for()
+        already_sent = self.message_sender.already_sent(selected_contacts, campaign_id)
+        if already_sent:
+            reply = QMessageBox.question(self, "Resume Campaign",
+                                       f"{len(already_sent)} of the selected contact(s) already received "
+                                       f"this message.\n\nSkip them? Choose No to send to everyone again.",
+                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No |
+                                       QMessageBox.StandardButton.Cancel)
+            if reply == QMessageBox.StandardButton.Cancel:
+                return
+            if reply == QMessageBox.StandardButton.No:
+                campaign_id = self.message_sender.new_campaign_id()
+            
+        # Send on a worker thread; progress reaches the GUI through the bus
+        self.progress_bar.setValue(0)
+        self.progress_bar.setMaximum(len(selected_contacts))
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(contacts))
+        self.results_log.clear()
+        self.results_log.setVisible(False)
         self.send_btn.setEnabled(False)
         
-        def progress_callback(current, total, status):
-            self.progress_bar.setValue(current)
-            self.status_label.setText(status)
+        self.send_worker = SendWorker(self.message_sender, selected_contacts, campaign_id)
+        self.send_worker.finished.connect(self.on_send_finished)
+        self.send_worker.failed.connect(self.on_send_failed)
+        self.progress_bus.start(self.send_worker.progress)
+        start_worker(self.send_worker, self)
         
-        try:
-            success_count, total_count = self.message_sender.send_bulk_messages(
-                contacts, 
-                progress_callback=progress_callback,
-                status_callback=lambda msg: self.status_label.setText(msg)
-            )
-            
-            self.status_label.setText(f"✅ Successfully sent {success_count}/{total_count} messages!")
-            
-        except Exception as e:
-            self.status_label.setText(f"❌ Error: {str(e)}")
-            
-        finally:
-            self.progress_bar.setVisible(False)
-            self.send_btn.setEnabled(True)
\ No newline at end of file
+    def on_send_progress(self, snapshot):
+        """Apply one coalesced progress snapshot"""
+        if snapshot['total']:
+            self.progress_bar.setMaximum(snapshot['total'])
+            self.progress_bar.setValue(snapshot['current'])
+        send_status = self.message_sender.get_send_status()
+        parts = [f"✅ {snapshot['succeeded']} sent", f"❌ {snapshot['failed']} failed",
+                 f"{snapshot['rate_per_minute']:.1f} msgs/min"]
+        if snapshot['eta_seconds'] is not None:
+            parts.append(f"ETA {format_duration(snapshot['eta_seconds'])}")
+        parts.append(f"{send_status['queue_depth']} queued")
+        status = snapshot['status']
+        self.status_label.setText((f"{status}\n" if status else "") + " · ".join(parts))
+        
+        failures = [f"❌ {phone}: {reason or 'failed'}" for phone, success, reason in snapshot['results']
+                    if not success]
+        if failures:
+            self.results_log.setVisible(True)
+            self.results_log.append("\n".join(failures))
+        
+    def on_send_finished(self, success_count, total_count):
+        self.progress_bus.stop()
+        self.status_label.setText(f"✅ Successfully sent {success_count}/{total_count} messages!")
+        self.progress_bar.setVisible(False)
+        self.send_btn.setEnabled(True)
+        
+    def on_send_failed(self, error):
+        self.progress_bus.stop()
+        self.status_label.setText(f"❌ Error: {error}")
+        self.progress_bar.setVisible(False)
+        self.send_btn.setEnabled(True)
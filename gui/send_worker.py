@@ -0,0 +1,100 @@
+# gui/send_worker.py
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+from core.send_progress import SendProgress
+
+# How often progress reaches the GUI, however fast contacts complete
+PROGRESS_REFRESH_MS = 250
+
+
+class SendWorker(QObject):
+    """Runs a bulk send on its own QThread
+
+    The sender's callbacks only feed a SendProgress; nothing here touches
+    a widget.  The GUI reads the progress through a ProgressBus.
+    """
+
+    finished = pyqtSignal(int, int)  # (success_count, total_count)
+    failed = pyqtSignal(str)
+
+    def __init__(self, message_sender, contacts, campaign_id=None):
+        super().__init__()
+        self.message_sender = message_sender
+        self.contacts = contacts
+        self.campaign_id = campaign_id
+        self.progress = SendProgress()
+
+    def run(self):
+        try:
+            success_count, total_count = self.message_sender.send_bulk_messages(
+                self.contacts,
+                progress_callback=self.progress.on_progress,
+                status_callback=self.progress.on_status,
+                campaign_id=self.campaign_id,
+                result_callback=self.progress.on_result
+            )
+            self.finished.emit(success_count, total_count)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ConnectWorker(QObject):
+    """Connects to WhatsApp Web on its own QThread"""
+
+    finished = pyqtSignal(bool, str)  # (success, error message)
+
+    def __init__(self, message_sender):
+        super().__init__()
+        self.message_sender = message_sender
+
+    def run(self):
+        try:
+            self.finished.emit(bool(self.message_sender.initialize_whatsapp()), "")
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+
+class ProgressBus(QObject):
+    """Publishes a SendProgress to the GUI at a fixed rate
+
+    A timer on the GUI thread takes one snapshot per tick and emits it as
+    updated(dict), so a long campaign costs the GUI a few updates a second
+    no matter how fast sends complete.  Per-contact results arrive batched
+    in the snapshot's 'results' list.
+    """
+
+    updated = pyqtSignal(dict)
+
+    def __init__(self, parent=None, interval_ms=PROGRESS_REFRESH_MS):
+        super().__init__(parent)
+        self.progress = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.publish)
+
+    def start(self, progress):
+        self.progress = progress
+        self.timer.start()
+
+    def stop(self):
+        """Stop the timer after one last snapshot"""
+        self.timer.stop()
+        self.publish()
+        self.progress = None
+
+    def publish(self):
+        if self.progress is not None:
+            self.updated.emit(self.progress.snapshot())
+
+
+def start_worker(worker, parent):
+    """Move worker to a new QThread, run it and clean both up when it's done"""
+    thread = QThread(parent)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    worker.finished.connect(thread.quit)
+    if hasattr(worker, 'failed'):
+        worker.failed.connect(thread.quit)
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+    thread.start()
+    return thread
@@ -1,10 +1,18 @@
 # main.py
 import sys
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from gui.main_window import WhatsAppBroadcastApp
+from core.warmup import warm_up
+
+# Delay before loading the sending stack and browser, so the window paints first
+WARM_UP_DELAY_MS = 500
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = WhatsAppBroadcastApp()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    QTimer.singleShot(WARM_UP_DELAY_MS, warm_up)
+    # Then launch (and log in) the browser in the background
+    QTimer.singleShot(WARM_UP_DELAY_MS, window.start_background_session)
+    sys.exit(app.exec())
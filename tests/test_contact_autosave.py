@@ -0,0 +1,84 @@
+# tests/test_contact_autosave.py
+from core.contact_autosave import ContactAutosave
+from core.contact_manager import ContactManager
+
+CSV = "phone,name\n+201001234500,Sara\n+201001234501,Omar\n+201001234502,Mona\n"
+
+
+def open_contacts(path):
+    manager = ContactManager()
+    autosave = ContactAutosave(manager, str(path))
+    autosave.load()
+    autosave.flush()
+    return manager, autosave
+
+
+def rows_of(manager):
+    return [[manager.store.get(i, column) for column in manager.columns] for i in range(len(manager.store))]
+
+
+def test_edits_go_to_the_delta_and_come_back_on_load(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    path.write_text(CSV, encoding='utf-8')
+    manager, autosave = open_contacts(path)
+    manager.update_contact(1, 'name', 'Omar S')
+    manager.add_contact('+201001234503', 'Nour')
+    assert autosave.save()
+    autosave.flush()
+    assert not autosave.save()  # Nothing new since
+
+    assert path.read_text(encoding='utf-8') == CSV  # Only the delta was written
+    reloaded, _ = open_contacts(path)
+    assert rows_of(reloaded) == rows_of(manager)
+    assert rows_of(reloaded)[1:] == [['+201001234501', 'Omar S'], ['+201001234502', 'Mona'],
+                                     ['+201001234503', 'Nour']]
+
+
+def test_torn_last_line_keeps_earlier_rows_and_later_saves_replay(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    path.write_text(CSV, encoding='utf-8')
+    manager, autosave = open_contacts(path)
+    manager.update_contact(0, 'name', 'Sara A')
+    autosave.save()
+    autosave.flush()
+    with open(autosave.delta_path, 'a', encoding='utf-8') as f:
+        f.write('[2, ["+2010012345')  # Crash in the middle of a write
+
+    manager, autosave = open_contacts(path)
+    assert rows_of(manager)[0] == ['+201001234500', 'Sara A']
+    manager.update_contact(2, 'name', 'Mona K')
+    autosave.save()
+    autosave.flush()
+
+    reloaded, _ = open_contacts(path)
+    assert rows_of(reloaded) == [['+201001234500', 'Sara A'], ['+201001234501', 'Omar'],
+                                 ['+201001234502', 'Mona K']]
+
+
+def test_structural_change_rewrites_the_csv(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    path.write_text(CSV, encoding='utf-8')
+    manager, autosave = open_contacts(path)
+    manager.update_contact(0, 'name', 'Sara A')
+    autosave.save()
+    manager.delete_contacts([1])
+    autosave.save()
+    autosave.flush()
+
+    assert path.read_text(encoding='utf-8').splitlines() == [
+        'phone,name', '+201001234500,Sara A', '+201001234502,Mona']
+    reloaded, _ = open_contacts(path)
+    assert rows_of(reloaded) == rows_of(manager)
+
+
+def test_delta_of_another_csv_is_ignored(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    path.write_text(CSV, encoding='utf-8')
+    manager, autosave = open_contacts(path)
+    manager.update_contact(0, 'name', 'Sara A')
+    autosave.save()
+    autosave.flush()
+    path.write_text(CSV.replace('Omar', 'Omar B'), encoding='utf-8')  # Edited elsewhere
+
+    reloaded, _ = open_contacts(path)
+    assert rows_of(reloaded)[:2] == [['+201001234500', 'Sara'], ['+201001234501', 'Omar B']]
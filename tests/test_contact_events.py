@@ -0,0 +1,69 @@
+# tests/test_contact_events.py
+from core.contact_manager import (ContactManager, MAX_REMOVAL_RUNS, CHANGE_ROWS_ABOUT_TO_BE_INSERTED,
+                                  CHANGE_ROWS_INSERTED, CHANGE_ROWS_ABOUT_TO_BE_REMOVED, CHANGE_ROWS_REMOVED,
+                                  CHANGE_COLUMN_ABOUT_TO_BE_ADDED, CHANGE_COLUMN_ADDED, CHANGE_CELL,
+                                  CHANGE_ABOUT_TO_RESET, CHANGE_RESET)
+
+
+def make_manager(count):
+    manager = ContactManager()
+    for i in range(count):
+        manager.add_contact(f"+2010012345{i:02d}", f"C{i}")
+    events = []
+    manager.subscribe(lambda event, *args: events.append((event,) + args))
+    return manager, events
+
+
+def names(manager):
+    return [manager.store.get(i, 'name') for i in range(len(manager.store))]
+
+
+def test_add_and_edit_announce_one_row_or_cell():
+    manager, events = make_manager(2)
+    manager.add_contact('+201001234599', 'New')
+    manager.update_contact(0, 'name', 'Renamed')
+    assert events == [(CHANGE_ROWS_ABOUT_TO_BE_INSERTED, 2, 2), (CHANGE_ROWS_INSERTED, 2, 2),
+                      (CHANGE_CELL, 0, 'name')]
+
+
+def test_new_column_is_announced_at_its_position():
+    manager, events = make_manager(1)
+    manager.add_column('city')
+    manager.add_column('city')  # Already there: no event
+    assert events == [(CHANGE_COLUMN_ABOUT_TO_BE_ADDED, 2, 'city'), (CHANGE_COLUMN_ADDED, 2, 'city')]
+
+
+def test_delete_reports_contiguous_runs_last_first():
+    manager, events = make_manager(10)
+    manager.delete_contacts([8, 1, 2, 3, 7, 5, 2])
+    assert events == [
+        (CHANGE_ROWS_ABOUT_TO_BE_REMOVED, 7, 8), (CHANGE_ROWS_REMOVED, 7, 8),
+        (CHANGE_ROWS_ABOUT_TO_BE_REMOVED, 5, 5), (CHANGE_ROWS_REMOVED, 5, 5),
+        (CHANGE_ROWS_ABOUT_TO_BE_REMOVED, 1, 3), (CHANGE_ROWS_REMOVED, 1, 3),
+    ]
+    assert names(manager) == ['C0', 'C4', 'C6', 'C9']
+
+
+def test_scattered_delete_becomes_one_reset_with_the_removed_rows():
+    count = 2 * (MAX_REMOVAL_RUNS + 1)
+    manager, events = make_manager(count)
+    rows = list(range(0, count, 2))
+    manager.delete_contacts(rows)
+    assert events == [(CHANGE_ABOUT_TO_RESET,), (CHANGE_RESET, rows)]
+    assert names(manager) == [f"C{i}" for i in range(1, count, 2)]
+
+
+def test_out_of_range_rows_are_ignored():
+    manager, events = make_manager(3)
+    manager.delete_contacts([-1, 3, 99])
+    assert events == []
+    assert len(manager.store) == 3
+
+
+def test_delete_without_listeners_still_removes_every_row():
+    manager = ContactManager()
+    for i in range(40):
+        manager.add_contact(f"+2010012345{i:02d}", f"C{i}")
+    manager.delete_contacts(range(0, 40, 2))
+    assert names(manager) == [f"C{i}" for i in range(1, 40, 2)]
+    assert manager.find_by_phone('+201001234503') == 1
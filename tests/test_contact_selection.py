@@ -0,0 +1,86 @@
+# tests/test_contact_selection.py
+import random
+
+from core.contact_selection import ContactSelection
+
+
+def selected(selection):
+    return [i for i in range(selection.row_count) if selection.is_selected(i)]
+
+
+def test_select_all_then_deselect_keeps_only_the_exceptions():
+    selection = ContactSelection(10)
+    selection.select_all()
+    selection.set_selected(3, False)
+    selection.toggle(7)
+    assert selection.count() == 8
+    assert selection.indices() == [0, 1, 2, 4, 5, 6, 8, 9]
+    selection.clear()
+    assert selection.count() == 0
+    assert selection.indices() == []
+
+
+def test_inserted_rows_start_unselected_even_when_all_are_selected():
+    selection = ContactSelection(4)
+    selection.select_all()
+    selection.set_selected(2, False)
+    selection.insert_rows(1, 2)
+    assert selection.row_count == 6
+    assert selected(selection) == [0, 3, 5]
+
+
+def test_removing_rows_shifts_the_selection_after_them():
+    selection = ContactSelection(8)
+    for index in (1, 4, 6, 7):
+        selection.set_selected(index, True)
+    selection.remove_rows(3, 4)
+    assert selected(selection) == [1, 4, 5]
+    selection.remove_many([0, 4])
+    assert selection.row_count == 4
+    assert selected(selection) == [0, 3]
+
+
+def test_sample_spreads_over_the_selection():
+    selection = ContactSelection(1000)
+    selection.select_all()
+    for index in range(0, 1000, 3):
+        selection.set_selected(index, False)
+    sample = selection.sample(10)
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert all(selection.is_selected(index) for index in sample)
+    assert sample[0] < 100 and sample[-1] > 850
+
+
+def test_random_edits_match_a_plain_list_of_flags():
+    rng = random.Random(7)
+    selection = ContactSelection(50)
+    flags = [False] * 50
+    for _ in range(500):
+        action = rng.choice(['toggle', 'all', 'clear', 'insert', 'remove', 'remove_many'])
+        if action == 'toggle' and flags:
+            index = rng.randrange(len(flags))
+            selection.toggle(index)
+            flags[index] = not flags[index]
+        elif action == 'all':
+            selection.select_all()
+            flags = [True] * len(flags)
+        elif action == 'clear':
+            selection.clear()
+            flags = [False] * len(flags)
+        elif action == 'insert':
+            first, count = rng.randint(0, len(flags)), rng.randint(1, 3)
+            selection.insert_rows(first, count)
+            flags[first:first] = [False] * count
+        elif action == 'remove' and flags:
+            first = rng.randrange(len(flags))
+            last = min(len(flags) - 1, first + rng.randint(0, 3))
+            selection.remove_rows(first, last)
+            del flags[first:last + 1]
+        elif action == 'remove_many' and flags:
+            rows = sorted(rng.sample(range(len(flags)), min(len(flags), rng.randint(1, 5))))
+            selection.remove_many(rows)
+            flags = [flag for i, flag in enumerate(flags) if i not in set(rows)]
+        assert selection.row_count == len(flags)
+        assert selection.indices() == [i for i, flag in enumerate(flags) if flag]
+        assert selection.count() == sum(flags)
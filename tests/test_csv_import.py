@@ -0,0 +1,47 @@
+# tests/test_csv_import.py
+from core.contact_manager import ContactManager
+
+
+def write_csv(tmp_path, text, name='contacts.csv'):
+    path = tmp_path / name
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+def rows_of(manager):
+    return [[manager.store.get(i, column) for column in manager.columns] for i in range(len(manager.store))]
+
+
+def test_rows_survive_every_chunk_boundary(tmp_path):
+    lines = [f"+2010012345{i:02d},Contact {i}" for i in range(7)]
+    path = write_csv(tmp_path, "phone,name\n" + "\n".join(lines) + "\n")
+    expected = [line.split(',') for line in lines]
+    for chunk_size in (1, 2, 3, 6, 7, 8):
+        manager = ContactManager()
+        manager.load_from_csv(path, chunk_size=chunk_size)
+        assert rows_of(manager) == expected, chunk_size
+
+
+def test_chunks_report_progress_up_to_the_file_size(tmp_path):
+    path = write_csv(tmp_path, "phone,name\n+201001234500,A\n+201001234501,B\n+201001234502,C\n")
+    progress = []
+    ContactManager().load_from_csv(path, chunk_size=2,
+                                   progress_callback=lambda rows, done, total: progress.append((rows, done, total)))
+    assert [rows for rows, _, _ in progress] == [2, 3]
+    assert progress[-1][1] == progress[-1][2]
+
+
+def test_values_stay_strings_and_ragged_rows_are_squared(tmp_path):
+    path = write_csv(tmp_path, "\ufeffphone,name,city\n00201001234567, Sara ,Cairo,extra\n\n0100123,Omar\n")
+    manager = ContactManager()
+    manager.load_from_csv(path, chunk_size=1)
+    assert manager.columns == ['phone', 'name', 'city']
+    assert rows_of(manager) == [['00201001234567', 'Sara', 'Cairo'], ['0100123', 'Omar', '']]
+
+
+def test_header_only_file_keeps_its_columns(tmp_path):
+    path = write_csv(tmp_path, "phone,name,order\n")
+    manager = ContactManager()
+    manager.load_from_csv(path, chunk_size=2)
+    assert manager.columns == ['phone', 'name', 'order']
+    assert len(manager.store) == 0
@@ -0,0 +1,81 @@
+# tests/test_phone_dedup.py
+import pytest
+
+from core.contact_manager import ContactManager, DEDUP_KEEP_FIRST, DEDUP_KEEP_LAST, DEDUP_MERGE
+from core.phone_numbers import (PhoneNormalizer, INVALID_CHARACTERS, INVALID_NO_COUNTRY, INVALID_TOO_SHORT,
+                                INVALID_TOO_LONG)
+
+
+@pytest.mark.parametrize('raw', ['+20 100 123 4567', '0020-100-123-4567', '(+20) 100.123.4567', '+(20) 1001234567'])
+def test_international_forms_normalize_to_e164(raw):
+    assert PhoneNormalizer(default_country_code='').parse(raw) == ('+201001234567', None)
+
+
+@pytest.mark.parametrize('raw, reason', [
+    ('0100 123 4567', INVALID_NO_COUNTRY),
+    ('+20 100 ABC', INVALID_CHARACTERS),
+    ('+20 1', INVALID_TOO_SHORT),
+    ('+20 1001234567 12345', INVALID_TOO_LONG),
+])
+def test_invalid_numbers_say_why(raw, reason):
+    assert PhoneNormalizer(default_country_code='').parse(raw) == (None, reason)
+
+
+def test_default_country_completes_national_numbers():
+    normalizer = PhoneNormalizer(default_country_code='20')
+    assert normalizer.normalize('0100 123 4567') == '+201001234567'
+    assert normalizer.normalize('100 123 4567') == '+201001234567'
+    assert normalizer.dedup_key('0100 123 4567') == normalizer.dedup_key('+20 100 123 4567')
+
+
+def load(tmp_path, text, dedup, chunk_size=2, country=''):
+    path = tmp_path / 'contacts.csv'
+    path.write_text(text, encoding='utf-8')
+    manager = ContactManager(PhoneNormalizer(default_country_code=country))
+    report = manager.load_from_csv(str(path), chunk_size=chunk_size, dedup=dedup)
+    rows = [[manager.store.get(i, column) for column in manager.columns] for i in range(len(manager.store))]
+    return rows, report
+
+
+CSV = ("phone,name,city\n"
+       "+20 100 123 4567,Sara,\n"
+       "+20 100 999 0000,Omar,Giza\n"
+       "+201009990001,Mona,Alex\n"
+       "0020 100 123 4567,,Cairo\n"
+       "+20-100-123-4567,Sara B,Tanta\n")
+
+
+def test_keep_first_drops_later_duplicates_across_chunks(tmp_path):
+    rows, report = load(tmp_path, CSV, DEDUP_KEEP_FIRST)
+    assert [row[1] for row in rows] == ['Sara', 'Omar', 'Mona']
+    assert [(kept, row_number) for _, kept, row_number, _ in report.duplicates] == [(0, 4), (0, 5)]
+
+
+def test_keep_last_overwrites_the_first_row_in_place(tmp_path):
+    rows, _ = load(tmp_path, CSV, DEDUP_KEEP_LAST)
+    assert rows[0] == ['+20-100-123-4567', 'Sara B', 'Tanta']
+    assert len(rows) == 3
+
+
+def test_merge_fills_only_empty_cells_across_chunks(tmp_path):
+    rows, _ = load(tmp_path, CSV, DEDUP_MERGE)
+    assert rows[0] == ['+20 100 123 4567', 'Sara', 'Cairo']
+
+
+def test_merge_within_one_chunk_matches_merge_across_chunks(tmp_path):
+    across, _ = load(tmp_path, CSV, DEDUP_MERGE, chunk_size=1)
+    within, _ = load(tmp_path, CSV, DEDUP_MERGE, chunk_size=100)
+    assert across == within
+
+
+def test_national_numbers_merge_with_their_e164_form_given_a_country(tmp_path):
+    text = "phone,name\n+20 100 123 4567,Sara\n0100 123 4567,Sara home\n"
+    rows, report = load(tmp_path, text, DEDUP_KEEP_FIRST, chunk_size=1, country='20')
+    assert rows == [['+20 100 123 4567', 'Sara']]
+    assert len(report) == 1
+
+
+def test_without_a_policy_duplicates_are_kept(tmp_path):
+    rows, report = load(tmp_path, CSV, None)
+    assert len(rows) == 5
+    assert len(report) == 0
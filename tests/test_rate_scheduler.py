@@ -0,0 +1,85 @@
+# tests/test_rate_scheduler.py
+import datetime
+
+import pytest
+
+from core.rate_scheduler import RateScheduler, HOUR, DAY
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def local_time(hour, minute=0):
+    return datetime.datetime(2026, 1, 15, hour, minute).timestamp()
+
+
+def make_scheduler(clock, **kwargs):
+    kwargs.setdefault('jitter', 0)
+    return RateScheduler(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_burst_then_sustained_rate():
+    clock = FakeClock(local_time(12))
+    scheduler = make_scheduler(clock, rate_per_minute=6, burst=2)
+    assert scheduler.next_delay() == (0.0, None)
+    assert scheduler.next_delay() == (0.0, None)
+    delay, reason = scheduler.next_delay()
+    assert reason == "rate limit"
+    assert delay == pytest.approx(10.0)
+
+
+def test_hourly_cap_waits_for_the_oldest_send_to_leave_the_hour():
+    clock = FakeClock(local_time(12))
+    scheduler = make_scheduler(clock, rate_per_minute=600, burst=10, hourly_cap=3)
+    for _ in range(3):
+        scheduler.acquire()
+        clock.now += 60
+    delay, reason = scheduler.next_delay()
+    assert reason == "hourly/daily cap reached"
+    assert delay == pytest.approx(HOUR - 180)
+    scheduler.acquire()
+    assert clock.now == pytest.approx(local_time(13))
+
+
+def test_daily_cap_counts_seeded_sends():
+    clock = FakeClock(local_time(12))
+    scheduler = make_scheduler(clock, rate_per_minute=600, burst=10, daily_cap=2)
+    scheduler.seed([clock.now - 2 * HOUR, clock.now - HOUR, clock.now - 2 * DAY])
+    delay, reason = scheduler.next_delay()
+    assert reason == "hourly/daily cap reached"
+    assert delay == pytest.approx(DAY - 2 * HOUR)
+
+
+@pytest.mark.parametrize('hour, minute, wait_hours', [
+    (23, 0, 9.0),   # Before midnight, inside a window that wraps past it
+    (2, 30, 5.5),   # After midnight, same window
+    (8, 0, 0.0),    # The window's end is outside it
+    (21, 59, 0.0),
+])
+def test_quiet_hours_wrap_past_midnight(hour, minute, wait_hours):
+    clock = FakeClock(local_time(hour, minute))
+    scheduler = make_scheduler(clock, quiet_hours=(22, 8))
+    delay, reason = scheduler.next_delay()
+    if wait_hours:
+        assert reason == "quiet hours"
+        assert delay == pytest.approx(wait_hours * HOUR)
+    else:
+        assert delay == 0.0
+
+
+def test_acquire_sleeps_through_quiet_hours_and_reports_the_wait():
+    clock = FakeClock(local_time(23))
+    scheduler = make_scheduler(clock, quiet_hours=(22, 8))
+    waits = []
+    scheduler.wait_callback = lambda seconds, reason: waits.append(reason)
+    scheduler.acquire()
+    assert clock.now == pytest.approx(local_time(8) + DAY)
+    assert waits and set(waits) == {"quiet hours"}
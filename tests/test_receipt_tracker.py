@@ -0,0 +1,47 @@
+# tests/test_receipt_tracker.py
+from core.receipt_tracker import (ReceiptTracker, RECEIPT_SENT, RECEIPT_DELIVERED, RECEIPT_READ)
+
+
+def make_tracker():
+    tracker = ReceiptTracker()
+    changes = []
+    tracker.receipt_callback = lambda phone, state: changes.append((phone, state))
+    return tracker, changes
+
+
+def test_chat_listed_by_number_is_credited():
+    tracker, changes = make_tracker()
+    tracker.track('+20 100 123 4567', "Hello Sara, your order is ready")
+    tracker.update([('+20 100 123 4567', 'status-check', ' Sent ', "Hello Sara, your order is ready")])
+    assert changes == [('+20 100 123 4567', RECEIPT_SENT)]
+
+
+def test_chat_listed_by_contact_name_is_credited():
+    tracker, changes = make_tracker()
+    tracker.track('+201001234567', "Hello Sara, your order is ready", 'Sara')
+    tracker.update([('Sara', 'status-dblcheck', ' Delivered ', "Hello Sara, your order is ready")])
+    tracker.update([(' sara ', 'status-dblcheck', ' Read ', "Hello Sara, your order is ready")])
+    assert changes == [('+201001234567', RECEIPT_DELIVERED), ('+201001234567', RECEIPT_READ)]
+    assert len(tracker) == 0  # Nothing left to wait for once read
+
+
+def test_name_match_needs_the_same_message():
+    tracker, changes = make_tracker()
+    tracker.track('+201001234567', "Hello Sara, your order is ready", 'Sara')
+    tracker.update([('Sara', 'status-dblcheck', ' Read ', "An older message")])
+    assert changes == []
+
+
+def test_untracked_name_is_ignored():
+    tracker, changes = make_tracker()
+    tracker.track('+201001234567', "Hello", 'Sara')
+    tracker.update([('Omar', 'status-dblcheck', ' Read ', "Hello")])
+    assert changes == []
+
+
+def test_receipts_never_move_backwards():
+    tracker, changes = make_tracker()
+    tracker.track('+201001234567', "Hello", 'Sara')
+    tracker.update([('Sara', 'status-dblcheck', ' Delivered ', "Hello")])
+    tracker.update([('Sara', 'status-check', ' Sent ', "Hello")])
+    assert changes == [('+201001234567', RECEIPT_DELIVERED)]
@@ -0,0 +1,89 @@
+# tests/test_retry_queue.py
+import pytest
+
+from core import retry_queue
+from core.retry_queue import (RetryQueue, RetryPolicy, SendFailure, classify_exception, FAILURE_INVALID_NUMBER,
+                              FAILURE_TIMEOUT, FAILURE_POPUP, FAILURE_DRIVER_CRASH, FAILURE_UNCONFIRMED,
+                              FAILURE_UNKNOWN)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    monkeypatch.setattr(retry_queue.random, 'uniform', lambda low, high: 0.0)
+
+
+def test_backoff_grows_per_retry_up_to_the_cap():
+    policy = RetryPolicy(5, base_delay=10.0, factor=3.0, max_delay=100.0)
+    assert [policy.delay(n) for n in range(1, 5)] == [10.0, 30.0, 90.0, 100.0]
+
+
+def test_retries_come_out_in_due_order_not_push_order():
+    clock = FakeClock()
+    queue = RetryQueue({FAILURE_TIMEOUT: RetryPolicy(3, base_delay=30.0),
+                        FAILURE_POPUP: RetryPolicy(3, base_delay=5.0)}, clock=clock)
+    queue.push('slow', 'a', FAILURE_TIMEOUT)
+    queue.push('quick', 'b', FAILURE_POPUP)
+    assert queue.next_ready_in() == 5.0
+    assert [queue.pop()[0] for _ in range(2)] == ['quick', 'slow']
+    assert queue.next_ready_in() is None
+
+
+def test_equal_due_times_keep_push_order():
+    queue = RetryQueue({FAILURE_POPUP: RetryPolicy(1, base_delay=5.0)}, clock=FakeClock())
+    for key in ('first', 'second', 'third'):
+        queue.push(key, key, FAILURE_POPUP)
+    assert [queue.pop()[0] for _ in range(3)] == ['first', 'second', 'third']
+
+
+def test_each_key_backs_off_and_runs_out_of_retries():
+    clock = FakeClock()
+    queue = RetryQueue({FAILURE_TIMEOUT: RetryPolicy(2, base_delay=10.0)}, clock=clock)
+    assert queue.push('c', 'item', FAILURE_TIMEOUT)
+    assert queue.next_ready_in() == 10.0
+    queue.pop()
+    assert queue.push('c', 'item', FAILURE_TIMEOUT)
+    assert queue.next_ready_in() == 20.0
+    clock.now += 20.0
+    assert queue.next_ready_in() == 0.0
+    queue.pop()
+    assert not queue.push('c', 'item', FAILURE_TIMEOUT)
+    assert queue.retries('c') == 2
+
+
+@pytest.mark.parametrize('failure', [FAILURE_INVALID_NUMBER, FAILURE_UNCONFIRMED])
+def test_failures_that_retrying_cannot_fix_are_not_queued(failure):
+    queue = RetryQueue()
+    assert not queue.push('c', 'item', failure)
+    assert len(queue) == 0
+
+
+class InvalidSessionIdException(Exception):
+    pass
+
+
+class TimeoutException(Exception):
+    pass
+
+
+class ElementClickInterceptedException(Exception):
+    pass
+
+
+@pytest.mark.parametrize('error, failure', [
+    (SendFailure(FAILURE_POPUP, "popup keeps blocking the chat"), FAILURE_POPUP),
+    (InvalidSessionIdException("invalid session id"), FAILURE_DRIVER_CRASH),
+    (Exception("Message: chrome not reachable"), FAILURE_DRIVER_CRASH),
+    (TimeoutException(""), FAILURE_TIMEOUT),
+    (ElementClickInterceptedException("element click intercepted"), FAILURE_POPUP),
+    (ValueError("something else"), FAILURE_UNKNOWN),
+])
+def test_exceptions_are_classified_by_type_and_message(error, failure):
+    assert classify_exception(error) == failure